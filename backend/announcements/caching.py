@@ -0,0 +1,40 @@
+"""
+Cache keys and invalidation for announcement responses.
+
+Filter options are dropped by the signal handlers in
+``announcements.signals`` whenever an announcement or semester changes.
+The cache is per process (no shared backend is configured), so that only
+reaches the worker that handled the write. Entries therefore also expire
+after ``FILTERS_TIMEOUT``, which bounds how long other workers can serve
+stale counts.
+
+Rendered announcements are cached per locale under a key that includes
+``updated_at``, so an edit simply makes the old entry unreachable. Changes
+to a semester or related link bump ``updated_at`` of the announcements
+they belong to for the same effect.
+"""
+from django.core.cache import cache
+from tsak_backend.bilingual import LOCALES, normalize_locale
+
+FILTERS_KEY = 'announcements:filters:{locale}'
+FRAGMENT_KEY = 'announcements:{name}:{pk}:{version}:{locale}'
+FILTERS_TIMEOUT = 60  # seconds other workers may lag behind a change
+FRAGMENT_TIMEOUT = 60 * 60 * 24  # superseded entries just expire
+
+
+def filters_key(locale):
+    return FILTERS_KEY.format(locale=normalize_locale(locale))
+
+
+def invalidate_filters():
+    cache.delete_many([filters_key(locale) for locale in LOCALES])
+
+
+def fragment_key(name, instance, locale):
+    """Key of one rendered announcement, unique per (id, updated_at, locale)"""
+    return FRAGMENT_KEY.format(
+        name=name,
+        pk=instance.pk,
+        version=int(instance.updated_at.timestamp() * 1_000_000),
+        locale=normalize_locale(locale),
+    )
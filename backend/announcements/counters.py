@@ -0,0 +1,146 @@
+"""
+Write-behind buffer for announcement view counts.
+
+Detail requests only bump an in-process counter. Buffered increments are
+written back in one batched UPDATE when the buffer holds
+``ANNOUNCEMENT_VIEWS_FLUSH_THRESHOLD`` views, every
+``ANNOUNCEMENT_VIEWS_FLUSH_INTERVAL`` seconds from a background thread, and
+once more at interpreter exit so a graceful shutdown does not lose views.
+
+Each flush also appends the views it wrote, per announcement and day, to
+the ``AnnouncementViewEvent`` stream that feeds the daily rollups (see
+``announcements.trending``).
+"""
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 10  # seconds
+DEFAULT_FLUSH_THRESHOLD = 100  # buffered views
+
+
+class ViewCounterBuffer:
+    """Collects view increments per announcement id and flushes them in batches"""
+
+    def __init__(self, flush_interval=None, flush_threshold=None):
+        self.flush_interval = flush_interval or getattr(
+            settings, 'ANNOUNCEMENT_VIEWS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL
+        )
+        self.flush_threshold = flush_threshold or getattr(
+            settings, 'ANNOUNCEMENT_VIEWS_FLUSH_THRESHOLD', DEFAULT_FLUSH_THRESHOLD
+        )
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._in_flight = {}
+        self._daily = {}
+        self._total = 0
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def increment(self, pk):
+        """Record one view, returns the views for ``pk`` not yet written to the database"""
+        self._ensure_flusher()
+        day = timezone.localdate()
+        with self._lock:
+            self._pending[pk] = self._pending.get(pk, 0) + 1
+            self._daily[(pk, day)] = self._daily.get((pk, day), 0) + 1
+            self._total += 1
+            buffered = self._pending[pk] + self._in_flight.get(pk, 0)
+            should_flush = self._total >= self.flush_threshold
+
+        if should_flush:
+            self.flush()
+        return buffered
+
+    def buffered(self, pk):
+        """Views for ``pk`` that are counted but not yet written to the database"""
+        with self._lock:
+            return self._pending.get(pk, 0) + self._in_flight.get(pk, 0)
+
+    def flush(self):
+        """
+        Write all buffered increments in a single UPDATE and append them to
+        the view event stream, returns the number of announcements touched
+        """
+        from .models import Announcement, AnnouncementViewEvent
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                daily, self._daily = self._daily, {}
+                self._in_flight = batch
+                self._total = 0
+
+            if not batch:
+                return 0
+
+            try:
+                with transaction.atomic():
+                    existing = set(Announcement.objects.filter(pk__in=batch).values_list('pk', flat=True))
+                    updated = Announcement.objects.filter(pk__in=existing).update(
+                        views=F('views') + Case(
+                            *[When(pk=pk, then=Value(count)) for pk, count in batch.items()],
+                            default=Value(0),
+                            output_field=IntegerField()
+                        )
+                    )
+                    AnnouncementViewEvent.objects.bulk_create([
+                        AnnouncementViewEvent(announcement_id=pk, day=day, count=count)
+                        for (pk, day), count in daily.items() if pk in existing
+                    ])
+            except DatabaseError:
+                # Put the batch back so the next flush retries it
+                logger.exception("Failed to flush %d buffered announcement views", sum(batch.values()))
+                with self._lock:
+                    for pk, count in batch.items():
+                        self._pending[pk] = self._pending.get(pk, 0) + count
+                    for key, count in daily.items():
+                        self._daily[key] = self._daily.get(key, 0) + count
+                    self._total += sum(batch.values())
+                    self._in_flight = {}
+                return 0
+
+            with self._lock:
+                self._in_flight = {}
+            return updated
+
+    def stop(self):
+        """Stop the background flusher and write out anything still buffered"""
+        self._stop.set()
+        self.flush()
+
+    def _ensure_flusher(self):
+        # Threads do not survive a fork, so prefork servers start one per worker
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='announcement-views-flusher', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+view_counter = ViewCounterBuffer()
+atexit.register(view_counter.stop)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from announcements import similarity
+
+
+class Command(BaseCommand):
+    help = "Recompute the related announcements of every published announcement"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending', action='store_true',
+            help="Only apply the refreshes queued by announcement saves and deletes",
+        )
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            count = similarity.refresh_pending()
+            self.stdout.write(self.style.SUCCESS(f"Applied queued changes to {count} announcements"))
+            return
+
+        count = similarity.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Computed related announcements for {count} announcements"))
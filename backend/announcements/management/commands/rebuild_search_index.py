@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from announcements import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for announcements"
+
+    def handle(self, *args, **options):
+        search.create_index()
+        if not search.is_available():
+            raise CommandError("Full-text search needs SQLite with the FTS5 extension")
+
+        count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} announcements"))
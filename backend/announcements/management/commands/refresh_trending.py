@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from announcements import trending
+
+
+class Command(BaseCommand):
+    help = "Fold buffered view events into daily rollups and recompute trending announcements"
+
+    def handle(self, *args, **options):
+        folded = trending.rollup_view_events()
+        ranked = trending.recompute_trending()
+        self.stdout.write(self.style.SUCCESS(f"Folded {folded} view events, ranked {ranked} announcements"))
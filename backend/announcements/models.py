@@ -72,16 +72,25 @@ class Announcement(models.Model):
             models.Index(fields=['-date']),
             models.Index(fields=['semester']),
             models.Index(fields=['department']),
+            # Keyset pagination: (sort field, id) within published rows
+            models.Index(fields=['is_published', 'date', 'id']),
+            models.Index(fields=['is_published', 'views', 'id']),
         ]
     
     def __str__(self):
         return f"{self.title_th} ({self.date})"
     
     def increment_views(self):
-        """Increment view count atomically"""
-        self.views = models.F('views') + 1
-        self.save(update_fields=['views'])
-        self.refresh_from_db()
+        """
+        Count a view without writing to the database.
+
+        The increment goes to the write-behind buffer in
+        ``announcements.counters`` and ``views`` is updated in memory to
+        include everything still buffered for this announcement.
+        """
+        from .counters import view_counter
+
+        self.views += view_counter.increment(self.pk)
 
 
 class RelatedLink(models.Model):
@@ -101,4 +110,131 @@ class RelatedLink(models.Model):
         verbose_name_plural = "Related Links"
     
     def __str__(self):
-        return f"{self.name_th} - {self.announcement.title_th}"
\ No newline at end of file
+        return f"{self.name_th} - {self.announcement.title_th}"
+
+
+class RelatedAnnouncement(models.Model):
+    """
+    Precomputed content neighbors of an announcement, best first.
+    Maintained by ``announcements.similarity``.
+    """
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name='similar'
+    )
+    related = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name='similar_to'
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['announcement', 'rank']
+        verbose_name = "Related Announcement"
+        verbose_name_plural = "Related Announcements"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['announcement', 'related'],
+                name='unique_related_announcement'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['announcement', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.announcement_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class RelatedRefresh(models.Model):
+    """
+    Announcements whose neighbor lists need recomputing. Queued by the
+    signal handlers and drained by ``announcements.similarity.refresh_pending``
+    outside the request that made the change. Not a foreign key, so ids of
+    deleted announcements can be queued too.
+    """
+    announcement_id = models.PositiveIntegerField(unique=True)
+    queued_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Related Refresh"
+        verbose_name_plural = "Related Refreshes"
+
+    def __str__(self):
+        return f"{self.announcement_id} queued at {self.queued_at}"
+
+
+class AnnouncementViewEvent(models.Model):
+    """
+    Append-only stream of views, one row per announcement and day per
+    flush of the view counter. Folded into ``AnnouncementDailyViews`` and
+    deleted by ``announcements.trending.rollup_view_events``.
+    """
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    day = models.DateField()
+    count = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Announcement View Event"
+        verbose_name_plural = "Announcement View Events"
+
+    def __str__(self):
+        return f"{self.announcement_id} +{self.count} on {self.day}"
+
+
+class AnnouncementDailyViews(models.Model):
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name='daily_views'
+    )
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        verbose_name = "Daily Views"
+        verbose_name_plural = "Daily Views"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['announcement', 'day'],
+                name='unique_announcement_daily_views'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.announcement_id} on {self.day}: {self.views}"
+
+
+class TrendingAnnouncement(models.Model):
+    """
+    Materialized trending ranking, recomputed periodically by
+    ``announcements.trending.recompute_trending``.
+    """
+    announcement = models.OneToOneField(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name='trending'
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField(db_index=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['rank']
+        verbose_name = "Trending Announcement"
+        verbose_name_plural = "Trending Announcements"
+
+    def __str__(self):
+        return f"#{self.rank + 1} {self.announcement_id} ({self.score:.2f})"
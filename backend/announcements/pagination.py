@@ -0,0 +1,163 @@
+"""
+Keyset (cursor) pagination for announcements.
+
+Pages are addressed by the sort value and id of the row at the page
+boundary instead of an OFFSET, so every page is an index range scan and no
+``COUNT(*)`` is run unless the client asks for one with
+``with_count=true``. That count is cached for ``CURSOR_COUNT_CACHE_TIMEOUT``
+seconds per distinct filter combination.
+"""
+import base64
+import binascii
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR_SORT_FIELDS = ('date', 'views')
+CURSOR_COUNT_CACHE_TIMEOUT = 60  # seconds
+
+
+class AnnouncementCursorPagination(BasePagination):
+    """
+    Cursor pagination over ``(sort field, id)``.
+
+    The queryset must be ordered by ``date`` or ``views`` followed by
+    ``id`` in the same direction, which is what
+    ``AnnouncementViewSet.get_queryset`` produces for ``sort_by=date`` and
+    ``sort_by=views``. Both columns are covered by the composite indexes on
+    ``Announcement``.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'with_count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(queryset)
+        self.count = self.get_count(queryset) if self.wants_count(request) else None
+
+        cursor = self.decode_cursor(request)
+        reverse = False
+        if cursor is not None:
+            value, pk, reverse = cursor
+            queryset = queryset.filter(self.boundary_filter(queryset, value, pk, reverse))
+        if reverse:
+            queryset = queryset.reverse()
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Return the sort field and direction, checking the id tie-breaker is in place"""
+        ordering = list(queryset.query.order_by)
+        if len(ordering) == 2:
+            field, tie_breaker = ordering
+            descending = field.startswith('-')
+            field = field.lstrip('-')
+            if field in CURSOR_SORT_FIELDS and tie_breaker == ('-id' if descending else 'id'):
+                return field, descending
+        raise ValidationError({
+            'sort_by': f"Cursor pagination supports sort_by={' or '.join(CURSOR_SORT_FIELDS)}"
+        })
+
+    def boundary_filter(self, queryset, value, pk, reverse):
+        """Rows strictly after (or before, when paging back) the boundary row"""
+        # The cursor comes from the client, so its value may be anything
+        try:
+            value = queryset.model._meta.get_field(self.field).to_python(value)
+        except (DjangoValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': value}) |
+            Q(**{self.field: value, f'id__{lookup}': pk})
+        )
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true')
+
+    def get_count(self, queryset):
+        """Total rows for this filter combination, cached briefly"""
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.sha1(f'{sql}|{params}'.encode()).hexdigest()
+        key = f'announcements:cursor-count:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = queryset.order_by().count()
+            cache.set(key, count, CURSOR_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            return data['v'], int(data['id']), bool(data.get('r', False))
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        data = {'v': value, 'id': obj.pk}
+        if reverse:
+            data['r'] = True
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, encoded)
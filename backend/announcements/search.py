@@ -0,0 +1,203 @@
+"""
+Full-text search for announcements backed by an SQLite FTS5 index.
+
+The index is a virtual table whose rowid is the announcement id. It is
+created after ``migrate`` and kept in sync by the signal handlers in
+``announcements.signals``; ``manage.py rebuild_search_index`` rebuilds it
+from scratch.
+
+The ``trigram`` tokenizer is used because Thai is written without spaces
+between words, so a word-based tokenizer would index whole sentences as a
+single token. Trigrams give substring matching for Thai and English alike
+(the same semantics as the old ``icontains`` search) but served from the
+index instead of a scan of every content body.
+"""
+import html
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections
+from django.db.models import FloatField, Q, TextField
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'announcements_announcement_fts'
+INDEXED_FIELDS = ['title_th', 'title_en', 'content_th', 'content_en']
+
+# bm25 weights per indexed column: a hit in a title counts more than a hit
+# in the body
+COLUMN_WEIGHTS = [10.0, 10.0, 1.0, 1.0]
+
+# The trigram tokenizer cannot match terms shorter than three characters
+MIN_TERM_LENGTH = 3
+
+SNIPPET_OPEN = '<mark>'
+SNIPPET_CLOSE = '</mark>'
+SNIPPET_TOKENS = 16
+
+# snippet() copies the indexed text verbatim, so it marks hits with control
+# characters and ``highlight`` swaps them for tags after escaping the text
+SNIPPET_OPEN_MARKER = '\x02'
+SNIPPET_CLOSE_MARKER = '\x03'
+
+_available = None
+
+
+def _index_exists(db):
+    if db.vendor != 'sqlite':
+        return False
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [FTS_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def is_available(using=DEFAULT_DB_ALIAS):
+    """Return True if the FTS index exists on the ``using`` database"""
+    global _available
+    if using != DEFAULT_DB_ALIAS:
+        return _index_exists(connections[using])
+    # Searches run on the default database, so that answer is kept
+    if _available is None:
+        _available = _index_exists(connection)
+    return _available
+
+
+def create_index(using=DEFAULT_DB_ALIAS):
+    """
+    Create the FTS5 table on the ``using`` database if it does not exist yet.
+
+    Returns True if the table was created by this call. SQLite builds
+    without FTS5 (or other database backends) leave search on the
+    ``icontains`` fallback.
+    """
+    global _available
+    db = connections[using]
+    if db.vendor != 'sqlite' or _index_exists(db):
+        available, created = db.vendor == 'sqlite', False
+    else:
+        columns = ', '.join(INDEXED_FIELDS)
+        try:
+            with db.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} "
+                    f"USING fts5({columns}, tokenize = 'trigram')"
+                )
+        except DatabaseError:
+            logger.warning("SQLite FTS5 is not available, announcement search will use icontains")
+            available, created = False, False
+        else:
+            available, created = True, True
+
+    if using == DEFAULT_DB_ALIAS:
+        _available = available
+    return created
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS):
+    """Re-index every announcement on the ``using`` database, returns the number of indexed rows"""
+    from .models import Announcement
+
+    if not is_available(using):
+        return 0
+
+    table = Announcement._meta.db_table
+    columns = ', '.join(INDEXED_FIELDS)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+            f"SELECT id, {columns} FROM {table}"
+        )
+        return cursor.rowcount
+
+
+def index_announcement(announcement):
+    """Insert or replace a single announcement in the index"""
+    if not is_available():
+        return
+
+    columns = ', '.join(INDEXED_FIELDS)
+    placeholders = ', '.join(['%s'] * (len(INDEXED_FIELDS) + 1))
+    values = [announcement.pk] + [getattr(announcement, field) or '' for field in INDEXED_FIELDS]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [announcement.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES ({placeholders})",
+            values
+        )
+
+
+def remove_announcement(pk):
+    """Drop a single announcement from the index"""
+    if not is_available():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def build_match_query(search):
+    """
+    Turn user input into an FTS5 MATCH expression.
+
+    Every whitespace separated term is quoted so that FTS5 operators typed
+    by the user are matched literally, and all terms must match. Returns
+    None when a term is too short for the trigram tokenizer.
+    """
+    terms = search.split()
+    if not terms or any(len(term) < MIN_TERM_LENGTH for term in terms):
+        return None
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_announcements(queryset, search):
+    """
+    Filter an announcement queryset by a search string.
+
+    When the index can serve the query the result is annotated with
+    ``search_rank`` (bm25, lower is better) and ``search_snippet`` (the best
+    matching fragment, pass it through ``highlight``). Otherwise the old
+    ``icontains`` filter is applied and no annotations are added. Either
+    way the result still composes with any other filters.
+    """
+    match = build_match_query(search)
+    if match is None or not is_available():
+        return queryset.filter(
+            Q(title_th__icontains=search) |
+            Q(title_en__icontains=search) |
+            Q(content_th__icontains=search) |
+            Q(content_en__icontains=search)
+        )
+
+    table = queryset.model._meta.db_table
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    matching_row = f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id"
+
+    return queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+    ).annotate(
+        search_rank=RawSQL(
+            f"SELECT bm25({FTS_TABLE}, {weights}) {matching_row}",
+            [match],
+            output_field=FloatField()
+        ),
+        search_snippet=RawSQL(
+            f"SELECT snippet({FTS_TABLE}, -1, %s, %s, %s, %s) {matching_row}",
+            [SNIPPET_OPEN_MARKER, SNIPPET_CLOSE_MARKER, '…', SNIPPET_TOKENS, match],
+            output_field=TextField()
+        ),
+    )
+
+
+def highlight(snippet):
+    """HTML-escape a ``search_snippet`` and wrap its hits in ``<mark>``"""
+    if snippet is None:
+        return None
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_OPEN_MARKER, SNIPPET_OPEN)
+        .replace(SNIPPET_CLOSE_MARKER, SNIPPET_CLOSE)
+    )
@@ -1,71 +1,109 @@
+from django.core.cache import cache
 from rest_framework import serializers
+from tsak_backend.bilingual import BilingualField
+from . import caching, search
 from .models import Announcement, RelatedLink, Semester
 
 
+class CachedFragmentMixin:
+    """
+    Caches the rendered, locale-projected representation of each object.
+
+    ``volatile_fields`` change without touching ``updated_at`` (the view
+    counter, search snippets) so they are re-rendered on every call and
+    written over the cached fragment.
+    """
+    fragment_name = None
+    volatile_fields = ()
+
+    def fragment_key(self, instance):
+        return caching.fragment_key(self.fragment_name, instance, self.context.get('locale', 'th'))
+
+    def render_fragment(self, instance):
+        return super().to_representation(instance)
+
+    def apply_volatile(self, instance, fragment):
+        data = dict(fragment)
+        for name in self.volatile_fields:
+            field = self.fields[name]
+            data[name] = field.to_representation(field.get_attribute(instance))
+        return data
+
+    def to_representation(self, instance):
+        key = self.fragment_key(instance)
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self.render_fragment(instance)
+            cache.set(key, fragment, caching.FRAGMENT_TIMEOUT)
+        return self.apply_volatile(instance, fragment)
+
+
+class CachedFragmentListSerializer(serializers.ListSerializer):
+    """Fetches all fragments in one cache round trip and renders only the misses"""
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        keys = [self.child.fragment_key(item) for item in items]
+        cached = cache.get_many(keys)
+
+        missing = {}
+        result = []
+        for item, key in zip(items, keys):
+            fragment = cached.get(key)
+            if fragment is None:
+                fragment = missing[key] = self.child.render_fragment(item)
+            result.append(self.child.apply_volatile(item, fragment))
+
+        if missing:
+            cache.set_many(missing, caching.FRAGMENT_TIMEOUT)
+        return result
+
+
 class RelatedLinkSerializer(serializers.ModelSerializer):
-    name = serializers.SerializerMethodField()
+    name = BilingualField('name_th', 'name_en')
     
     class Meta:
         model = RelatedLink
         fields = ['id', 'name', 'url', 'order']
-    
-    def get_name(self, obj):
-        locale = self.context.get('locale', 'th')
-        if locale == 'en' and obj.name_en:
-            return obj.name_en
-        return obj.name_th
 
 class SemesterSerializer(serializers.ModelSerializer):
-    display_name = serializers.SerializerMethodField()
+    display_name = BilingualField('name_th', 'name_en', fallback=False)
 
     class Meta:
         model = Semester
         fields = ['code', 'display_name']
 
-    def get_display_name(self, obj):
-        locale = self.context.get('locale', 'th')
-        if locale == 'en':
-            return obj.name_en
-        return obj.name_th
+class AnnouncementListSerializer(CachedFragmentMixin, serializers.ModelSerializer):
+    fragment_name = 'list'
+    volatile_fields = ('views', 'snippet')
 
-class AnnouncementListSerializer(serializers.ModelSerializer):
-    title = serializers.SerializerMethodField()
-    semester = serializers.SerializerMethodField()
-
-    def get_semester(self, obj):
-        locale = self.context.get('locale', 'th')
-        semester = obj.semester
-        return {
-            "code": semester.code,
-            "name": semester.name_en if locale == 'en' else semester.name_th
-        }
+    title = BilingualField('title_th', 'title_en')
+    semester = SemesterSerializer(read_only=True)
+    snippet = serializers.SerializerMethodField()
 
     class Meta:
         model = Announcement
+        list_serializer_class = CachedFragmentListSerializer
         fields = [
             'id',
             'date',
             'semester',
             'department',
             'title',
-            'views'
+            'views',
+            'snippet'
         ]
 
-    def get_title(self, obj):
-        locale = self.context.get('locale', 'th')
-        return obj.title_en if locale == 'en' and obj.title_en else obj.title_th
-
-    def get_semester(self, obj):
-        locale = self.context.get('locale', 'th')
-        semester = obj.semester
-        return {
-            "code": semester.code,
-            "display_name": semester.name_en if locale == 'en' else semester.name_th
-        }
-
-class AnnouncementDetailSerializer(serializers.ModelSerializer):
-    title = serializers.SerializerMethodField()
-    content = serializers.SerializerMethodField()
+    def get_snippet(self, obj):
+        """Highlighted match from the full-text index, only set when searching"""
+        return search.highlight(getattr(obj, 'search_snippet', None))
+
+class AnnouncementDetailSerializer(CachedFragmentMixin, serializers.ModelSerializer):
+    fragment_name = 'detail'
+    volatile_fields = ('views',)
+
+    title = BilingualField('title_th', 'title_en')
+    content = BilingualField('content_th', 'content_en')
     semester = SemesterSerializer(read_only=True)
     related_links = RelatedLinkSerializer(many=True, read_only=True)
 
@@ -83,11 +121,3 @@ class AnnouncementDetailSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at'
         ]
-
-    def get_title(self, obj):
-        locale = self.context.get('locale', 'th')
-        return obj.title_en if locale == 'en' and obj.title_en else obj.title_th
-
-    def get_content(self, obj):
-        locale = self.context.get('locale', 'th')
-        return obj.content_en if locale == 'en' and obj.content_en else obj.content_th
@@ -0,0 +1,73 @@
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import caching, search, similarity
+from .models import Announcement, RelatedAnnouncement, RelatedLink, Semester
+
+
+def create_search_index(sender, using='default', **kwargs):
+    """Create (and fill) the full-text index once the tables exist"""
+    # post_migrate also runs when only other apps were migrated
+    if Announcement._meta.db_table not in connections[using].introspection.table_names():
+        return
+    if search.create_index(using):
+        search.rebuild_index(using)
+
+
+@receiver(post_save, sender=Announcement)
+def index_announcement(sender, instance, **kwargs):
+    search.index_announcement(instance)
+
+
+@receiver(post_delete, sender=Announcement)
+def unindex_announcement(sender, instance, **kwargs):
+    search.remove_announcement(instance.pk)
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def invalidate_filters(sender, **kwargs):
+    caching.invalidate_filters()
+
+
+@receiver(post_save, sender=Announcement)
+def refresh_related(sender, instance, raw=False, **kwargs):
+    # Recomputed in the background once the save commits, see similarity.refresh_pending
+    if raw:
+        return
+    similarity.queue_refresh([instance.pk])
+    transaction.on_commit(similarity.refresh_in_background)
+
+
+@receiver(pre_delete, sender=Announcement)
+def refresh_related_on_delete(sender, instance, **kwargs):
+    # The neighbor rows cascade away with the announcement, so remember
+    # whose lists pointed at it and queue them for recomputing
+    owners = list(
+        RelatedAnnouncement.objects
+        .filter(related=instance)
+        .values_list('announcement_id', flat=True)
+    )
+    similarity.queue_refresh(owners)
+    transaction.on_commit(similarity.refresh_in_background)
+
+
+@receiver(post_save, sender=Semester)
+def touch_semester_announcements(sender, instance, raw=False, **kwargs):
+    # Rendered announcements embed the semester name and are cached by updated_at
+    if raw:
+        return
+    Announcement.objects.filter(semester=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=RelatedLink)
+@receiver(post_delete, sender=RelatedLink)
+def touch_link_announcement(sender, instance, raw=False, **kwargs):
+    # Rendered announcements embed their links and are cached by updated_at
+    if raw:
+        return
+    Announcement.objects.filter(pk=instance.announcement_id).update(updated_at=timezone.now())
@@ -0,0 +1,231 @@
+"""
+Content similarity between announcements.
+
+Every published announcement is turned into a TF-IDF vector over character
+trigrams of its Thai and English title and content (titles weighted
+higher). Trigrams are used for the same reason as in the search index:
+Thai has no spaces between words. Cosine similarity is computed through an
+inverted index, so only announcements that share at least one trigram are
+compared, and the top ``TOP_K`` neighbors of each announcement are stored
+in ``RelatedAnnouncement``.
+
+Building the index reads every published announcement, so it is kept out
+of the save path: saving or deleting an announcement only queues the
+affected ids (``queue_refresh``). ``refresh_pending`` drains the queue with
+one index build for the whole batch and updates only the neighbor lists
+the queued changes touch. Once the saving transaction commits it runs from
+a background thread of the process that saved (``refresh_in_background``),
+and ``manage.py rebuild_related_index --pending`` applies anything left
+queued, e.g. by a process that exited first; without ``--pending`` the
+command recomputes everything.
+"""
+import heapq
+import logging
+import math
+import threading
+from collections import Counter, defaultdict
+
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 8
+TITLE_WEIGHT = 3
+NGRAM = 3
+
+TEXT_FIELDS = ['title_th', 'title_en', 'content_th', 'content_en']
+
+_refresh_lock = threading.Lock()
+_refresh_requested = False
+_refresh_thread = None
+
+
+def tokenize(text):
+    """Character trigrams of each word, short words are kept whole"""
+    tokens = []
+    for word in (text or '').lower().split():
+        if len(word) <= NGRAM:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + NGRAM] for i in range(len(word) - NGRAM + 1))
+    return tokens
+
+
+def document_terms(row):
+    terms = Counter()
+    for token in tokenize(row['title_th']) + tokenize(row['title_en']):
+        terms[token] += TITLE_WEIGHT
+    terms.update(tokenize(row['content_th']) + tokenize(row['content_en']))
+    return terms
+
+
+class SimilarityIndex:
+    """TF-IDF vectors with an inverted index for cosine similarity lookups"""
+
+    def __init__(self, documents):
+        # documents: {announcement id: Counter of terms}
+        document_frequency = Counter()
+        for terms in documents.values():
+            document_frequency.update(terms.keys())
+
+        total = len(documents)
+        idf = {
+            term: math.log((1 + total) / (1 + count)) + 1
+            for term, count in document_frequency.items()
+        }
+
+        self.vectors = {}
+        self.postings = defaultdict(list)
+        for pk, terms in documents.items():
+            vector = {term: (1 + math.log(count)) * idf[term] for term, count in terms.items()}
+            norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+            vector = {term: weight / norm for term, weight in vector.items()}
+            self.vectors[pk] = vector
+            for term, weight in vector.items():
+                self.postings[term].append((pk, weight))
+
+    @classmethod
+    def from_database(cls):
+        from .models import Announcement
+
+        rows = Announcement.objects.filter(is_published=True).values('id', *TEXT_FIELDS)
+        return cls({row['id']: document_terms(row) for row in rows})
+
+    def __contains__(self, pk):
+        return pk in self.vectors
+
+    def scores(self, pk):
+        """Cosine similarity of ``pk`` against every announcement sharing a term"""
+        scores = defaultdict(float)
+        for term, weight in self.vectors.get(pk, {}).items():
+            for other, other_weight in self.postings[term]:
+                if other != pk:
+                    scores[other] += weight * other_weight
+        return scores
+
+    def neighbors(self, pk, top_k=TOP_K):
+        """The ``top_k`` most similar announcements as (id, score), best first"""
+        scores = self.scores(pk)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+def _store(index, pks):
+    """Replace the stored neighbor lists of ``pks``"""
+    from .models import RelatedAnnouncement
+
+    pks = list(pks)
+    rows = [
+        RelatedAnnouncement(announcement_id=pk, related_id=other, score=score, rank=rank)
+        for pk in pks if pk in index
+        for rank, (other, score) in enumerate(index.neighbors(pk))
+    ]
+    with transaction.atomic():
+        RelatedAnnouncement.objects.filter(announcement_id__in=pks).delete()
+        RelatedAnnouncement.objects.bulk_create(rows)
+    return len(rows)
+
+
+def rebuild_index():
+    """Recompute the neighbor lists of every announcement"""
+    from .models import RelatedAnnouncement, RelatedRefresh
+
+    started = timezone.now()
+    index = SimilarityIndex.from_database()
+    with transaction.atomic():
+        RelatedAnnouncement.objects.all().delete()
+        _store(index, index.vectors.keys())
+        RelatedRefresh.objects.filter(queued_at__lte=started).delete()
+    return len(index.vectors)
+
+
+def queue_refresh(pks):
+    """Queue the neighbor lists of ``pks`` for ``refresh_pending``"""
+    from .models import RelatedRefresh
+
+    for pk in pks:
+        # update_or_create bumps queued_at, so a refresh already running keeps it queued
+        RelatedRefresh.objects.update_or_create(announcement_id=pk)
+
+
+def refresh_pending():
+    """Apply every queued change, returns the number of announcements dequeued"""
+    from .models import RelatedRefresh
+
+    started = timezone.now()
+    pks = list(RelatedRefresh.objects.values_list('announcement_id', flat=True))
+    if not pks:
+        return 0
+    refresh_announcements(pks)
+    RelatedRefresh.objects.filter(announcement_id__in=pks, queued_at__lte=started).delete()
+    return len(pks)
+
+
+def refresh_in_background():
+    """
+    on_commit callback: run ``refresh_pending`` from this process's refresh
+    thread, starting it if needed. Requests made while it runs are picked
+    up before it exits, so a burst of saves costs one or two index builds.
+    """
+    global _refresh_requested, _refresh_thread
+    with _refresh_lock:
+        _refresh_requested = True
+        # Threads do not survive a fork, is_alive() is False in the child
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _refresh_thread = threading.Thread(
+                target=_drain, name='related-announcements-refresh', daemon=True
+            )
+            _refresh_thread.start()
+
+
+def _drain():
+    global _refresh_requested, _refresh_thread
+    while True:
+        with _refresh_lock:
+            if not _refresh_requested:
+                _refresh_thread = None
+                return
+            _refresh_requested = False
+        try:
+            refresh_pending()
+        except DatabaseError:
+            # Left queued for the next save or rebuild_related_index --pending
+            logger.exception("Failed to refresh related announcements")
+        finally:
+            close_old_connections()
+
+
+def refresh_announcements(pks):
+    """
+    Update the neighbor lists affected by changes to announcements ``pks``.
+
+    That is the lists of ``pks`` themselves, the lists that currently
+    contain one of them, and the lists they now score high enough to enter.
+    Lists of unrelated announcements are left alone, so IDF weights drift
+    slightly until the next full rebuild.
+    """
+    from .models import RelatedAnnouncement
+
+    pks = set(pks)
+    index = SimilarityIndex.from_database()
+
+    stored = defaultdict(list)
+    for row in RelatedAnnouncement.objects.values('announcement_id', 'related_id', 'score'):
+        stored[row['announcement_id']].append((row['related_id'], row['score']))
+
+    affected = set(pks)
+    affected.update(owner for owner, neighbors in stored.items() if any(other in pks for other, _ in neighbors))
+    for pk in pks:
+        for other, score in index.scores(pk).items():
+            neighbors = stored.get(other, [])
+            if len(neighbors) < TOP_K or score > min(s for _, s in neighbors):
+                affected.add(other)
+
+    refresh_neighbors(affected, index=index)
+
+
+def refresh_neighbors(pks, index=None):
+    """Recompute the stored lists of ``pks``, dropping those no longer published"""
+    if index is None:
+        index = SimilarityIndex.from_database()
+    _store(index, pks)
@@ -1,3 +1,345 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import time
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import caching, search, signals, similarity, trending
+from .counters import ViewCounterBuffer, view_counter
+from .models import (
+    Announcement, AnnouncementDailyViews, AnnouncementViewEvent,
+    RelatedAnnouncement, RelatedLink, RelatedRefresh, Semester,
+)
+from .serializers import AnnouncementListSerializer
+
+
+def create_announcement(semester, **fields):
+    fields.setdefault('title_th', 'ประกาศ')
+    fields.setdefault('content_th', 'เนื้อหา')
+    return Announcement.objects.create(semester=semester, **fields)
+
+
+class AnnouncementTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Flushed by hand instead of from the background thread
+        flusher = mock.patch.object(ViewCounterBuffer, '_ensure_flusher')
+        flusher.start()
+        self.addCleanup(flusher.stop)
+        self.addCleanup(view_counter.flush)
+        self.semester = Semester.objects.create(code='spring_2025', name_th='ฤดูใบไม้ผลิ', name_en='Spring')
+
+
+class ViewCounterTests(AnnouncementTestCase):
+    def test_detail_views_are_buffered_then_flushed_in_one_batch(self):
+        announcement = create_announcement(self.semester)
+        for expected in [1, 2, 3]:
+            response = self.client.get(f'/api/announcements/{announcement.pk}/')
+            self.assertEqual(response.json()['views'], expected)
+
+        announcement.refresh_from_db()
+        self.assertEqual(announcement.views, 0)
+
+        # Savepoint, existing ids, one UPDATE, one INSERT, release
+        with self.assertNumQueries(5):
+            view_counter.flush()
+        announcement.refresh_from_db()
+        self.assertEqual(announcement.views, 3)
+        self.assertEqual(sum(AnnouncementViewEvent.objects.values_list('count', flat=True)), 3)
+
+    def test_not_modified_detail_still_counts_a_view(self):
+        announcement = create_announcement(self.semester)
+        url = f'/api/announcements/{announcement.pk}/'
+        first = self.client.get(url)
+        response = self.client.get(url, headers={'if_none_match': first['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(view_counter.buffered(announcement.pk), 2)
+
+        # Views are not part of the detail ETag, so counting them does not break revalidation
+        response = self.client.get(url, headers={'if_none_match': first['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_threshold_flushes_without_waiting_for_the_thread(self):
+        announcement = create_announcement(self.semester)
+        counter = ViewCounterBuffer(flush_interval=60, flush_threshold=2)
+        self.assertEqual(counter.increment(announcement.pk), 1)
+        self.assertEqual(counter.increment(announcement.pk), 2)
+        self.assertEqual(counter.buffered(announcement.pk), 0)
+
+        announcement.refresh_from_db()
+        self.assertEqual(announcement.views, 2)
+
+    def test_views_of_deleted_announcements_are_dropped(self):
+        announcement = create_announcement(self.semester)
+        view_counter.increment(announcement.pk)
+        announcement.delete()
+        self.assertEqual(view_counter.flush(), 0)
+        self.assertFalse(AnnouncementViewEvent.objects.exists())
+
+
+class CursorPaginationTests(AnnouncementTestCase):
+    def setUp(self):
+        super().setUp()
+        # Ties on date and views, so the id tie-breaker matters
+        for i in range(7):
+            create_announcement(self.semester, title_th=f'ประกาศ {i}', date=date(2025, 1, 1 + i % 3), views=i % 2)
+
+    def walk(self, **params):
+        """Ids of every page following the next links, then back along the previous links"""
+        url, forward = '/api/announcements/', []
+        params = {'pagination': 'cursor', 'page_size': 3, **params}
+        pages = []
+        while url:
+            body = self.client.get(url, params).json()
+            params = None
+            pages.append(body)
+            forward += [result['id'] for result in body['results']]
+            url = body['next']
+
+        backward = []
+        url = pages[-1]['previous']
+        while url:
+            body = self.client.get(url).json()
+            backward = [result['id'] for result in body['results']] + backward
+            url = body['previous']
+        return forward, backward, pages
+
+    def expected(self, *ordering):
+        return list(Announcement.objects.order_by(*ordering).values_list('id', flat=True))
+
+    def test_pages_cover_every_row_once_in_both_directions(self):
+        cases = [
+            ({}, ('-date', '-id')),
+            ({'sort_order': 'asc'}, ('date', 'id')),
+            ({'sort_by': 'views'}, ('-views', '-id')),
+            ({'sort_by': 'views', 'sort_order': 'asc'}, ('views', 'id')),
+        ]
+        for params, ordering in cases:
+            with self.subTest(**params):
+                forward, backward, pages = self.walk(**params)
+                self.assertEqual(forward, self.expected(*ordering))
+                self.assertEqual(backward, forward[:-len(pages[-1]['results'])])
+
+    def test_count_only_on_request(self):
+        _, _, pages = self.walk()
+        self.assertNotIn('count', pages[0])
+        _, _, pages = self.walk(with_count='true')
+        self.assertEqual(pages[0]['count'], 7)
+
+    def test_bad_cursors(self):
+        response = self.client.get('/api/announcements/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+        # Well-formed cursors whose value does not fit the sort field
+        for sort_by, value in [('date', 'garbage'), ('views', 'abc'), ('date', None), ('views', None)]:
+            cursor = base64.urlsafe_b64encode(json.dumps({'v': value, 'id': 1}).encode()).decode()
+            with self.subTest(sort_by=sort_by, value=value):
+                response = self.client.get('/api/announcements/', {'cursor': cursor, 'sort_by': sort_by})
+                self.assertEqual(response.status_code, 404)
+        response = self.client.get('/api/announcements/', {'pagination': 'cursor', 'search': 'ประกาศ'})
+        self.assertEqual(response.status_code, 400)
+
+
+class FragmentCacheTests(AnnouncementTestCase):
+    def setUp(self):
+        super().setUp()
+        self.announcement = create_announcement(self.semester, title_th='ข่าว', title_en='News')
+        render = mock.patch.object(
+            AnnouncementListSerializer, 'render_fragment', autospec=True,
+            side_effect=AnnouncementListSerializer.render_fragment,
+        )
+        self.render = render.start()
+        self.addCleanup(render.stop)
+
+    def first(self, **params):
+        return self.client.get('/api/announcements/', params).json()['results'][0]
+
+    def test_rendered_once_per_locale(self):
+        self.assertEqual(self.first()['title'], 'ข่าว')
+        self.assertEqual(self.first(locale='en')['title'], 'News')
+        self.assertEqual(self.render.call_count, 2)
+
+        self.assertEqual(self.first(locale='en')['title'], 'News')
+        self.assertEqual(self.first()['title'], 'ข่าว')
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_volatile_views_bypass_the_cache(self):
+        self.first()
+        Announcement.objects.filter(pk=self.announcement.pk).update(views=5)
+        self.assertEqual(self.first()['views'], 5)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_edits_and_semester_renames_are_rendered(self):
+        self.first(locale='en')
+        self.announcement.title_en = 'Update'
+        self.announcement.save()
+        self.assertEqual(self.first(locale='en')['title'], 'Update')
+
+        self.semester.name_en = 'Spring term'
+        self.semester.save()
+        self.assertEqual(self.first(locale='en')['semester']['display_name'], 'Spring term')
+        self.assertEqual(self.render.call_count, 3)
+
+    def test_detail_shows_new_links(self):
+        url = f'/api/announcements/{self.announcement.pk}/'
+        self.assertEqual(self.client.get(url).json()['related_links'], [])
+        RelatedLink.objects.create(announcement=self.announcement, name_th='ลิงก์', url='https://example.com')
+        self.assertEqual(len(self.client.get(url).json()['related_links']), 1)
+
+
+class TrendingTests(AnnouncementTestCase):
+    def view(self, announcement, count, days_ago=0):
+        day = timezone.localdate() - timedelta(days=days_ago)
+        AnnouncementViewEvent.objects.create(announcement=announcement, day=day, count=count)
+
+    def test_rollup_folds_events_into_daily_rows(self):
+        announcement = create_announcement(self.semester)
+        self.view(announcement, 2)
+        self.view(announcement, 3)
+        self.view(announcement, 4, days_ago=1)
+
+        self.assertEqual(trending.rollup_view_events(), 3)
+        self.assertFalse(AnnouncementViewEvent.objects.exists())
+        self.assertEqual(
+            list(AnnouncementDailyViews.objects.order_by('day').values_list('views', flat=True)), [4, 5]
+        )
+
+        self.view(announcement, 1)
+        trending.rollup_view_events()
+        self.assertEqual(AnnouncementDailyViews.objects.get(day=timezone.localdate()).views, 6)
+
+    @override_settings(ANNOUNCEMENT_TRENDING_HALF_LIFE_DAYS=3, ANNOUNCEMENT_TRENDING_WINDOW_DAYS=14)
+    def test_recent_views_outweigh_older_ones(self):
+        fresh = create_announcement(self.semester, title_th='ใหม่')
+        old = create_announcement(self.semester, title_th='เก่า')
+        hidden = create_announcement(self.semester, title_th='ซ่อน', is_published=False)
+        self.view(fresh, 10)
+        # Twice the views, but two half-lives ago
+        self.view(old, 20, days_ago=6)
+        self.view(hidden, 100)
+        # Outside the window
+        self.view(old, 1000, days_ago=14)
+
+        call_command('refresh_trending', stdout=io.StringIO())
+        response = self.client.get('/api/announcements/trending/')
+        self.assertEqual([row['title'] for row in response.json()], ['ใหม่', 'เก่า'])
+        self.assertEqual(len(self.client.get('/api/announcements/trending/', {'limit': 1}).json()), 1)
+
+        # Unpublishing a ranked announcement shows before the next refresh
+        old.is_published = False
+        old.save()
+        again = self.client.get('/api/announcements/trending/', headers={'if_none_match': response['ETag']})
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual([row['title'] for row in again.json()], ['ใหม่'])
+
+
+class FiltersCacheTests(AnnouncementTestCase):
+    def total(self):
+        return self.client.get('/api/announcements/filters/').json()['semesters'][0]['count']
+
+    def test_counts_and_local_invalidation(self):
+        create_announcement(self.semester, department='it')
+        response = self.client.get('/api/announcements/filters/', {'locale': 'en'}).json()
+        self.assertEqual(response['semesters'][0], {'code': 'All', 'display_name': 'All', 'count': 1})
+        self.assertEqual(response['semesters'][1]['display_name'], 'Spring')
+        self.assertEqual(response['department_counts'], {'All': 1, 'it': 1})
+
+        # A save in this process drops the cached entry right away
+        create_announcement(self.semester)
+        self.assertEqual(self.total(), 2)
+
+    def test_entries_expire_for_writes_in_other_processes(self):
+        create_announcement(self.semester)
+        self.assertEqual(self.total(), 1)
+
+        # Another worker's write does not reach this process's cache...
+        Announcement.objects.bulk_create([Announcement(semester=self.semester, title_th='x', content_th='y')])
+        self.assertEqual(self.total(), 1)
+
+        # ...so the entry has to expire by itself
+        later = time.time() + caching.FILTERS_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertEqual(self.total(), 2)
+
+
+class RelatedRefreshTests(AnnouncementTestCase):
+    def neighbors(self, announcement):
+        return list(RelatedAnnouncement.objects.filter(announcement=announcement).values_list('related_id', flat=True))
+
+    def test_saves_queue_the_refresh_instead_of_running_it(self):
+        first = create_announcement(self.semester, title_th='ทุนการศึกษาวิศวกรรม', content_th='สมัครทุนการศึกษา')
+        second = create_announcement(self.semester, title_th='ทุนการศึกษาวิทยาศาสตร์', content_th='สมัครทุนการศึกษา')
+
+        with mock.patch.object(similarity.SimilarityIndex, 'from_database') as from_database:
+            second.save()
+        from_database.assert_not_called()
+        self.assertFalse(RelatedAnnouncement.objects.exists())
+        self.assertEqual(
+            set(RelatedRefresh.objects.values_list('announcement_id', flat=True)), {first.pk, second.pk}
+        )
+
+        self.assertEqual(similarity.refresh_pending(), 2)
+        self.assertEqual(self.neighbors(first), [second.pk])
+        self.assertEqual(self.neighbors(second), [first.pk])
+        self.assertFalse(RelatedRefresh.objects.exists())
+
+    def test_committed_saves_refresh_in_one_background_thread(self):
+        thread = mock.patch.object(similarity.threading, 'Thread')
+        with mock.patch.object(similarity, '_refresh_thread', None), thread as thread:
+            with self.captureOnCommitCallbacks(execute=True):
+                first = create_announcement(self.semester, title_th='ทุนการศึกษาวิศวกรรม', content_th='สมัครทุน')
+                second = create_announcement(self.semester, title_th='ทุนการศึกษาวิทยาศาสตร์', content_th='สมัครทุน')
+            thread.assert_called_once()
+            thread.return_value.start.assert_called_once()
+
+            # Run the thread's work here, on the test transaction
+            with mock.patch.object(similarity, 'close_old_connections'):
+                thread.call_args.kwargs['target']()
+            self.assertIsNone(similarity._refresh_thread)
+        self.assertEqual(self.neighbors(first), [second.pk])
+        self.assertFalse(RelatedRefresh.objects.exists())
+
+    def test_delete_queues_the_lists_that_pointed_at_it(self):
+        first = create_announcement(self.semester, title_th='ทุนการศึกษาวิศวกรรม', content_th='สมัครทุนการศึกษา')
+        second = create_announcement(self.semester, title_th='ทุนการศึกษาวิทยาศาสตร์', content_th='สมัครทุนการศึกษา')
+        similarity.rebuild_index()
+        self.assertFalse(RelatedRefresh.objects.exists())
+
+        second.delete()
+        self.assertEqual(list(RelatedRefresh.objects.values_list('announcement_id', flat=True)), [first.pk])
+        similarity.refresh_pending()
+        self.assertEqual(self.neighbors(first), [])
+
+
+class SearchTests(AnnouncementTestCase):
+    def search(self, term):
+        return self.client.get('/api/announcements/', {'search': term}).json()['results']
+
+    def test_title_hits_rank_first(self):
+        create_announcement(self.semester, title_th='ประกาศทั่วไป', content_th='รายละเอียดทุนการศึกษา')
+        create_announcement(self.semester, title_th='ทุนการศึกษา', content_th='รายละเอียด')
+        create_announcement(self.semester, title_th='กิจกรรม', content_th='ไม่เกี่ยวข้อง')
+
+        results = self.search('ทุนการ')
+        self.assertTrue(search.is_available())
+        self.assertEqual([result['title'] for result in results], ['ทุนการศึกษา', 'ประกาศทั่วไป'])
+
+    def test_post_migrate_indexes_the_migrated_database(self):
+        create_announcement(self.semester, title_th='ทุนการศึกษา')
+        with mock.patch.object(search, 'rebuild_index', wraps=search.rebuild_index) as rebuild:
+            with mock.patch.object(search, 'create_index', return_value=True) as create:
+                signals.create_search_index(sender=None, using='default')
+        create.assert_called_once_with('default')
+        rebuild.assert_called_once_with('default')
+        self.assertEqual(search.rebuild_index('default'), 1)
+
+    def test_snippet_escapes_the_content(self):
+        create_announcement(self.semester, content_th='<i>ทุนการศึกษา</i>')
+
+        snippet = self.search('ทุนการ')[0]['snippet']
+        self.assertEqual(snippet, '&lt;i&gt;<mark>ทุนการ</mark>ศึกษา&lt;/i&gt;')
@@ -0,0 +1,106 @@
+"""
+Daily view rollups and the trending ranking.
+
+The view counter appends ``AnnouncementViewEvent`` rows when it flushes.
+``rollup_view_events`` folds them into ``AnnouncementDailyViews``, and
+``recompute_trending`` scores every published announcement by its daily
+views over the last ``ANNOUNCEMENT_TRENDING_WINDOW_DAYS`` days, halving the
+weight of a day every ``ANNOUNCEMENT_TRENDING_HALF_LIFE_DAYS`` days, and
+stores the top ``ANNOUNCEMENT_TRENDING_SIZE`` in ``TrendingAnnouncement``.
+
+Nothing runs them on its own: schedule ``manage.py refresh_trending``
+from cron, e.g. every five minutes::
+
+    */5 * * * * python manage.py refresh_trending
+
+Until it runs, new views are counted but the ranking does not move.
+"""
+import heapq
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+DEFAULT_WINDOW_DAYS = 14
+DEFAULT_HALF_LIFE_DAYS = 3
+DEFAULT_SIZE = 50
+
+
+class ConcurrentRollup(Exception):
+    """Another process folded some of the same events first"""
+
+
+def rollup_view_events():
+    """Fold pending view events into the daily rollups, returns the number of events folded"""
+    from .models import AnnouncementDailyViews, AnnouncementViewEvent
+
+    try:
+        with transaction.atomic():
+            events = list(AnnouncementViewEvent.objects.values_list('id', 'announcement_id', 'day', 'count'))
+            if not events:
+                return 0
+
+            # Delete first: if a concurrent rollup already took some of these
+            # events the counts differ and this transaction backs out
+            deleted, _ = AnnouncementViewEvent.objects.filter(id__in=[event[0] for event in events]).delete()
+            if deleted != len(events):
+                raise ConcurrentRollup
+
+            totals = defaultdict(int)
+            for _, announcement_id, day, count in events:
+                totals[(announcement_id, day)] += count
+
+            existing = {
+                (rollup.announcement_id, rollup.day): rollup
+                for rollup in AnnouncementDailyViews.objects.filter(
+                    announcement_id__in={key[0] for key in totals},
+                    day__in={key[1] for key in totals},
+                )
+            }
+            updated, created = [], []
+            for (announcement_id, day), count in totals.items():
+                rollup = existing.get((announcement_id, day))
+                if rollup is None:
+                    created.append(AnnouncementDailyViews(announcement_id=announcement_id, day=day, views=count))
+                else:
+                    rollup.views += count
+                    updated.append(rollup)
+
+            AnnouncementDailyViews.objects.bulk_update(updated, ['views'])
+            AnnouncementDailyViews.objects.bulk_create(created)
+    except ConcurrentRollup:
+        return 0
+    return len(events)
+
+
+def recompute_trending():
+    """Rebuild the materialized ranking, returns the number of ranked announcements"""
+    from .models import AnnouncementDailyViews, TrendingAnnouncement
+
+    window = getattr(settings, 'ANNOUNCEMENT_TRENDING_WINDOW_DAYS', DEFAULT_WINDOW_DAYS)
+    half_life = getattr(settings, 'ANNOUNCEMENT_TRENDING_HALF_LIFE_DAYS', DEFAULT_HALF_LIFE_DAYS)
+    size = getattr(settings, 'ANNOUNCEMENT_TRENDING_SIZE', DEFAULT_SIZE)
+
+    now = timezone.now()
+    today = timezone.localdate(now)
+    decay = math.log(2) / half_life
+
+    scores = defaultdict(float)
+    rollups = AnnouncementDailyViews.objects.filter(
+        day__gt=today - timedelta(days=window),
+        announcement__is_published=True,
+    ).values_list('announcement_id', 'day', 'views')
+    for announcement_id, day, views in rollups:
+        scores[announcement_id] += views * math.exp(-decay * (today - day).days)
+
+    top = heapq.nlargest(size, scores.items(), key=lambda item: (item[1], item[0]))
+    with transaction.atomic():
+        TrendingAnnouncement.objects.all().delete()
+        TrendingAnnouncement.objects.bulk_create([
+            TrendingAnnouncement(announcement_id=announcement_id, score=score, rank=rank, computed_at=now)
+            for rank, (announcement_id, score) in enumerate(top)
+        ])
+    return len(top)
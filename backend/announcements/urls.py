@@ -15,12 +15,22 @@ urlpatterns = [
 # GET    /api/announcements/{id}/         - Get single announcement (increments view)
 # GET    /api/announcements/filters/      - Get available filter options
 # GET    /api/announcements/{id}/related/ - Get related announcements
+# GET    /api/announcements/trending/     - Get trending announcements (decayed recent views)
 
 # Example API calls:
 # 
 # List with filters:
 # /api/announcements/?locale=th&semester=spring_2025&department=executive&search=ไฟป่า&sort_by=views&sort_order=desc&date_from=2025-01-01&date_to=2025-12-31
 #
+# Full-text search ranked by relevance (snippet holds the highlighted match):
+# /api/announcements/?locale=th&search=ไฟป่า&sort_by=relevance
+#
+# Keyset pagination (follow "next"/"previous", add with_count=true for a cached total):
+# /api/announcements/?locale=th&pagination=cursor&sort_by=views&sort_order=desc&page_size=20
+#
+# Fetch several by id in one request (results keep the requested order):
+# /api/announcements/?locale=th&ids=12,3,7
+#
 # Get single (auto-increments view count):
 # /api/announcements/1/?locale=en
 #
@@ -1,17 +1,79 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Count, Sum
 from django.utils.dateparse import parse_date
-from .models import Announcement, Semester
+from django.utils.decorators import method_decorator
+from tsak_backend.bilingual import localize, request_locale
+from tsak_backend.conditional import conditional_get, table_version
+from tsak_backend.listing import list_response
+from tsak_backend.multiget import multiget_response, parse_ids
+from . import caching
+from .counters import view_counter
+from .models import Announcement, Semester, TrendingAnnouncement
+from .pagination import AnnouncementCursorPagination
+from .search import search_announcements
 from .serializers import AnnouncementListSerializer, AnnouncementDetailSerializer, SemesterSerializer
 
+RELATED_LIMIT = 4
+TRENDING_LIMIT = 10
+TRENDING_MAX_LIMIT = 50
+
+
+def announcements_version(request, *args, **kwargs):
+    """
+    Version of the published announcements. The view total is included
+    because list rows show (and can be sorted by) views, which change
+    without touching updated_at.
+    """
+    return [table_version(
+        Announcement.objects.filter(is_published=True),
+        views=Sum('views')
+    )]
+
+
+def announcement_version(request, pk=None, *args, **kwargs):
+    """
+    Version of a single announcement, None if it does not exist. Views are
+    left out, otherwise every detail request would change the ETag.
+    """
+    try:
+        version = table_version(Announcement.objects.filter(pk=pk, is_published=True))
+    except (TypeError, ValueError):
+        return None
+    return [version] if version['count'] else None
+
+
+def trending_version(request, *args, **kwargs):
+    """The ranking, and the announcements its rows are rendered from"""
+    return announcements_version(request) + [table_version(TrendingAnnouncement.objects.all(), 'computed_at')]
+
+
+def count_view(request, pk=None, *args, **kwargs):
+    """A 304 for the detail page is still a view"""
+    view_counter.increment(int(pk))
+
 
 class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for announcements with filtering, sorting, and view tracking
     """
-    queryset = Announcement.objects.filter(is_published=True)
+    queryset = Announcement.objects.filter(is_published=True).select_related('semester')
+    
+    @property
+    def paginator(self):
+        """
+        Page numbers by default, keyset pagination with ?pagination=cursor
+        (or whenever a cursor is passed)
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = AnnouncementCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -20,12 +82,12 @@ class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        # Get locale from query params or default to 'th'
-        context['locale'] = self.request.query_params.get('locale', 'th')
+        context['locale'] = request_locale(self.request)
         return context
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # Titles (and content) are picked in SQL, in the requested language only
+        queryset = localize(super().get_queryset(), self.get_serializer_class(), request_locale(self.request))
         
         # Get filter parameters
         date_from = self.request.query_params.get('date_from')
@@ -33,7 +95,7 @@ class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
         semester = self.request.query_params.get('semester')
         department = self.request.query_params.get('department')
         search = self.request.query_params.get('search')
-        sort_by = self.request.query_params.get('sort_by', 'date')
+        sort_by = self.request.query_params.get('sort_by', 'relevance' if search else 'date')
         sort_order = self.request.query_params.get('sort_order', 'desc')
         
         # Apply filters
@@ -54,22 +116,40 @@ class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(department=department)
         
         if search:
-            queryset = queryset.filter(
-                Q(title_th__icontains=search) | 
-                Q(title_en__icontains=search) |
-                Q(content_th__icontains=search) |
-                Q(content_en__icontains=search)
-            )
+            queryset = search_announcements(queryset, search)
+        
+        # Apply sorting (relevance only when the search index ranked the results)
+        if sort_by == 'relevance' and 'search_rank' in queryset.query.annotations:
+            return queryset.order_by('search_rank', '-date')
         
-        # Apply sorting
+        # id breaks ties so that pages (and cursors) are deterministic
         sort_field = 'views' if sort_by == 'views' else 'date'
         if sort_order == 'asc':
-            queryset = queryset.order_by(sort_field)
+            queryset = queryset.order_by(sort_field, 'id')
         else:
-            queryset = queryset.order_by(f'-{sort_field}')
+            queryset = queryset.order_by(f'-{sort_field}', '-id')
         
         return queryset
     
+    @method_decorator(conditional_get(announcements_version))
+    def list(self, request, *args, **kwargs):
+        # ?ids=1,5,9 fetches those announcements in one query, in that order
+        ids = parse_ids(request)
+        if ids is not None:
+            return multiget_response(
+                self.queryset,
+                ids,
+                lambda announcements: self.get_serializer(announcements, many=True).data
+            )
+        return list_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            self.get_serializer_class(),
+            context=self.get_serializer_context(),
+            paginator=self.paginator,
+        )
+    
+    @method_decorator(conditional_get(announcement_version, on_not_modified=count_view))
     def retrieve(self, request, *args, **kwargs):
         """
         Override retrieve to increment view count
@@ -87,8 +167,21 @@ class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=False, methods=['get'])
     def filters(self, request):
-        locale = request.query_params.get('locale', 'th')
+        """
+        Filter options with the number of published announcements for each.
+        Cached per locale until an announcement or semester changes, and
+        for at most ``caching.FILTERS_TIMEOUT`` seconds in other workers.
+        """
+        locale = caching.normalize_locale(request.query_params.get('locale', 'th'))
+        key = caching.filters_key(locale)
 
+        data = cache.get(key)
+        if data is None:
+            data = self.build_filters(locale)
+            cache.set(key, data, caching.FILTERS_TIMEOUT)
+        return Response(data)
+
+    def build_filters(self, locale):
         semesters = Semester.objects.filter(is_active=True)
 
         semester_data = SemesterSerializer(
@@ -97,38 +190,87 @@ class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
             context={'locale': locale}
         ).data
 
-        departments = (
+        # One GROUP BY pass gives both the per-semester and per-department counts
+        semester_counts = {}
+        department_counts = {}
+        total = 0
+        groups = (
             Announcement.objects
             .filter(is_published=True)
-            .values_list('department', flat=True)
-            .distinct()
+            .values('semester__code', 'department')
+            .annotate(count=Count('id'))
+            .order_by()
         )
+        for group in groups:
+            code, department, count = group['semester__code'], group['department'], group['count']
+            semester_counts[code] = semester_counts.get(code, 0) + count
+            department_counts[department] = department_counts.get(department, 0) + count
+            total += count
 
-        return Response({
+        return {
             'semesters': [
                 {
                     'code': 'All',
-                    'display_name': 'All' if locale == 'en' else 'ทั้งหมด'
+                    'display_name': 'All' if locale == 'en' else 'ทั้งหมด',
+                    'count': total
                 }
-            ] + semester_data,
-            'departments': ['All'] + list(departments)
-        })
+            ] + [
+                {**semester, 'count': semester_counts.get(semester['code'], 0)}
+                for semester in semester_data
+            ],
+            'departments': ['All'] + sorted(department_counts),
+            'department_counts': {'All': total, **department_counts}
+        }
 
 
     @action(detail=True, methods=['get'])
     def related(self, request, pk=None):
         """
-        Get related announcements (same department, excluding current)
+        Get related announcements from the precomputed similarity index,
+        falling back to the same department if it has not been built yet
         """
         announcement = self.get_object()
-        related = Announcement.objects.filter(
-            is_published=True,
-            department=announcement.department
-        ).exclude(id=announcement.id)[:4]
+        related = list(
+            Announcement.objects
+            .filter(similar_to__announcement=announcement, is_published=True)
+            .select_related('semester')
+            .order_by('similar_to__rank')[:RELATED_LIMIT]
+        )
+        if not related:
+            related = Announcement.objects.filter(
+                is_published=True,
+                department=announcement.department
+            ).exclude(id=announcement.id).select_related('semester')[:RELATED_LIMIT]
         
         serializer = AnnouncementListSerializer(
             related, 
             many=True, 
             context=self.get_serializer_context()
         )
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    @method_decorator(conditional_get(trending_version))
+    def trending(self, request):
+        """
+        Announcements ranked by exponentially decayed daily views, read from
+        the ranking materialized by announcements.trending
+        """
+        try:
+            limit = int(request.query_params.get('limit', TRENDING_LIMIT))
+        except ValueError:
+            limit = TRENDING_LIMIT
+        limit = min(max(limit, 1), TRENDING_MAX_LIMIT)
+
+        trending = (
+            Announcement.objects
+            .filter(is_published=True, trending__isnull=False)
+            .select_related('semester')
+            .order_by('trending__rank')[:limit]
+        )
+        serializer = AnnouncementListSerializer(
+            trending,
+            many=True,
+            context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class EventsConfig(AppConfig):
     name = 'events'
+
+    def ready(self):
+        from tsak_backend import images
+        from .status import start_scheduler
+
+        images.register(self.get_model('Event'), image='image_meta', organizer_logo='organizer_logo_meta')
+        images.register(self.get_model('EventImage'), image='image_meta')
+
+        request_started.connect(start_scheduler, dispatch_uid='events.status.start_scheduler')
@@ -0,0 +1,85 @@
+"""
+Minimal iCalendar (RFC 5545) writer for events.
+
+Events are all-day entries built from ``start_date``/``end_date``. Events
+without a parseable date are left out. ``calendar_lines`` yields the
+calendar one line at a time, so the feed can be streamed without building
+it in memory.
+"""
+from datetime import timedelta
+
+CRLF = '\r\n'
+PRODID = '-//Thai Students Association in Korea//TSAK Events//EN'
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value):
+    return (
+        (value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Split a content line into 75-octet chunks, continuation lines start with a space"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + CRLF
+
+    chunks = []
+    current = ''
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        if len((current + char).encode('utf-8')) > limit:
+            chunks.append(current)
+            current = ''
+            limit = MAX_LINE_OCTETS - 1  # room for the leading space
+        current += char
+    chunks.append(current)
+    return (CRLF + ' ').join(chunks) + CRLF
+
+
+def format_date(value):
+    return value.strftime('%Y%m%d')
+
+
+def format_timestamp(value):
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def event_lines(event, host, locale='th'):
+    english = locale == 'en'
+    title = (event.title_en if english and event.title_en else event.title)
+    description = (event.description_en if english and event.description_en else event.description)
+
+    yield fold('BEGIN:VEVENT')
+    yield fold(f'UID:event-{event.pk}@{host}')
+    yield fold(f'DTSTAMP:{format_timestamp(event.updated_at)}')
+    yield fold(f'LAST-MODIFIED:{format_timestamp(event.updated_at)}')
+    yield fold(f'DTSTART;VALUE=DATE:{format_date(event.start_date)}')
+    # DTEND is exclusive for all-day events
+    yield fold(f'DTEND;VALUE=DATE:{format_date((event.end_date or event.start_date) + timedelta(days=1))}')
+    yield fold(f'SUMMARY:{escape_text(title)}')
+    if description:
+        yield fold(f'DESCRIPTION:{escape_text(description)}')
+    if event.location:
+        yield fold(f'LOCATION:{escape_text(event.location)}')
+    if event.registration_url:
+        yield fold(f'URL:{event.registration_url}')
+    yield fold('END:VEVENT')
+
+
+def calendar_lines(events, host, locale='th', name='TSAK Events'):
+    yield fold('BEGIN:VCALENDAR')
+    yield fold('VERSION:2.0')
+    yield fold(f'PRODID:{PRODID}')
+    yield fold('CALSCALE:GREGORIAN')
+    yield fold('METHOD:PUBLISH')
+    yield fold(f'X-WR-CALNAME:{escape_text(name)}')
+    for event in events:
+        yield from event_lines(event, host, locale)
+    yield fold('END:VCALENDAR')
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from events.models import Event, parse_event_dates
+
+
+class Command(BaseCommand):
+    help = "Derive start_date/end_date from the free-text date of every event"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        changed = []
+        unparsed = []
+        for event in Event.objects.only('id', 'date', 'start_date', 'end_date').iterator():
+            start_date, end_date = parse_event_dates(event.date)
+            if start_date is None:
+                unparsed.append(event)
+            if (start_date, end_date) != (event.start_date, event.end_date):
+                event.start_date, event.end_date = start_date, end_date
+                changed.append(event)
+
+        # bulk_update skips save(), so updated_at and validation are left alone
+        Event.objects.bulk_update(changed, ['start_date', 'end_date'], batch_size=options['batch_size'])
+
+        for event in unparsed:
+            self.stderr.write(f"Could not parse date of event {event.pk}: '{event.date}'")
+        self.stdout.write(self.style.SUCCESS(f"Updated dates of {len(changed)} events"))
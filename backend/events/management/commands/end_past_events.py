@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from events.status import end_past_events
+
+
+class Command(BaseCommand):
+    help = "Set the status of events whose end date has passed to 'ended'"
+
+    def handle(self, *args, **options):
+        ids = end_past_events()
+        self.stdout.write(self.style.SUCCESS(f"Marked {len(ids)} events as ended"))
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:20
+
+from datetime import datetime
+
+from django.db import migrations, models
+
+
+def parse_event_dates(date_str):
+    """Frozen copy of events.models.parse_event_dates as of this migration"""
+    try:
+        parts = [part.strip() for part in date_str.strip().split(" - ")]
+        if len(parts) > 2:
+            return None, None
+        dates = [datetime.strptime(part, "%d.%m.%Y").date() for part in parts]
+    except (ValueError, AttributeError):
+        return None, None
+    return dates[0], dates[-1]
+
+
+def populate_dates(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    events = list(Event.objects.only("id", "date"))
+    for event in events:
+        event.start_date, event.end_date = parse_event_dates(event.date)
+    Event.objects.bulk_update(events, ["start_date", "end_date"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0002_alter_event_options_event_order_event_ordering_type_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="end_date",
+            field=models.DateField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Derived from date on save",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="start_date",
+            field=models.DateField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Derived from date on save",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(populate_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_event_start_date_end_date"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["status", "start_date"], name="events_even_status_dfba18_idx"
+            ),
+        ),
+    ]
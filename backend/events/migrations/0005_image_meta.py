@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0004_event_status_start_date_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive variants, see tsak_backend.images",
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="organizer_logo_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive variants, see tsak_backend.images",
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventimage",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive variants, see tsak_backend.images",
+            ),
+        ),
+    ]
@@ -3,6 +3,58 @@ from django.core.exceptions import ValidationError
 from datetime import datetime
 from sponsors.models import Sponsor
 
+DATE_FORMAT = '%d.%m.%Y'
+
+
+def parse_event_dates(date_str):
+    """
+    Parse the free-text date ("20.07.2025" or "20.07.2025 - 23.07.2025")
+    into (start_date, end_date). Returns (None, None) if it cannot be parsed.
+    """
+    try:
+        parts = [part.strip() for part in date_str.strip().split(' - ')]
+        if len(parts) > 2:
+            return None, None
+        dates = [datetime.strptime(part, DATE_FORMAT).date() for part in parts]
+    except (ValueError, AttributeError):
+        return None, None
+    return dates[0], dates[-1]
+
+
+class EventQuerySet(models.QuerySet):
+    # Long text the list payload leaves out
+    HEAVY_FIELDS = ['description', 'description_en']
+
+    def for_api(self, detail=False):
+        """
+        Everything EventSerializer touches in a fixed number of queries: the
+        events, their sponsors and their gallery images in display order.
+        List views also skip the long description columns.
+        """
+        queryset = self.prefetch_related(
+            models.Prefetch('sponsors', queryset=Sponsor.objects.only('id', 'name', 'logo', 'logo_meta')),
+            models.Prefetch('images', queryset=EventImage.objects.order_by('order', 'created_at')),
+        )
+        if not detail:
+            queryset = queryset.defer(*self.HEAVY_FIELDS)
+        return queryset
+
+    def in_display_order(self):
+        """
+        Manually ordered events first (by order, newest first on ties),
+        then date-ordered events by start date, newest first, with
+        unparseable dates last. A single ORDER BY, so the result can be
+        sliced and paginated in the database.
+        """
+        is_manual = models.Q(ordering_type='manual')
+        return self.order_by(
+            models.Case(models.When(is_manual, then=0), default=1),
+            models.Case(models.When(is_manual, then='order')),
+            models.Case(models.When(ordering_type='date', then='start_date')).desc(nulls_last=True),
+            '-created_at',
+            '-id',
+        )
+
 
 class Event(models.Model):
     STATUS_CHOICES = [
@@ -19,10 +71,13 @@ class Event(models.Model):
     
     # Image
     image = models.ImageField(upload_to='events/', blank=True, null=True)
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive variants, see tsak_backend.images")
     
     # Date Information
     date = models.CharField(max_length=100, help_text="Date string format, e.g., '20.07.2025 - 23.07.2025' or '20.07.2025'")
     date_range = models.CharField(max_length=100, blank=True, null=True)
+    start_date = models.DateField(blank=True, null=True, editable=False, db_index=True, help_text="Derived from date on save")
+    end_date = models.DateField(blank=True, null=True, editable=False, db_index=True, help_text="Derived from date on save")
     
     # Ordering
     ORDERING_CHOICES = [
@@ -51,6 +106,7 @@ class Event(models.Model):
     registration_url = models.URLField(blank=True, null=True, help_text="Registration/Event URL (for the register button)")
     organizer = models.CharField(max_length=255, blank=True, null=True)
     organizer_logo = models.ImageField(upload_to='events/organizers/', blank=True, null=True, help_text="Organizer logo. If not provided, will use default TSAK logo.")
+    organizer_logo_meta = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive variants, see tsak_backend.images")
     
     # Relationships
     sponsors = models.ManyToManyField(Sponsor, blank=True, related_name='events')
@@ -59,10 +115,15 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EventQuerySet.as_manager()
+    
     class Meta:
         ordering = ['order', '-created_at']
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
+        indexes = [
+            models.Index(fields=['status', 'start_date']),
+        ]
     
     def clean(self):
         """Validate date field"""
@@ -85,13 +146,17 @@ class Event(models.Model):
     def _validate_date_format(self, date_str):
         """Validate a single date string in DD.MM.YYYY format"""
         try:
-            datetime.strptime(date_str, '%d.%m.%Y')
+            datetime.strptime(date_str, DATE_FORMAT)
         except ValueError:
             raise ValidationError({'date': f"Invalid date format: '{date_str}'. Expected format: DD.MM.YYYY (e.g., 20.07.2025)"})
     
     def save(self, *args, **kwargs):
-        """Override save to run validation"""
+        """Override save to run validation and derive start/end dates"""
         self.full_clean()
+        self.start_date, self.end_date = parse_event_dates(self.date)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'date' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'start_date', 'end_date'}
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -102,6 +167,7 @@ class EventImage(models.Model):
     """Additional images for an event (for imageDir)"""
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='events/gallery/')
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive variants, see tsak_backend.images")
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -0,0 +1,11 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class EventPagination(PageNumberPagination):
+    """
+    {"count", "next", "previous", "results"} envelope for /api/events/,
+    used when the client asks for a page (?page= or ?page_size=)
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from tsak_backend.bilingual import BilingualField
+from tsak_backend.images import image_info, variant_urls
 from .models import Event, EventImage
 from sponsors.models import Sponsor
 
@@ -6,10 +8,12 @@ from sponsors.models import Sponsor
 class SponsorSerializer(serializers.ModelSerializer):
     """Serializer for sponsor in event context"""
     logoUrl = serializers.SerializerMethodField()
+    logoSrcset = serializers.SerializerMethodField()
+    logoInfo = serializers.SerializerMethodField()
     
     class Meta:
         model = Sponsor
-        fields = ['name', 'logoUrl']
+        fields = ['name', 'logoUrl', 'logoSrcset', 'logoInfo']
     
     def get_logoUrl(self, obj):
         """Return the full URL to the logo"""
@@ -19,15 +23,25 @@ class SponsorSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.logo.url)
             return obj.logo.url
         return None
+    
+    def get_logoSrcset(self, obj):
+        """Resized WebP/fallback variants of the logo by width"""
+        return variant_urls(obj.logo, obj.logo_meta, self.context.get('request'))
+    
+    def get_logoInfo(self, obj):
+        """Width, height, dominant color and LQIP of the logo"""
+        return image_info(obj.logo, obj.logo_meta)
 
 
 class EventImageSerializer(serializers.ModelSerializer):
     """Serializer for event gallery images"""
     imageUrl = serializers.SerializerMethodField()
+    imageSrcset = serializers.SerializerMethodField()
+    imageInfo = serializers.SerializerMethodField()
     
     class Meta:
         model = EventImage
-        fields = ['imageUrl']
+        fields = ['imageUrl', 'imageSrcset', 'imageInfo']
     
     def get_imageUrl(self, obj):
         """Return the full URL to the image"""
@@ -37,21 +51,37 @@ class EventImageSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.image.url)
             return obj.image.url
         return None
+    
+    def get_imageSrcset(self, obj):
+        """Resized WebP/fallback variants of the image by width"""
+        return variant_urls(obj.image, obj.image_meta, self.context.get('request'))
+    
+    def get_imageInfo(self, obj):
+        """Width, height, dominant color and LQIP of the image"""
+        return image_info(obj.image, obj.image_meta)
 
 
 class EventSerializer(serializers.ModelSerializer):
     """Main event serializer matching frontend EventData interface"""
     id = serializers.SerializerMethodField()  # Convert to string for frontend
     imageUrl = serializers.SerializerMethodField()
+    imageSrcset = serializers.SerializerMethodField()
+    imageInfo = serializers.SerializerMethodField()
     organizerLogoUrl = serializers.SerializerMethodField()
+    organizerLogoSrcset = serializers.SerializerMethodField()
+    organizerLogoInfo = serializers.SerializerMethodField()
     titleEn = serializers.CharField(source='title_en', read_only=True)
     subtitleEn = serializers.CharField(source='subtitle_en', read_only=True)
     descriptionEn = serializers.CharField(source='description_en', read_only=True)
     dateRange = serializers.CharField(source='date_range', read_only=True)
+    startDate = serializers.DateField(source='start_date', read_only=True)
+    endDate = serializers.DateField(source='end_date', read_only=True)
     statusText = serializers.CharField(source='status_text', read_only=True)
     registrationUrl = serializers.URLField(source='registration_url', read_only=True)
     sponsors = SponsorSerializer(many=True, read_only=True)
     imageDir = serializers.SerializerMethodField()
+    imageDirSrcset = serializers.SerializerMethodField()
+    imageDirInfo = serializers.SerializerMethodField()
     
     class Meta:
         model = Event
@@ -62,8 +92,12 @@ class EventSerializer(serializers.ModelSerializer):
             'subtitle',
             'subtitleEn',
             'imageUrl',
+            'imageSrcset',
+            'imageInfo',
             'date',
             'dateRange',
+            'startDate',
+            'endDate',
             'status',
             'statusText',
             'description',
@@ -72,8 +106,12 @@ class EventSerializer(serializers.ModelSerializer):
             'registrationUrl',
             'organizer',
             'organizerLogoUrl',
+            'organizerLogoSrcset',
+            'organizerLogoInfo',
             'sponsors',
             'imageDir',
+            'imageDirSrcset',
+            'imageDirInfo',
         ]
     
     def get_id(self, obj):
@@ -89,6 +127,14 @@ class EventSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
     
+    def get_imageSrcset(self, obj):
+        """Resized WebP/fallback variants of the event image by width"""
+        return variant_urls(obj.image, obj.image_meta, self.context.get('request'))
+    
+    def get_imageInfo(self, obj):
+        """Width, height, dominant color and LQIP of the event image"""
+        return image_info(obj.image, obj.image_meta)
+    
     def get_organizerLogoUrl(self, obj):
         """Return the full URL to the organizer logo"""
         if obj.organizer_logo:
@@ -98,8 +144,16 @@ class EventSerializer(serializers.ModelSerializer):
             return obj.organizer_logo.url
         return None
     
+    def get_organizerLogoSrcset(self, obj):
+        """Resized WebP/fallback variants of the organizer logo by width"""
+        return variant_urls(obj.organizer_logo, obj.organizer_logo_meta, self.context.get('request'))
+    
+    def get_organizerLogoInfo(self, obj):
+        """Width, height, dominant color and LQIP of the organizer logo"""
+        return image_info(obj.organizer_logo, obj.organizer_logo_meta)
+    
     def get_imageDir(self, obj):
-        """Return array of image URLs from EventImage objects"""
+        """Return array of image URLs from EventImage objects (prefetched by Event.objects.for_api)"""
         images = obj.images.all()
         request = self.context.get('request')
         image_urls = []
@@ -110,4 +164,54 @@ class EventSerializer(serializers.ModelSerializer):
                 if url and url.strip():
                     image_urls.append(url)
         return image_urls if image_urls else None
+    
+    def get_imageDirSrcset(self, obj):
+        """Variants of each gallery image, in the same order as imageDir"""
+        request = self.context.get('request')
+        srcsets = [
+            variant_urls(img.image, img.image_meta, request)
+            for img in obj.images.all() if img.image
+        ]
+        return srcsets if srcsets else None
+    
+    def get_imageDirInfo(self, obj):
+        """Placeholders of each gallery image, in the same order as imageDir"""
+        infos = [image_info(img.image, img.image_meta) for img in obj.images.all() if img.image]
+        return infos if infos else None
+
 
+class EventListSerializer(EventSerializer):
+    """Event list entries, without the long descriptions (see EventQuerySet.for_api)"""
+
+    class Meta(EventSerializer.Meta):
+        fields = [
+            field for field in EventSerializer.Meta.fields
+            if field not in ('description', 'descriptionEn')
+        ]
+
+
+class LocalizedEventSerializer(EventSerializer):
+    """
+    One language per event (``?locale=``, English falling back to Thai
+    where it is blank): title, subtitle and description without the ``*En``
+    keys. See ``tsak_backend.bilingual.localize``.
+    """
+    title = BilingualField('title', 'title_en')
+    subtitle = BilingualField('subtitle', 'subtitle_en')
+    description = BilingualField('description', 'description_en')
+
+    class Meta(EventSerializer.Meta):
+        fields = [
+            field for field in EventSerializer.Meta.fields
+            if field not in ('titleEn', 'subtitleEn', 'descriptionEn')
+        ]
+
+
+class LocalizedEventListSerializer(LocalizedEventSerializer):
+    """LocalizedEventSerializer without the description, as EventListSerializer"""
+
+    class Meta(LocalizedEventSerializer.Meta):
+        fields = [
+            field for field in LocalizedEventSerializer.Meta.fields
+            if field != 'description'
+        ]
@@ -0,0 +1,72 @@
+"""
+Automatic event status transitions.
+
+Events whose end date has passed are moved to ``ended`` in one bulk UPDATE.
+The UPDATE also bumps ``updated_at``, which is what the conditional GET
+versions of the event endpoints are built from, so cached event responses
+are invalidated with it.
+
+Run it with ``manage.py end_past_events`` from cron, e.g. every hour::
+
+    0 * * * * python manage.py end_past_events
+
+Setting ``EVENT_STATUS_UPDATE_INTERVAL`` to a number of seconds instead makes
+each server process do it from a background thread started on the first
+request. It is None by default, as every worker would then write to the
+database on its own schedule.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_scheduler_pid = None
+_scheduler_lock = threading.Lock()
+
+
+def end_past_events(today=None):
+    """Mark every event that ended before ``today`` as ended, returns the ids changed"""
+    from .models import Event
+
+    today = today or timezone.localdate()
+    stale = Event.objects.filter(end_date__lt=today).exclude(status='ended')
+    transitions = list(stale.values_list('id', 'title', 'status'))
+    if not transitions:
+        return []
+
+    ids = [pk for pk, _, _ in transitions]
+    Event.objects.filter(pk__in=ids).update(status='ended', updated_at=timezone.now())
+    for pk, title, old_status in transitions:
+        logger.info("Event %s (%s) ended: %s -> ended", pk, title, old_status)
+    return ids
+
+
+def _run(interval):
+    while True:
+        try:
+            end_past_events()
+        except DatabaseError:
+            logger.exception("Failed to update event statuses")
+        finally:
+            close_old_connections()
+        time.sleep(interval)
+
+
+def start_scheduler(**kwargs):
+    """request_started receiver: start the status thread once per process"""
+    global _scheduler_pid
+    interval = getattr(settings, 'EVENT_STATUS_UPDATE_INTERVAL', None)
+    pid = os.getpid()
+    if not interval or _scheduler_pid == pid:
+        return
+    with _scheduler_lock:
+        if _scheduler_pid == pid:
+            return
+        _scheduler_pid = pid
+        threading.Thread(target=_run, args=(interval,), name='event-status-scheduler', daemon=True).start()
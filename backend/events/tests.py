@@ -1,3 +1,257 @@
-from django.test import TestCase
+import io
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from sponsors.models import Sponsor
+from tsak_backend.images import META_VERSION
+from . import ical, status
+from .models import Event, EventImage, parse_event_dates
+from .views import EVENT_DETAIL_QUERY_BUDGET, EVENT_LIST_QUERY_BUDGET
+
+
+def event_date(day):
+    return day.strftime('%d.%m.%Y')
+
+
+def image_meta(name):
+    """Meta matching ``name``, so saving does not try to build variants of a missing file"""
+    return {'version': META_VERSION, 'name': name}
+
+
+def seed_events(count):
+    """``count`` events with two sponsors and two gallery images each"""
+    logo = 'sponsors/logos/logo.png'
+    sponsors = [
+        Sponsor.objects.create(name=f'Sponsor {i}', type='partner', logo=logo, logo_meta=image_meta(logo))
+        for i in range(2)
+    ]
+    day = timezone.localdate()
+    events = []
+    for i in range(count):
+        event = Event.objects.create(title=f'Event {i}', date=event_date(day + timedelta(days=i)))
+        event.sponsors.set(sponsors)
+        for order in range(2):
+            name = f'events/gallery/{i}-{order}.jpg'
+            EventImage.objects.create(event=event, image=name, image_meta=image_meta(name), order=order)
+        events.append(event)
+    return events
+
+
+class ParseEventDatesTests(SimpleTestCase):
+    def test_formats(self):
+        cases = {
+            '20.07.2025': (date(2025, 7, 20), date(2025, 7, 20)),
+            ' 20.07.2025 - 23.07.2025 ': (date(2025, 7, 20), date(2025, 7, 23)),
+            '2025-07-20': (None, None),
+            '1.1.2025 - 2.1.2025 - 3.1.2025': (None, None),
+            None: (None, None),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_event_dates(text), expected)
+
+
+class EventOrderingTests(TestCase):
+    def titles(self, **params):
+        return [event['title'] for event in self.client.get('/api/events/', params).json()]
+
+    def test_save_derives_the_date_columns(self):
+        event = Event.objects.create(title='A', date='20.07.2025 - 23.07.2025')
+        self.assertEqual((event.start_date, event.end_date), (date(2025, 7, 20), date(2025, 7, 23)))
+
+        event.date = '01.08.2025'
+        event.save(update_fields=['date'])
+        event.refresh_from_db()
+        self.assertEqual((event.start_date, event.end_date), (date(2025, 8, 1), date(2025, 8, 1)))
+
+    def test_manual_events_first_then_newest_start_date(self):
+        Event.objects.create(title='Old', date='01.01.2024')
+        Event.objects.create(title='Manual 2', date='01.01.2020', ordering_type='manual', order=2)
+        Event.objects.create(title='New', date='01.01.2025 - 05.01.2025')
+        Event.objects.create(title='Manual 1', date='01.01.2019', ordering_type='manual', order=1)
+        self.assertEqual(self.titles(), ['Manual 1', 'Manual 2', 'New', 'Old'])
+
+        with CaptureQueriesContext(connection) as queries:
+            page = self.client.get('/api/events/', {'page_size': 2, 'page': 2}).json()
+        self.assertEqual([event['title'] for event in page['results']], ['New', 'Old'])
+        self.assertTrue(any('LIMIT 2 OFFSET 2' in query['sql'] for query in queries))
+
+    def test_date_window_matches_overlapping_events(self):
+        Event.objects.create(title='Before', date='01.01.2025')
+        Event.objects.create(title='Spanning', date='30.01.2025 - 02.02.2025')
+        Event.objects.create(title='Inside', date='10.02.2025')
+        Event.objects.create(title='After', date='01.03.2025')
+        self.assertEqual(self.titles(date_from='2025-02-01', date_to='2025-02-28'), ['Inside', 'Spanning'])
+        for params in [{'date_from': '01.02.2025'}, {'date_to': '2026-02-30'}, {'date_from': '2026-13-01'}]:
+            with self.subTest(**params):
+                response = self.client.get('/api/events/', params)
+                self.assertEqual(response.status_code, 400)
+
+
+class EventDatesMigrationTests(TransactionTestCase):
+    before = [('events', '0002_alter_event_options_event_order_event_ordering_type_and_more')]
+    after = [('events', '0003_event_start_date_end_date')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        call_command('migrate', verbosity=0)
+
+    def test_existing_events_get_their_dates(self):
+        OldEvent = self.migrate(self.before).get_model('events', 'Event')
+        OldEvent.objects.create(title='A', date='20.07.2025 - 23.07.2025')
+        OldEvent.objects.create(title='B', date='TBA')
+
+        NewEvent = self.migrate(self.after).get_model('events', 'Event')
+        self.assertEqual(
+            list(NewEvent.objects.order_by('title').values_list('start_date', 'end_date')),
+            [(date(2025, 7, 20), date(2025, 7, 23)), (None, None)],
+        )
+
+
+class EventStatusTests(TestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        self.past = Event.objects.create(title='Past', date=event_date(today - timedelta(days=1)))
+        self.running = Event.objects.create(
+            title='Running', date=f'{event_date(today - timedelta(days=2))} - {event_date(today)}', status='closed',
+        )
+
+    def test_past_events_end(self):
+        before = self.past.updated_at
+        call_command('end_past_events', stdout=io.StringIO())
+
+        self.past.refresh_from_db()
+        self.running.refresh_from_db()
+        self.assertEqual((self.past.status, self.running.status), ('ended', 'closed'))
+        # updated_at moves so cached event responses are invalidated
+        self.assertGreater(self.past.updated_at, before)
+        self.assertEqual(status.end_past_events(), [])
+
+    def test_scheduler_starts_once_per_process_when_enabled(self):
+        with mock.patch.object(status.threading, 'Thread') as thread, mock.patch.object(status, '_scheduler_pid', None):
+            status.start_scheduler()
+            thread.assert_not_called()
+
+            with override_settings(EVENT_STATUS_UPDATE_INTERVAL=60):
+                status.start_scheduler()
+                status.start_scheduler()
+            thread.assert_called_once()
+            thread.return_value.start.assert_called_once()
+
+
+class IcalTests(SimpleTestCase):
+    def test_escape_and_fold(self):
+        self.assertEqual(ical.escape_text('a;b,c\\d\ne'), 'a\\;b\\,c\\\\d\\ne')
+        line = 'SUMMARY:' + 'ก' * 40
+        folded = ical.fold(line)
+        self.assertTrue(folded.endswith('\r\n'))
+        self.assertTrue(all(len(part.encode()) <= 75 for part in folded[:-2].split('\r\n')))
+        self.assertEqual(folded[:-2].replace('\r\n ', ''), line)
+
+
+class EventCalendarTests(TestCase):
+    def test_feed_streams_dated_events(self):
+        event = Event.objects.create(
+            title='งาน', title_en='Festival', date='30.01.2025 - 02.02.2025', location='Seoul, Korea',
+        )
+        # Left out: no parseable date
+        Event.objects.bulk_create([Event(title='Undated', date='TBA')])
+
+        response = self.client.get('/api/events/calendar.ics', {'locale': 'en'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body.count('BEGIN:VEVENT'), 1)
+        self.assertIn(f'UID:event-{event.pk}@testserver\r\n', body)
+        self.assertIn('SUMMARY:Festival\r\n', body)
+        self.assertIn('LOCATION:Seoul\\, Korea\r\n', body)
+        # All-day DTEND is exclusive
+        self.assertIn('DTSTART;VALUE=DATE:20250130\r\nDTEND;VALUE=DATE:20250203\r\n', body)
+
+        again = self.client.get('/api/events/calendar.ics', {'locale': 'en'}, headers={'if_none_match': response['ETag']})
+        self.assertEqual(again.status_code, 304)
+
+    def test_single_event(self):
+        event = Event.objects.create(title='งาน', date='01.02.2025')
+        response = self.client.get(f'/api/events/{event.pk}.ics')
+        self.assertIn('SUMMARY:งาน', b''.join(response.streaming_content).decode())
+        self.assertEqual(self.client.get(f'/api/events/{event.pk + 1}.ics').status_code, 404)
+
+
+class EventQueryBudgetTests(TestCase):
+    """The event endpoints run the same number of queries however many events there are"""
+
+    def assert_within_budget(self, count):
+        events = seed_events(count)
+        ids = ','.join(str(event.pk) for event in events)
+
+        with self.assertNumQueries(EVENT_LIST_QUERY_BUDGET):
+            response = self.client.get('/api/events/', {'page_size': 50})
+        self.assertEqual(response.json()['count'], count)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/events/')
+        self.assertLessEqual(len(queries), EVENT_LIST_QUERY_BUDGET)
+        self.assertEqual(len(response.json()), count)
+        self.assertEqual(len(response.json()[0]['sponsors']), 2)
+        self.assertEqual(len(response.json()[0]['imageDir']), 2)
+
+        with self.assertNumQueries(EVENT_DETAIL_QUERY_BUDGET):
+            response = self.client.get(f'/api/events/{events[-1].pk}/')
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(EVENT_DETAIL_QUERY_BUDGET):
+            response = self.client.get('/api/events/', {'ids': ids})
+        self.assertEqual(len(response.json()['results']), count)
+
+    def test_1_event(self):
+        self.assert_within_budget(1)
+
+    def test_10_events(self):
+        self.assert_within_budget(10)
+
+    def test_50_events(self):
+        self.assert_within_budget(50)
+
+
+class EventListConditionalGetTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        Event.objects.create(title='A', date=event_date(self.today))
+        Event.objects.create(title='B', date=event_date(self.today + timedelta(days=5)))
+
+    def get(self, day, **headers):
+        with mock.patch('django.utils.timezone.localdate', return_value=day):
+            return self.client.get('/api/events/', {'when': 'upcoming'}, headers=headers)
+
+    def titles(self, response):
+        return [event['title'] for event in response.json()]
+
+    def test_unchanged_list_is_not_modified(self):
+        first = self.get(self.today)
+        second = self.get(self.today, if_none_match=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_upcoming_list_changes_at_midnight(self):
+        first = self.get(self.today)
+        self.assertEqual(self.titles(first), ['A', 'B'])
+
+        tomorrow = self.today + timedelta(days=1)
+        response = self.get(tomorrow, if_none_match=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(response), ['B'])
+
+        response = self.get(tomorrow, if_modified_since=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
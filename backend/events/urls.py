@@ -3,5 +3,7 @@ from . import views
 
 urlpatterns = [
     path('', views.event_list, name='event-list'),
+    path('calendar.ics', views.event_calendar, name='event-calendar'),
+    path('<int:event_id>.ics', views.event_calendar_detail, name='event-calendar-detail'),
     path('<int:event_id>/', views.event_detail, name='event-detail'),
 ]
@@ -1,68 +1,228 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from datetime import datetime
-from .models import Event
-from .serializers import EventSerializer
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from sponsors.models import Sponsor
+from tsak_backend.bilingual import localize, request_locale
+from tsak_backend.conditional import conditional_get, date_version, table_version
+from tsak_backend.listing import list_response
+from tsak_backend.multiget import multiget_response, parse_ids
+from tsak_backend.querybudget import query_budget
+from . import ical
+from .models import Event, EventImage
+from .pagination import EventPagination
+from .serializers import (
+    EventListSerializer,
+    EventSerializer,
+    LocalizedEventListSerializer,
+    LocalizedEventSerializer,
+)
 
+# Query budgets: 3 version aggregates for the conditional GET, then the
+# events, their sponsors and their images (plus a COUNT when paginating).
+# Constant in the number of events.
+EVENT_LIST_QUERY_BUDGET = 7
+EVENT_DETAIL_QUERY_BUDGET = 6
 
-def parse_date_from_string(date_str):
-    """Parse date string in DD.MM.YYYY format and return datetime object for sorting"""
-    try:
-        # Handle date range format: "20.07.2025 - 23.07.2025"
-        if ' - ' in date_str:
-            date_part = date_str.split(' - ')[0].strip()
-        else:
-            date_part = date_str.strip()
-        return datetime.strptime(date_part, '%d.%m.%Y')
-    except (ValueError, AttributeError):
-        # Return a far future date if parsing fails (will sort last)
-        return datetime(9999, 12, 31)
+
+def filter_events(events, params):
+    """
+    Apply the event list filters, returns (queryset, error message).
+
+    - status=open,closed    any of the given statuses
+    - when=upcoming         not ended yet (end date today or later), soonest first
+    - when=past             ended before today
+    - date_from / date_to   events overlapping the window (YYYY-MM-DD)
+    """
+    valid_statuses = {choice for choice, _ in Event.STATUS_CHOICES}
+    statuses = [value for value in params.get('status', '').split(',') if value]
+    if statuses:
+        invalid = set(statuses) - valid_statuses
+        if invalid:
+            return None, f"Invalid status: {', '.join(sorted(invalid))}"
+        events = events.filter(status__in=statuses)
+    
+    for param, lookup in (('date_from', 'end_date__gte'), ('date_to', 'start_date__lte')):
+        value = params.get(param)
+        if value:
+            try:
+                parsed_date = parse_date(value)
+            except ValueError:
+                # Well formed but impossible, e.g. 2026-02-30
+                parsed_date = None
+            if parsed_date is None:
+                return None, f"Invalid {param}: '{value}'. Expected format: YYYY-MM-DD"
+            events = events.filter(**{lookup: parsed_date})
+    
+    when = params.get('when')
+    today = timezone.localdate()
+    if when == 'upcoming':
+        events = events.filter(end_date__gte=today).order_by('start_date', 'id')
+    elif when == 'past':
+        events = events.filter(end_date__lt=today).order_by('-start_date', '-id')
+    elif when:
+        return None, "Invalid when. Must be one of: upcoming, past"
+    else:
+        events = events.in_display_order()
+    
+    return events, None
+
+
+def events_version(request):
+    """
+    Version of everything the event payloads are built from, and of the
+    date, since when=upcoming|past are relative to today
+    """
+    return [
+        table_version(Event.objects.all()),
+        table_version(Sponsor.objects.all()),
+        table_version(EventImage.objects.all(), 'created_at'),
+        date_version(),
+    ]
+
+
+def event_version(request, event_id):
+    """Version of a single event, None if it does not exist"""
+    event = table_version(Event.objects.filter(pk=event_id))
+    if not event['count']:
+        return None
+    return [
+        event,
+        table_version(Sponsor.objects.filter(events=event_id)),
+        table_version(EventImage.objects.filter(event_id=event_id), 'created_at'),
+    ]
+
+
+def project(request, queryset, detail=False):
+    """
+    (queryset, serializer class) for the requested payload shape: both
+    languages (title and titleEn, ...) by default, one language with
+    ?locale=th|en, loading only its columns
+    """
+    if 'locale' not in request.query_params:
+        return queryset, EventSerializer if detail else EventListSerializer
+    serializer_class = LocalizedEventSerializer if detail else LocalizedEventListSerializer
+    return localize(queryset, serializer_class, request_locale(request)), serializer_class
 
 
 @api_view(['GET'])
+@query_budget(EVENT_LIST_QUERY_BUDGET)
+@conditional_get(events_version)
 def event_list(request):
     """
     Get all events.
     Usage: GET /api/events/
     
-    Returns JSON array of all events, sorted by:
+    Returns JSON array of all events (without descriptions), sorted by:
     - Manual order (if ordering_type='manual')
-    - Date (if ordering_type='date')
-    """
-    events = Event.objects.all()
+    - Start date, newest first (if ordering_type='date')
     
-    # Separate events by ordering type
-    manual_events = events.filter(ordering_type='manual').order_by('order', '-created_at')
-    date_events = events.filter(ordering_type='date')
+    Filters (see filter_events): status, when=upcoming|past, date_from,
+    date_to. Passing page or page_size returns a
+    {"count", "next", "previous", "results"} page instead of the full array,
+    e.g. /api/events/?when=upcoming&page_size=3 for the homepage.
     
-    # For date-based events, we need to sort by parsed date
-    # Convert to list and sort by parsed date
-    date_events_list = list(date_events)
-    date_events_list.sort(key=lambda e: parse_date_from_string(e.date), reverse=True)
+    With ?ids=1,5,9 returns {"results": [...], "missing": [...]} for just
+    those events, in the requested order.
     
-    # Combine: manual events first (in their order), then date-sorted events
-    all_events = list(manual_events) + date_events_list
+    Each event carries both languages (title and titleEn, ...) unless
+    ?locale=th|en asks for one.
+    """
+    ids = parse_ids(request)
+    if ids is not None:
+        events, serializer_class = project(request, Event.objects.for_api(detail=True), detail=True)
+        return multiget_response(
+            events,
+            ids,
+            lambda events: serializer_class(events, many=True, context={'request': request}).data
+        )
     
-    serializer = EventSerializer(all_events, many=True, context={'request': request})
-    return Response(serializer.data)
+    # Manual events first (in their order), then date-sorted events, in one query
+    events, error = filter_events(Event.objects.for_api(), request.query_params)
+    if error:
+        return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+    events, serializer_class = project(request, events)
+    
+    paginator = None
+    if 'page' in request.query_params or 'page_size' in request.query_params:
+        paginator = EventPagination()
+    return list_response(request, events, serializer_class, paginator=paginator)
 
 
 @api_view(['GET'])
+@query_budget(EVENT_DETAIL_QUERY_BUDGET)
+@conditional_get(event_version)
 def event_detail(request, event_id):
     """
     Get a single event by ID.
     Usage: GET /api/events/{id}/
     
-    Returns JSON object of the event.
+    Returns JSON object of the event (in one language with ?locale=th|en).
     """
+    events, serializer_class = project(request, Event.objects.for_api(detail=True), detail=True)
     try:
-        event = Event.objects.get(pk=event_id)
+        event = events.get(pk=event_id)
     except Event.DoesNotExist:
         return Response(
             {'detail': 'Event not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    serializer = EventSerializer(event, context={'request': request})
+    serializer = serializer_class(event, context={'request': request})
     return Response(serializer.data)
+
+
+CALENDAR_FIELDS = [
+    'id', 'title', 'title_en', 'description', 'description_en', 'location',
+    'registration_url', 'start_date', 'end_date', 'updated_at',
+]
+
+
+def calendar_version(request):
+    return [table_version(Event.objects.filter(start_date__isnull=False))]
+
+
+def calendar_event_version(request, event_id):
+    version = table_version(Event.objects.filter(pk=event_id, start_date__isnull=False))
+    return [version] if version['count'] else None
+
+
+def calendar_response(lines, filename):
+    response = StreamingHttpResponse(lines, content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    return response
+
+
+@conditional_get(calendar_version)
+def event_calendar(request):
+    """
+    iCalendar feed of all dated events, for calendar app subscriptions.
+    Usage: GET /api/events/calendar.ics?locale=en
+    
+    Streamed row by row, and answered with 304 while no event has changed.
+    """
+    events = (
+        Event.objects
+        .filter(start_date__isnull=False)
+        .only(*CALENDAR_FIELDS)
+        .order_by('start_date', 'id')
+        .iterator(chunk_size=200)
+    )
+    lines = ical.calendar_lines(events, request.get_host(), request.GET.get('locale', 'th'))
+    return calendar_response(lines, 'tsak-events.ics')
+
+
+@conditional_get(calendar_event_version)
+def event_calendar_detail(request, event_id):
+    """
+    iCalendar file for a single event.
+    Usage: GET /api/events/{id}.ics?locale=en
+    """
+    event = Event.objects.filter(pk=event_id, start_date__isnull=False).only(*CALENDAR_FIELDS).first()
+    if event is None:
+        raise Http404('Event not found')
+    
+    lines = ical.calendar_lines([event], request.get_host(), request.GET.get('locale', 'th'), name=event.title)
+    return calendar_response(lines, f'tsak-event-{event.pk}.ics')
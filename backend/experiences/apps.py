@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ExperiencesConfig(AppConfig):
     name = 'experiences'
+
+    def ready(self):
+        from tsak_backend import images
+
+        images.register(self.get_model('Experience'), photo='photo_meta')
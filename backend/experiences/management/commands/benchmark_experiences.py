@@ -0,0 +1,115 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from experiences.models import Experience
+from experiences.serializers import ExperienceSerializer
+from experiences.views import ExperienceListView
+
+WORDS = [
+    "Korea", "study", "culture", "research", "scholarship", "food", "friends", "professor",
+    "ภาษา", "มหาวิทยาลัย", "ทุน", "เพื่อน", "อาหาร", "อาจารย์",
+]
+
+
+class FullProfileListView(ExperienceListView):
+    """The list endpoint as it was before the summaries: every column through ExperienceSerializer"""
+    serializer_class = ExperienceSerializer
+
+    def get_queryset(self):
+        return Experience.objects.order_by("-date_posted")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed profiles (on top of any already in the database) in a transaction that is "
+        "rolled back and report the payload size and latency of the experience endpoints, "
+        "next to the list served with the full profile serializer"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=1000, help="Profiles to seed (default 1000)")
+        parser.add_argument('--requests', type=int, default=50, help="Timed requests per endpoint (default 50)")
+
+    def handle(self, *args, **options):
+        # The test client talks to "testserver", and the event status thread,
+        # if enabled, would wait on the write lock held by the seeded rows
+        overrides = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            EVENT_STATUS_UPDATE_INTERVAL=None,
+        )
+        with overrides, transaction.atomic():
+            self.run(options['profiles'], options['requests'])
+            # Leave the database as it was
+            transaction.set_rollback(True)
+
+    def run(self, profiles, requests):
+        pks = self.seed(profiles)
+        factory = APIRequestFactory()
+        client = Client()
+        ids = ','.join(str(pk) for pk in pks[:50])
+
+        self.stdout.write(f"{profiles} profiles, median of {requests} requests")
+        views = [("full profiles", FullProfileListView.as_view()), ("summaries", ExperienceListView.as_view())]
+        for label, view in views:
+            fetch = lambda: view(factory.get('/api/experiences/', {'lang': 'en'})).render().content
+            self.report(f"list view, {label}, first page", *self.measure(fetch, requests))
+
+        # End to end, through the middleware and URL routing
+        for url in [
+            '/api/experiences/?lang=en',
+            '/api/experiences/?lang=th&page=2',
+            f'/api/experiences/{pks[0]}/?lang=en',
+            f'/api/experiences/?lang=en&ids={ids}',
+        ]:
+            self.report(url, *self.measure(lambda: client.get(url).content, requests))
+
+    def seed(self, count):
+        rng = random.Random(0)
+
+        def text(words):
+            return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+        def items():
+            return {'en': [text(12) for _ in range(4)], 'th': [text(12) for _ in range(4)]}
+
+        experiences = Experience.objects.bulk_create([
+            Experience(
+                degree=rng.choice(Experience.DEGREE_CHOICES)[0],
+                curriculum_language=rng.choice(Experience.LANGUAGE_CHOICES)[0],
+                field_of_study=rng.choice(Experience.FIELD_CHOICES)[0],
+                name_en=f'Student {i}', name_th=f'นักศึกษา {i}',
+                university_en='Seoul National University', university_th='มหาวิทยาลัยแห่งชาติโซล',
+                major_en='Computer Science', major_th='วิทยาการคอมพิวเตอร์',
+                short_bio_en=text(60), short_bio_th=text(60),
+                why_korea_en=text(200), why_korea_th=text(200),
+                why_major_en=text(200), why_major_th=text(200),
+                life_in_korea_en=text(300), life_in_korea_th=text(300),
+                recommendations_en=text(200), recommendations_th=text(200),
+                major_pros=items(), major_cons=items(), uni_pros=items(), uni_cons=items(),
+                recommended_courses=items(), achievements=items(), preparation=items(),
+            )
+            for i in range(count)
+        ])
+        return [experience.pk for experience in experiences]
+
+    def measure(self, fetch, requests):
+        """(payload bytes, median ms, p95 ms) of ``fetch()``, after one warm-up call"""
+        size = len(fetch())
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            fetch()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return size, statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+    def report(self, label, size, median, p95):
+        self.stdout.write(f"{label[:60]:60} {size / 1024:8.1f} KB  median {median:6.1f} ms  p95 {p95:6.1f} ms")
@@ -1,6 +1,29 @@
 from django.db import models
+from django.db.models.functions import Substr
 from django.utils import timezone
 
+EXCERPT_LENGTH = 200  # characters of the short bio shown on a profile card
+
+
+class ExperienceQuerySet(models.QuerySet):
+    # Short columns a profile card needs besides the localized ones
+    SUMMARY_FIELDS = [
+        "id", "photo", "photo_meta", "degree", "curriculum_language",
+        "field_of_study", "date_posted", "updated_at",
+    ]
+
+    def summaries(self, lang):
+        """
+        Load what a profile card shows and nothing else: the long TEXT and
+        JSON columns are deferred, and the short bio is cut down to
+        ``short_bio_excerpt`` by the database. Name, university and major
+        are added by ``localize`` (see ExperienceSummarySerializer).
+        """
+        lang = "en" if lang == "en" else "th"
+        return self.only(*self.SUMMARY_FIELDS).annotate(
+            short_bio_excerpt=Substr(f"short_bio_{lang}", 1, EXCERPT_LENGTH + 1)
+        )
+
 
 class Experience(models.Model):
     DEGREE_CHOICES = [
@@ -25,6 +48,7 @@ class Experience(models.Model):
     ]
 
     photo = models.ImageField(upload_to="experience/photos/", blank=True, null=True)
+    photo_meta = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive variants, see tsak_backend.images")
 
     degree = models.CharField(max_length=20, choices=DEGREE_CHOICES)
     curriculum_language = models.CharField(max_length=20, choices=LANGUAGE_CHOICES)
@@ -69,6 +93,9 @@ class Experience(models.Model):
     linkedin = models.CharField(max_length=255, blank=True, null=True)
 
     date_posted = models.DateField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ExperienceQuerySet.as_manager()
 
     def __str__(self):
         return self.name_en
@@ -1,22 +1,82 @@
 from rest_framework import serializers
-from .models import Experience
+from tsak_backend.bilingual import BilingualField
+from tsak_backend.images import image_info, variant_urls
+from .models import EXCERPT_LENGTH, Experience
 
 
-class ExperienceSerializer(serializers.ModelSerializer):
-    name = serializers.SerializerMethodField()
-    university = serializers.SerializerMethodField()
-    major = serializers.SerializerMethodField()
+class ExperienceFieldsMixin:
+    """``?lang=en|th`` picks the language, English by default"""
+
+    locale_param = "lang"
+    default_locale = "en"
+
+    def get_photoSrcset(self, obj):
+        return variant_urls(obj.photo, obj.photo_meta, self.context.get("request"))
+
+    def get_photoInfo(self, obj):
+        return image_info(obj.photo, obj.photo_meta)
+
+
+class ExperienceSummarySerializer(ExperienceFieldsMixin, serializers.ModelSerializer):
+    """
+    Profile card for the list endpoint. Expects a queryset from
+    ``Experience.objects.summaries()`` passed through
+    ``tsak_backend.bilingual.localize``, which loads only these columns.
+    """
+
+    name = BilingualField("name_th", "name_en", fallback=False)
+    university = BilingualField("university_th", "university_en", fallback=False)
+    major = BilingualField("major_th", "major_en", fallback=False)
     shortBio = serializers.SerializerMethodField()
-    whyKorea = serializers.SerializerMethodField()
-    whyMajor = serializers.SerializerMethodField()
-    lifeInKorea = serializers.SerializerMethodField()
-    recommendations = serializers.SerializerMethodField()
+
+    curriculumLanguage = serializers.CharField(source="curriculum_language")
+    fieldOfStudy = serializers.CharField(source="field_of_study")
+    datePosted = serializers.DateField(source="date_posted")
+
+    photoSrcset = serializers.SerializerMethodField()
+    photoInfo = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Experience
+        fields = [
+            "id",
+            "name",
+            "photo",
+            "photoSrcset",
+            "photoInfo",
+            "university",
+            "major",
+            "degree",
+            "curriculumLanguage",
+            "fieldOfStudy",
+            "shortBio",
+            "datePosted",
+        ]
+
+    def get_shortBio(self, obj):
+        excerpt = obj.short_bio_excerpt
+        if len(excerpt) > EXCERPT_LENGTH:
+            excerpt = excerpt[:EXCERPT_LENGTH].rstrip() + "…"
+        return excerpt
+
+
+class ExperienceSerializer(ExperienceFieldsMixin, serializers.ModelSerializer):
+    name = BilingualField("name_th", "name_en", fallback=False)
+    university = BilingualField("university_th", "university_en", fallback=False)
+    major = BilingualField("major_th", "major_en", fallback=False)
+    shortBio = BilingualField("short_bio_th", "short_bio_en", fallback=False)
+    whyKorea = BilingualField("why_korea_th", "why_korea_en", fallback=False)
+    whyMajor = BilingualField("why_major_th", "why_major_en", fallback=False)
+    lifeInKorea = BilingualField("life_in_korea_th", "life_in_korea_en", fallback=False)
+    recommendations = BilingualField("recommendations_th", "recommendations_en", fallback=False)
 
     curriculumLanguage = serializers.CharField(source="curriculum_language")
     fieldOfStudy = serializers.CharField(source="field_of_study")
     datePosted = serializers.DateField(source="date_posted")
 
     contact = serializers.SerializerMethodField()
+    photoSrcset = serializers.SerializerMethodField()
+    photoInfo = serializers.SerializerMethodField()
 
     class Meta:
         model = Experience
@@ -24,6 +84,8 @@ class ExperienceSerializer(serializers.ModelSerializer):
             "id",
             "name",
             "photo",
+            "photoSrcset",
+            "photoInfo",
             "university",
             "major",
             "degree",
@@ -45,37 +107,6 @@ class ExperienceSerializer(serializers.ModelSerializer):
             "datePosted",
         ]
 
-    def _lang(self):
-        request = self.context.get("request")
-        return request.query_params.get("lang", "en") if request else "en"
-
-    def _pick(self, obj, en, th):
-        return getattr(obj, en) if self._lang() == "en" else getattr(obj, th)
-
-    def get_name(self, obj):
-        return self._pick(obj, "name_en", "name_th")
-
-    def get_university(self, obj):
-        return self._pick(obj, "university_en", "university_th")
-
-    def get_major(self, obj):
-        return self._pick(obj, "major_en", "major_th")
-
-    def get_shortBio(self, obj):
-        return self._pick(obj, "short_bio_en", "short_bio_th")
-
-    def get_whyKorea(self, obj):
-        return self._pick(obj, "why_korea_en", "why_korea_th")
-
-    def get_whyMajor(self, obj):
-        return self._pick(obj, "why_major_en", "why_major_th")
-
-    def get_lifeInKorea(self, obj):
-        return self._pick(obj, "life_in_korea_en", "life_in_korea_th")
-
-    def get_recommendations(self, obj):
-        return self._pick(obj, "recommendations_en", "recommendations_th")
-
     def get_contact(self, obj):
         return {
             "email": obj.email,
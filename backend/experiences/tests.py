@@ -1,3 +1,52 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .models import EXCERPT_LENGTH, Experience
+
+
+def create_experience(**fields):
+    fields.setdefault('degree', 'master')
+    fields.setdefault('curriculum_language', 'english')
+    fields.setdefault('field_of_study', 'science')
+    for name in ['name', 'university', 'major', 'short_bio', 'why_korea', 'why_major', 'life_in_korea', 'recommendations']:
+        fields.setdefault(f'{name}_en', f'{name} en')
+        fields.setdefault(f'{name}_th', f'{name} th')
+    return Experience.objects.create(**fields)
+
+
+class ExperienceSummaryTests(TestCase):
+    def test_list_serves_cards_only(self):
+        experience = create_experience(short_bio_en='x' * 500, why_korea_en='essay')
+
+        with CaptureQueriesContext(connection) as queries:
+            card = self.client.get('/api/experiences/', {'lang': 'en'}).json()['results'][0]
+        self.assertEqual(card['id'], experience.pk)
+        self.assertNotIn('whyKorea', card)
+        self.assertEqual(card['shortBio'], 'x' * EXCERPT_LENGTH + '…')
+        select = next(query['sql'] for query in queries if 'short_bio_excerpt' in query['sql'])
+        for column in ['why_korea_en', 'life_in_korea_en', 'major_pros', 'name_th']:
+            self.assertNotIn(f'"{column}"', select)
+
+    def test_detail_serves_the_full_profile(self):
+        experience = create_experience(why_korea_en='essay')
+        profile = self.client.get(f'/api/experiences/{experience.pk}/', {'lang': 'en'}).json()
+        self.assertEqual(profile['whyKorea'], 'essay')
+        self.assertEqual(profile['shortBio'], 'short_bio en')
+
+    def test_multiget_serves_full_profiles(self):
+        first = create_experience(why_korea_en='first essay')
+        second = create_experience(why_korea_th='เรียงความ')
+        body = self.client.get('/api/experiences/', {'ids': f'{second.pk},{first.pk},0', 'lang': 'th'}).json()
+        self.assertEqual(body['missing'], [0])
+        self.assertEqual([profile['whyKorea'] for profile in body['results']], ['เรียงความ', 'why_korea th'])
+        self.assertEqual(body['results'][0], self.client.get(f'/api/experiences/{second.pk}/', {'lang': 'th'}).json())
 
-# Create your tests here.
+    def test_benchmark_leaves_the_database_alone(self):
+        out = io.StringIO()
+        call_command('benchmark_experiences', profiles=5, requests=1, stdout=out)
+        self.assertIn('summaries, first page', out.getvalue())
+        self.assertFalse(Experience.objects.exists())
@@ -1,14 +1,55 @@
+from django.utils.decorators import method_decorator
 from rest_framework import generics
+from tsak_backend.bilingual import localize, request_locale
+from tsak_backend.conditional import conditional_get, table_version
+from tsak_backend.listing import list_response
+from tsak_backend.multiget import multiget_response, parse_ids
 from .models import Experience
-from .serializers import ExperienceSerializer
+from .serializers import ExperienceSerializer, ExperienceSummarySerializer
 
 
+def experiences_version(request, *args, **kwargs):
+    return [table_version(Experience.objects.all())]
+
+
+@method_decorator(conditional_get(experiences_version), name="get")
 class ExperienceListView(generics.ListAPIView):
-    queryset = Experience.objects.all().order_by("-date_posted")
-    serializer_class = ExperienceSerializer
+    # Cards only: full profiles are served by ExperienceDetailView and ?ids=
+    serializer_class = ExperienceSummarySerializer
 
+    def get_queryset(self):
+        locale = request_locale(self.request, self.serializer_class)
+        queryset = Experience.objects.summaries(locale).order_by("-date_posted")
+        return localize(queryset, self.serializer_class, locale)
 
+    def list(self, request, *args, **kwargs):
+        # ?ids=1,5,9 fetches those full profiles in one query, in that order,
+        # like the detail view does for one
+        ids = parse_ids(request)
+        if ids is not None:
+            locale = request_locale(request, ExperienceSerializer)
+            return multiget_response(
+                localize(Experience.objects.all(), ExperienceSerializer, locale),
+                ids,
+                lambda experiences: ExperienceSerializer(
+                    experiences, many=True, context=self.get_serializer_context()
+                ).data
+            )
+        return list_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            self.get_serializer_class(),
+            context=self.get_serializer_context(),
+            paginator=self.paginator,
+        )
+
+
+@method_decorator(conditional_get(experiences_version), name="get")
 class ExperienceDetailView(generics.RetrieveAPIView):
-    queryset = Experience.objects.all()
     serializer_class = ExperienceSerializer
     lookup_field = "id"
+
+    def get_queryset(self):
+        # Each essay is read in the requested language only
+        locale = request_locale(self.request, self.serializer_class)
+        return localize(Experience.objects.all(), self.serializer_class, locale)
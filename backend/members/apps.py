@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class MembersConfig(AppConfig):
     name = 'members'
+
+    def ready(self):
+        from tsak_backend import images
+
+        images.register(self.get_model('Member'), picture='picture_meta')
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("members", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="member",
+            name="picture_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive variants, see tsak_backend.images",
+            ),
+        ),
+    ]
@@ -25,6 +25,7 @@ class Member(models.Model):
     firstname = models.CharField(max_length=100)
     lastname = models.CharField(max_length=100)
     picture = models.ImageField(upload_to='members/', blank=True, null=True)
+    picture_meta = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive variants, see tsak_backend.images")
     
     # Academic Information
     university = models.CharField(max_length=200)
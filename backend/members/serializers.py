@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from tsak_backend.images import image_info, variant_urls
 from .models import Member
 
 class MemberSerializer(serializers.ModelSerializer):
     picture = serializers.SerializerMethodField()
+    picture_srcset = serializers.SerializerMethodField()
+    picture_info = serializers.SerializerMethodField()
     
     class Meta:
         model = Member
@@ -11,6 +14,8 @@ class MemberSerializer(serializers.ModelSerializer):
             'firstname',
             'lastname',
             'picture',
+            'picture_srcset',
+            'picture_info',
             'university',
             'major',
             'position',
@@ -31,4 +36,18 @@ class MemberSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.picture.url)
             # Fallback if no request context
             return obj.picture.url
-        return None
\ No newline at end of file
+        return None
+    
+    def get_picture_srcset(self, obj):
+        """
+        Resized variants of the picture: {"webp": {"320": url, ...}, "jpeg": {...}}
+        or None if they have not been generated.
+        """
+        return variant_urls(obj.picture, obj.picture_meta, self.context.get('request'))
+    
+    def get_picture_info(self, obj):
+        """
+        {"width", "height", "color", "lqip"} of the picture, so the frontend can
+        reserve space and show a placeholder, or None if not analysed yet.
+        """
+        return image_info(obj.picture, obj.picture_meta)
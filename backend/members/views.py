@@ -1,9 +1,11 @@
 from rest_framework.decorators import api_view
-from rest_framework.response import Response
+from tsak_backend.conditional import conditional_get, table_version
+from tsak_backend.listing import list_response
 from .models import Member
 from .serializers import MemberSerializer
 
 @api_view(['GET'])
+@conditional_get(lambda request: [table_version(Member.objects.all())])
 def member_list(request):
     """
     Get all members.
@@ -12,6 +14,4 @@ def member_list(request):
     Returns JSON array of all members.
     Frontend will handle filtering by department.
     """
-    members = Member.objects.all()
-    serializer = MemberSerializer(members, many=True, context={'request': request})
-    return Response(serializer.data)
\ No newline at end of file
+    return list_response(request, Member.objects.all(), MemberSerializer)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django import forms
-from .models import Scholarship
+from .models import Scholarship, parse_deadline
 
 SCHOLARSHIP_TYPES = [
     ("government", "Government"),
@@ -55,6 +55,30 @@ class ScholarshipAdminForm(forms.ModelForm):
         model = Scholarship
         fields = "__all__"
 
+    def clean(self):
+        cleaned_data = super().clean()
+        deadline_date = cleaned_data.get("deadline_date")
+        rolling = cleaned_data.get("deadline_rolling")
+
+        if deadline_date and rolling:
+            self.add_error("deadline_rolling", "A rolling deadline cannot also have a deadline date.")
+        elif not deadline_date and not rolling:
+            # Fill the structured deadline from the text when it can be read
+            parsed_date, parsed_rolling = parse_deadline(cleaned_data.get("deadline_en"))
+            if parsed_date is None and not parsed_rolling:
+                parsed_date, parsed_rolling = parse_deadline(cleaned_data.get("deadline"))
+            if parsed_date is not None:
+                cleaned_data["deadline_date"] = parsed_date
+            elif parsed_rolling:
+                cleaned_data["deadline_rolling"] = True
+            else:
+                self.add_error(
+                    "deadline_date",
+                    "Could not read a date from the deadline text. "
+                    "Enter the deadline date or mark the deadline as rolling.",
+                )
+        return cleaned_data
+
 
 @admin.register(Scholarship)
 class ScholarshipAdmin(admin.ModelAdmin):
@@ -65,6 +89,7 @@ class ScholarshipAdmin(admin.ModelAdmin):
         "name_en",
         "type",
         "provider",
+        "deadline_date",
         "order",
         "is_active",
         "created_at",
@@ -73,6 +98,7 @@ class ScholarshipAdmin(admin.ModelAdmin):
     list_filter = (
         "type",
         "is_active",
+        "deadline_rolling",
         "created_at",
     )
 
@@ -109,6 +135,10 @@ class ScholarshipAdmin(admin.ModelAdmin):
         ("Deadline & Eligibility (English)", {
             "fields": ("deadline_en", "eligibility_en", "monthly_allowance_en")
         }),
+        ("Deadline", {
+            "fields": ("deadline_date", "deadline_rolling"),
+            "description": "Leave the date empty to read it from the deadline text"
+        }),
         ("External Link", {
             "fields": ("link",)
         }),
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ScholarshipsConfig(AppConfig):
     name = 'scholarships'
+
+    def ready(self):
+        from . import signals
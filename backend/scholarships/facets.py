@@ -0,0 +1,110 @@
+"""
+Faceted search over scholarships.
+
+The facet values of each scholarship (its ``type`` and the entries of the
+``funding_type``, ``study_level`` and ``field_of_study`` JSON lists) are
+copied into ``ScholarshipFacet`` rows whenever a scholarship is saved. The
+unique (facet, value, scholarship) index then answers both the filters and
+the per-value counts without reading the JSON.
+
+Values selected within one facet match any of them (``op=or``, the
+default) or all of them (``op=and``); different facets are always
+combined with AND. Counts follow the usual faceted navigation rule: with
+``op=or`` the counts of a facet ignore that facet's own selection, so
+they say how many results choosing another value would add.
+"""
+from django.db.models import Count
+
+from .models import FACETS, ScholarshipFacet
+
+
+def facet_values(scholarship):
+    """The (facet, value) pairs of a scholarship"""
+    pairs = set()
+    for facet in FACETS:
+        value = getattr(scholarship, facet)
+        for item in value if isinstance(value, list) else [value]:
+            if item:
+                pairs.add((facet, item))
+    return pairs
+
+
+def sync_facets(scholarship):
+    """Rewrite the facet rows of one scholarship"""
+    wanted = facet_values(scholarship)
+    existing = set(scholarship.facets.values_list("facet", "value"))
+    for facet, value in existing - wanted:
+        scholarship.facets.filter(facet=facet, value=value).delete()
+    ScholarshipFacet.objects.bulk_create([
+        ScholarshipFacet(scholarship=scholarship, facet=facet, value=value)
+        for facet, value in wanted - existing
+    ])
+
+
+def rebuild_all():
+    from .models import Scholarship
+
+    rows = [
+        ScholarshipFacet(scholarship_id=scholarship.pk, facet=facet, value=value)
+        for scholarship in Scholarship.objects.only("id", *FACETS)
+        for facet, value in facet_values(scholarship)
+    ]
+    ScholarshipFacet.objects.all().delete()
+    ScholarshipFacet.objects.bulk_create(rows)
+    return len(rows)
+
+
+def parse_selections(params):
+    """
+    Read ``<facet>=a,b`` query parameters, returns ({facet: [values]}, error).
+    Unknown values are an error rather than silently matching nothing.
+    """
+    selections = {}
+    for facet, choices in FACETS.items():
+        raw = params.get(facet)
+        if not raw:
+            continue
+        values = list(dict.fromkeys(part.strip() for part in raw.split(",") if part.strip()))
+        valid = [choice for choice, _ in choices]
+        invalid = [value for value in values if value not in valid]
+        if invalid:
+            return None, f"Invalid {facet}: {', '.join(invalid)}. Must be one of: {', '.join(valid)}"
+        if values:
+            selections[facet] = values
+    return selections, None
+
+
+def matching_ids(facet, values, op):
+    """Subquery of the scholarship ids having any (or all) of ``values`` for ``facet``"""
+    rows = ScholarshipFacet.objects.filter(facet=facet, value__in=values)
+    if op == "and" and len(values) > 1:
+        rows = (
+            rows.values("scholarship_id")
+            .annotate(matched=Count("value"))
+            .filter(matched=len(values))
+        )
+    return rows.values("scholarship_id")
+
+
+def apply_filters(queryset, selections, op="or", exclude_facet=None):
+    for facet, values in selections.items():
+        if facet != exclude_facet:
+            queryset = queryset.filter(id__in=matching_ids(facet, values, op))
+    return queryset
+
+
+def facet_counts(queryset, selections, op="or"):
+    """{facet: {value: count}} for every facet, one GROUP BY query per facet"""
+    counts = {}
+    for facet, choices in FACETS.items():
+        scope = apply_filters(queryset, selections, op, exclude_facet=facet if op == "or" else None)
+        rows = (
+            ScholarshipFacet.objects
+            .filter(facet=facet, scholarship__in=scope.order_by().values("id"))
+            .values("value")
+            .annotate(count=Count("scholarship_id"))
+            .order_by()
+        )
+        found = {row["value"]: row["count"] for row in rows}
+        counts[facet] = {value: found.get(value, 0) for value, _ in choices}
+    return counts
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from scholarships.models import Scholarship
+
+
+class Command(BaseCommand):
+    help = "Parse deadline_date / deadline_rolling from the free-text deadline of every scholarship"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--overwrite', action='store_true',
+            help="Also re-parse scholarships that already have a deadline date or rolling flag",
+        )
+
+    def handle(self, *args, **options):
+        scholarships = Scholarship.objects.only('id', 'deadline', 'deadline_en', 'deadline_date', 'deadline_rolling')
+        if not options['overwrite']:
+            scholarships = scholarships.filter(deadline_date__isnull=True, deadline_rolling=False)
+
+        changed = []
+        unparsed = []
+        for scholarship in scholarships.iterator():
+            deadline_date, rolling = scholarship.parse_deadline_text()
+            if deadline_date is None and not rolling:
+                unparsed.append(scholarship)
+            if (deadline_date, rolling) != (scholarship.deadline_date, scholarship.deadline_rolling):
+                scholarship.deadline_date, scholarship.deadline_rolling = deadline_date, rolling
+                changed.append(scholarship)
+
+        # bulk_update skips save(), so updated_at is left alone
+        Scholarship.objects.bulk_update(changed, ['deadline_date', 'deadline_rolling'], batch_size=500)
+
+        for scholarship in unparsed:
+            self.stderr.write(
+                f"Could not parse deadline of scholarship {scholarship.pk}: "
+                f"'{scholarship.deadline_en or scholarship.deadline}'"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Updated deadlines of {len(changed)} scholarships"))
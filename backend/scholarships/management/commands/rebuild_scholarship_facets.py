@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from scholarships import facets
+
+
+class Command(BaseCommand):
+    help = "Rebuild the scholarship facet index from the scholarship JSON fields"
+
+    def handle(self, *args, **options):
+        count = facets.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} scholarship facet values"))
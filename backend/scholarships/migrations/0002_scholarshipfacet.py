@@ -0,0 +1,73 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_facets(apps, schema_editor):
+    Scholarship = apps.get_model("scholarships", "Scholarship")
+    ScholarshipFacet = apps.get_model("scholarships", "ScholarshipFacet")
+    rows = []
+    for scholarship in Scholarship.objects.all():
+        pairs = {("type", scholarship.type)}
+        for facet in ("funding_type", "study_level", "field_of_study"):
+            pairs.update((facet, value) for value in getattr(scholarship, facet) or [] if value)
+        rows.extend(
+            ScholarshipFacet(scholarship_id=scholarship.pk, facet=facet, value=value)
+            for facet, value in pairs
+        )
+    ScholarshipFacet.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScholarshipFacet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "facet",
+                    models.CharField(
+                        choices=[
+                            ("type", "type"),
+                            ("funding_type", "funding_type"),
+                            ("study_level", "study_level"),
+                            ("field_of_study", "field_of_study"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("value", models.CharField(max_length=30)),
+                (
+                    "scholarship",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facets",
+                        to="scholarships.scholarship",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("facet", "value", "scholarship"),
+                        name="unique_scholarship_facet_value",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_facets, migrations.RunPython.noop),
+    ]
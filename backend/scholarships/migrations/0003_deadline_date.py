@@ -0,0 +1,102 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:38
+
+import re
+from datetime import date
+
+from django.db import migrations, models
+
+# Frozen copy of scholarships.models.parse_deadline as of this migration,
+# so later changes to the parser do not change what the backfill does
+
+MONTHS = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+    "มกราคม": 1, "กุมภาพันธ์": 2, "มีนาคม": 3, "เมษายน": 4, "พฤษภาคม": 5, "มิถุนายน": 6,
+    "กรกฎาคม": 7, "สิงหาคม": 8, "กันยายน": 9, "ตุลาคม": 10, "พฤศจิกายน": 11, "ธันวาคม": 12,
+    "ม.ค.": 1, "ก.พ.": 2, "มี.ค.": 3, "เม.ย.": 4, "พ.ค.": 5, "มิ.ย.": 6,
+    "ก.ค.": 7, "ส.ค.": 8, "ก.ย.": 9, "ต.ค.": 10, "พ.ย.": 11, "ธ.ค.": 12,
+}
+ROLLING_KEYWORDS = [
+    "rolling", "year-round", "year round", "tba", "tbd", "ongoing",
+    "ตลอดปี", "ตลอดทั้งปี", "ไม่มีกำหนด", "ไม่ระบุ",
+]
+_MONTH_NAMES = "|".join(sorted((re.escape(name) for name in MONTHS), key=len, reverse=True))
+DEADLINE_PATTERNS = [
+    (re.compile(r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})"), None),
+    (re.compile(r"(?P<day>\d{1,2})[./](?P<month>\d{1,2})[./](?P<year>\d{4})"), None),
+    (re.compile(rf"(?P<day>\d{{1,2}})\s*(?P<month>{_MONTH_NAMES})\s*,?\s*(?P<year>\d{{4}})", re.IGNORECASE), MONTHS),
+    (re.compile(rf"(?P<month>{_MONTH_NAMES})\s*(?P<day>\d{{1,2}})\s*,?\s*(?P<year>\d{{4}})", re.IGNORECASE), MONTHS),
+]
+
+
+def parse_deadline(text):
+    text = (text or "").strip()
+    if not text:
+        return None, False
+    if any(keyword in text.lower() for keyword in ROLLING_KEYWORDS):
+        return None, True
+
+    found = []
+    for pattern, month_names in DEADLINE_PATTERNS:
+        for match in pattern.finditer(text):
+            month = match.group("month")
+            month = month_names[month.lower()] if month_names else int(month)
+            year = int(match.group("year"))
+            if year > 2400:
+                year -= 543
+            try:
+                found.append((match.end(), date(year, month, int(match.group("day")))))
+            except ValueError:
+                continue
+    if not found:
+        return None, False
+    return max(found)[1], False
+
+
+def populate_deadlines(apps, schema_editor):
+    Scholarship = apps.get_model("scholarships", "Scholarship")
+    scholarships = list(Scholarship.objects.only("id", "deadline", "deadline_en"))
+    for scholarship in scholarships:
+        deadline_date, rolling = parse_deadline(scholarship.deadline_en)
+        if deadline_date is None and not rolling:
+            deadline_date, rolling = parse_deadline(scholarship.deadline)
+        scholarship.deadline_date, scholarship.deadline_rolling = deadline_date, rolling
+    Scholarship.objects.bulk_update(scholarships, ["deadline_date", "deadline_rolling"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0002_scholarshipfacet"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scholarship",
+            name="deadline_date",
+            field=models.DateField(
+                blank=True,
+                help_text="Last day to apply. Left empty, it is parsed from the deadline text.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="scholarship",
+            name="deadline_rolling",
+            field=models.BooleanField(
+                default=False,
+                help_text="No fixed deadline, the scholarship stays listed",
+                verbose_name="Rolling / unknown deadline",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scholarship",
+            index=models.Index(
+                fields=["is_active", "deadline_date"],
+                name="scholarship_active_deadline",
+            ),
+        ),
+        migrations.RunPython(populate_deadlines, migrations.RunPython.noop),
+    ]
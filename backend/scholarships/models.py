@@ -1,5 +1,9 @@
+import re
+from datetime import date, timedelta
+
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 SCHOLARSHIP_TYPES = [
     ("government", "Government"),
@@ -31,6 +35,77 @@ FIELD_OF_STUDY = [
     ("medicine", "Medicine"),
 ]
 
+MONTHS = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+    "มกราคม": 1, "กุมภาพันธ์": 2, "มีนาคม": 3, "เมษายน": 4, "พฤษภาคม": 5, "มิถุนายน": 6,
+    "กรกฎาคม": 7, "สิงหาคม": 8, "กันยายน": 9, "ตุลาคม": 10, "พฤศจิกายน": 11, "ธันวาคม": 12,
+    "ม.ค.": 1, "ก.พ.": 2, "มี.ค.": 3, "เม.ย.": 4, "พ.ค.": 5, "มิ.ย.": 6,
+    "ก.ค.": 7, "ส.ค.": 8, "ก.ย.": 9, "ต.ค.": 10, "พ.ย.": 11, "ธ.ค.": 12,
+}
+ROLLING_KEYWORDS = ["rolling", "year-round", "year round", "tba", "tbd", "ongoing", "ตลอดปี", "ตลอดทั้งปี", "ไม่มีกำหนด", "ไม่ระบุ"]
+
+_MONTH_NAMES = "|".join(sorted((re.escape(name) for name in MONTHS), key=len, reverse=True))
+DEADLINE_PATTERNS = [
+    # 2026-03-31
+    (re.compile(r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})"), None),
+    # 31.03.2026, 31/03/2026
+    (re.compile(r"(?P<day>\d{1,2})[./](?P<month>\d{1,2})[./](?P<year>\d{4})"), None),
+    # 31 March 2026, 31 มีนาคม 2569
+    (re.compile(rf"(?P<day>\d{{1,2}})\s*(?P<month>{_MONTH_NAMES})\s*,?\s*(?P<year>\d{{4}})", re.IGNORECASE), MONTHS),
+    # March 31, 2026
+    (re.compile(rf"(?P<month>{_MONTH_NAMES})\s*(?P<day>\d{{1,2}})\s*,?\s*(?P<year>\d{{4}})", re.IGNORECASE), MONTHS),
+]
+
+
+def parse_deadline(text):
+    """
+    Parse a free-text deadline ("March 31, 2026", "31 มีนาคม 2569",
+    "31.03.2026", "1 Jan - 31 Mar 2026", "Rolling") into
+    (deadline_date, rolling). Buddhist Era years are converted, and when
+    the text holds several dates the last one is the deadline. Returns
+    (None, False) if nothing can be recognised.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None, False
+    if any(keyword in text.lower() for keyword in ROLLING_KEYWORDS):
+        return None, True
+
+    found = []
+    for pattern, month_names in DEADLINE_PATTERNS:
+        for match in pattern.finditer(text):
+            month = match.group("month")
+            month = month_names[month.lower()] if month_names else int(month)
+            year = int(match.group("year"))
+            if year > 2400:
+                year -= 543
+            try:
+                found.append((match.end(), date(year, month, int(match.group("day")))))
+            except ValueError:
+                continue
+    if not found:
+        return None, False
+    return max(found)[1], False
+
+
+class ScholarshipQuerySet(models.QuerySet):
+    def open(self, today=None):
+        """Scholarships whose deadline has not passed (rolling and undated ones included)"""
+        today = today or timezone.localdate()
+        return self.filter(models.Q(deadline_date__isnull=True) | models.Q(deadline_date__gte=today))
+
+    def closing_within(self, days, today=None):
+        """Scholarships with a deadline in the next ``days`` days, soonest first"""
+        today = today or timezone.localdate()
+        return self.filter(
+            deadline_date__gte=today,
+            deadline_date__lte=today + timedelta(days=days),
+        ).order_by("deadline_date", "order", "id")
+
+
 def validate_choices(value, valid_choices):
     if not isinstance(value, list):
         raise ValidationError("Must be a list")
@@ -60,6 +135,14 @@ class Scholarship(models.Model):
     # Deadline and Eligibility
     deadline = models.CharField(max_length=255, verbose_name="Deadline (Thai)")
     deadline_en = models.CharField(max_length=255, blank=True, verbose_name="Deadline (English)")
+    deadline_date = models.DateField(
+        blank=True, null=True,
+        help_text="Last day to apply. Left empty, it is parsed from the deadline text.",
+    )
+    deadline_rolling = models.BooleanField(
+        default=False, verbose_name="Rolling / unknown deadline",
+        help_text="No fixed deadline, the scholarship stays listed",
+    )
 
     eligibility = models.TextField(verbose_name="Eligibility (Thai)")
     eligibility_en = models.TextField(blank=True, verbose_name="Eligibility (English)")
@@ -88,10 +171,58 @@ class Scholarship(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ScholarshipQuerySet.as_manager()
+
     class Meta:
         ordering = ["order", "-created_at"]
+        indexes = [
+            models.Index(fields=["is_active", "deadline_date"], name="scholarship_active_deadline"),
+        ]
         verbose_name = "Scholarship"
         verbose_name_plural = "Scholarships"
 
+    def parse_deadline_text(self):
+        """(deadline_date, rolling) read from the English, then the Thai deadline text"""
+        deadline_date, rolling = parse_deadline(self.deadline_en)
+        if deadline_date is None and not rolling:
+            deadline_date, rolling = parse_deadline(self.deadline)
+        return deadline_date, rolling
+
+    def save(self, *args, **kwargs):
+        """Fill an empty structured deadline from the deadline text"""
+        if self.deadline_date is None and not self.deadline_rolling:
+            self.deadline_date, self.deadline_rolling = self.parse_deadline_text()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and {"deadline", "deadline_en"} & set(update_fields):
+                kwargs["update_fields"] = {*update_fields, "deadline_date", "deadline_rolling"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} - {self.get_type_display()}"
+
+
+FACETS = {
+    "type": SCHOLARSHIP_TYPES,
+    "funding_type": FUNDING_TYPES,
+    "study_level": STUDY_LEVELS,
+    "field_of_study": FIELD_OF_STUDY,
+}
+
+
+class ScholarshipFacet(models.Model):
+    """
+    One (facet, value) of a scholarship, e.g. ("study_level", "masters").
+    Normalizes the JSON list fields so facet filters and counts can use an
+    index, see scholarships.facets. Kept in sync on save.
+    """
+    scholarship = models.ForeignKey(Scholarship, on_delete=models.CASCADE, related_name="facets")
+    facet = models.CharField(max_length=20, choices=[(name, name) for name in FACETS])
+    value = models.CharField(max_length=30)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["facet", "value", "scholarship"], name="unique_scholarship_facet_value"),
+        ]
+
+    def __str__(self):
+        return f"{self.scholarship_id}: {self.facet}={self.value}"
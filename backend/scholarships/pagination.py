@@ -0,0 +1,36 @@
+from django.core.paginator import Page, Paginator
+from django.db.models import Count, Window
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+
+
+class ScholarshipSearchPagination(PageNumberPagination):
+    """
+    Page number pagination that reads the page and the total in one query:
+    the total is a COUNT(*) OVER () window on the page rows, so no separate
+    COUNT query is ever run. A page past the end has no rows to read the
+    total from and is a 404.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+
+        offset = (number - 1) * page_size
+        rows = list(queryset.annotate(total_count=Window(Count('id')))[offset:offset + page_size])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message)
+
+        paginator = Paginator([], page_size)
+        paginator.count = rows[0].total_count if rows else 0
+        self.page = Page(rows, number, paginator)
+        return rows
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from tsak_backend.bilingual import BilingualField, BilingualJSONField
 from .models import Scholarship
 
 SCHOLARSHIP_TYPES = [
@@ -61,6 +62,8 @@ class ScholarshipSerializer(serializers.ModelSerializer):
             "benefits_en",
             "deadline",
             "deadline_en",
+            "deadline_date",
+            "deadline_rolling",
             "eligibility",
             "eligibility_en",
             "monthly_allowance",
@@ -83,4 +86,41 @@ class ScholarshipSerializer(serializers.ModelSerializer):
 
     def validate_field_of_study(self, value):
         return validate_choice_list(value, FIELD_OF_STUDY)
-    
\ No newline at end of file
+    
+
+class LocalizedScholarshipSerializer(serializers.ModelSerializer):
+    """
+    One language per scholarship (``?locale=``, English falling back to
+    Thai where it is blank). Same keys as ScholarshipSerializer without the
+    ``_en`` fields. See ``tsak_backend.bilingual.localize``.
+    """
+    name = BilingualField("name", "name_en")
+    provider = BilingualField("provider", "provider_en")
+    description = BilingualField("description", "description_en")
+    benefits = BilingualJSONField("benefits", "benefits_en")
+    deadline = BilingualField("deadline", "deadline_en")
+    eligibility = BilingualField("eligibility", "eligibility_en")
+    monthly_allowance = BilingualField("monthly_allowance", "monthly_allowance_en")
+
+    class Meta:
+        model = Scholarship
+        fields = [
+            "id",
+            "name",
+            "provider",
+            "description",
+            "benefits",
+            "deadline",
+            "deadline_date",
+            "deadline_rolling",
+            "eligibility",
+            "monthly_allowance",
+            "link",
+            "type",
+            "funding_type",
+            "study_level",
+            "field_of_study",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import facets
+from .models import Scholarship
+
+
+@receiver(post_save, sender=Scholarship)
+def sync_facets(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    facets.sync_facets(instance)
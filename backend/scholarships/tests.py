@@ -1,3 +1,186 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import Scholarship, parse_deadline
+
+
+def create_scholarship(**fields):
+    fields.setdefault('name', 'ทุน')
+    fields.setdefault('provider', 'ผู้ให้ทุน')
+    fields.setdefault('description', 'รายละเอียด')
+    fields.setdefault('deadline', '-')
+    fields.setdefault('eligibility', 'คุณสมบัติ')
+    fields.setdefault('monthly_allowance', '-')
+    fields.setdefault('link', 'https://example.com')
+    fields.setdefault('type', 'government')
+    return Scholarship.objects.create(**fields)
+
+
+class ParseDeadlineTests(SimpleTestCase):
+    def test_formats(self):
+        cases = {
+            'March 31, 2026': (date(2026, 3, 31), False),
+            '31 มีนาคม 2569': (date(2026, 3, 31), False),
+            '31.03.2026': (date(2026, 3, 31), False),
+            '2026-03-31': (date(2026, 3, 31), False),
+            '1 Jan - 31 Mar 2026': (date(2026, 3, 31), False),
+            'Rolling admissions': (None, True),
+            'ตลอดทั้งปี': (None, True),
+            'soon': (None, False),
+            '': (None, False),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_deadline(text), expected)
+
+
+class DeadlineListTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        create_scholarship(name='Past', deadline_date=self.today - timedelta(days=1))
+        create_scholarship(name='Today', deadline_date=self.today)
+        create_scholarship(name='Later', deadline_date=self.today + timedelta(days=60))
+        create_scholarship(name='Rolling', deadline_rolling=True)
+
+    def names(self, response):
+        return [scholarship['name'] for scholarship in response.json()['scholarships']]
+
+    def get(self, day, params=None, **headers):
+        with mock.patch('django.utils.timezone.localdate', return_value=day):
+            return self.client.get('/api/scholarships/', params or {}, headers=headers)
+
+    def test_past_deadlines_are_hidden(self):
+        self.assertCountEqual(self.names(self.get(self.today)), ['Today', 'Later', 'Rolling'])
+
+    def test_save_parses_the_deadline_text(self):
+        create_scholarship(name='Expired', deadline='31 March 2020')
+        scholarship = create_scholarship(name='Kept', deadline='-', deadline_en='Rolling admissions')
+        self.assertEqual((scholarship.deadline_date, scholarship.deadline_rolling), (None, True))
+        self.assertNotIn('Expired', self.names(self.get(self.today)))
+
+    def test_closing_within(self):
+        self.assertEqual(self.names(self.get(self.today, {'closing_within': '30d'})), ['Today'])
+        self.assertEqual(self.names(self.get(self.today, {'closing_within': '90'})), ['Today', 'Later'])
+        self.assertEqual(self.get(self.today, {'closing_within': '0d'}).status_code, 400)
+
+    def test_list_changes_at_midnight(self):
+        first = self.get(self.today)
+        self.assertEqual(self.get(self.today, if_none_match=first['ETag']).status_code, 304)
+
+        tomorrow = self.today + timedelta(days=1)
+        response = self.get(tomorrow, if_none_match=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Today', self.names(response))
+
+        response = self.get(tomorrow, if_modified_since=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+
+
+class DeadlineMigrationTests(TransactionTestCase):
+    before = [('scholarships', '0002_scholarshipfacet')]
+    after = [('scholarships', '0003_deadline_date')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        call_command('migrate', verbosity=0)
+
+    def test_existing_scholarships_get_their_deadline(self):
+        OldScholarship = self.migrate(self.before).get_model('scholarships', 'Scholarship')
+        fields = {
+            'name': 'ทุน', 'provider': '-', 'description': '-', 'eligibility': '-',
+            'monthly_allowance': '-', 'link': 'https://example.com', 'type': 'government',
+        }
+        OldScholarship.objects.create(deadline='31 มีนาคม 2569', **fields)
+        OldScholarship.objects.create(deadline='-', deadline_en='Rolling', **fields)
+
+        NewScholarship = self.migrate(self.after).get_model('scholarships', 'Scholarship')
+        self.assertEqual(
+            list(NewScholarship.objects.order_by('pk').values_list('deadline_date', 'deadline_rolling')),
+            [(date(2026, 3, 31), False), (None, True)],
+        )
+
+
+class FacetedSearchTests(TestCase):
+    def setUp(self):
+        create_scholarship(name='A', type='government', study_level=['masters', 'phd'], funding_type=['full-tuition'])
+        create_scholarship(name='B', type='university', study_level=['masters'], funding_type=['partial-tuition'])
+        create_scholarship(name='C', type='university', study_level=['undergraduate'], funding_type=['full-tuition'])
+
+    def search(self, **params):
+        return self.client.get('/api/scholarships/search/', params).json()
+
+    def names(self, response):
+        return sorted(scholarship['name'] for scholarship in response['results'])
+
+    def test_values_of_one_facet_are_or_by_default(self):
+        response = self.search(study_level='phd,undergraduate')
+        self.assertEqual(self.names(response), ['A', 'C'])
+        # The counts of a selected facet ignore its own selection
+        self.assertEqual(response['facets']['study_level']['masters'], 2)
+        self.assertEqual(response['facets']['type'], {'government': 1, 'university': 1, 'private': 0, 'organization': 0})
+
+    def test_and_requires_every_value(self):
+        response = self.search(study_level='masters,phd', op='and')
+        self.assertEqual(self.names(response), ['A'])
+        self.assertEqual(response['facets']['study_level']['masters'], 1)
+
+    def test_facets_are_combined_with_and(self):
+        self.assertEqual(self.names(self.search(type='university', funding_type='full-tuition')), ['C'])
+
+    def test_edits_resync_the_facets(self):
+        scholarship = Scholarship.objects.get(name='C')
+        scholarship.study_level = ['phd']
+        scholarship.save()
+        self.assertEqual(self.names(self.search(study_level='phd')), ['A', 'C'])
+        self.assertEqual(self.names(self.search(study_level='undergraduate')), [])
+
+    def test_unknown_values_are_rejected(self):
+        self.assertEqual(self.client.get('/api/scholarships/search/', {'study_level': 'kindergarten'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/scholarships/search/', {'op': 'xor'}).status_code, 400)
+
+
+class LocaleProjectionTests(TestCase):
+    def setUp(self):
+        self.scholarship = create_scholarship(
+            name='ทุนรัฐบาล', name_en='Government scholarship',
+            description='รายละเอียด', description_en='',
+            benefits=['ค่าเล่าเรียน'], benefits_en=[],
+        )
+
+    def get(self, **params):
+        return self.client.get(f'/api/scholarships/{self.scholarship.pk}/', params).json()
+
+    def test_thai_by_default(self):
+        data = self.get()
+        self.assertEqual(data['name'], 'ทุนรัฐบาล')
+        self.assertNotIn('name_en', data)
+
+    def test_english_falls_back_to_thai_when_blank(self):
+        data = self.get(locale='en')
+        self.assertEqual(data['name'], 'Government scholarship')
+        self.assertEqual(data['description'], 'รายละเอียด')
+        self.assertEqual(data['benefits'], ['ค่าเล่าเรียน'])
+
+    def test_bilingual_keeps_both_languages(self):
+        data = self.get(bilingual='true')
+        self.assertEqual((data['name'], data['name_en']), ('ทุนรัฐบาล', 'Government scholarship'))
+
+    def test_list_loads_one_language(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/scholarships/').json()
+        self.assertEqual(data['scholarships'][0]['name'], 'ทุนรัฐบาล')
+        select = next(query['sql'] for query in queries if 'localized_name' in query['sql'])
+        for column in ['name_en', 'description_en', 'benefits_en', 'eligibility_en']:
+            self.assertNotIn(f'"{column}"', select)
@@ -5,6 +5,9 @@ urlpatterns = [
     # Get all scholarships
     path('', views.scholarships_list, name='scholarships-list'),
     
+    # Faceted search with counts and pagination
+    path('search/', views.scholarships_search, name='scholarships-search'),
+    
     # Get scholarship by ID
     path('<int:pk>/', views.scholarship_detail, name='scholarship-detail'),
     
@@ -1,86 +1,170 @@
+import re
+
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from tsak_backend.bilingual import localize, request_locale
+from tsak_backend.conditional import conditional_get, date_version, table_version
+from tsak_backend.listing import list_response
+from tsak_backend.multiget import multiget_response, parse_ids
+from . import facets
 from .models import Scholarship
-from .serializers import ScholarshipSerializer
+from .pagination import ScholarshipSearchPagination
+from .serializers import LocalizedScholarshipSerializer, ScholarshipSerializer
+
+
+CLOSING_WITHIN_RE = re.compile(r"^(\d+)d?$")
+MAX_CLOSING_WITHIN_DAYS = 365
+
+
+def scholarships_version(request, *args, **kwargs):
+    """
+    Every scholarship endpoint is built from the one table, and from the
+    current date since passed deadlines drop out of the lists
+    """
+    return [
+        table_version(Scholarship.objects.all()),
+        date_version(),
+    ]
+
+
+def project(request, queryset):
+    """
+    (queryset, serializer class) for the requested payload shape:
+    ?locale=th|en (default th) returns one language, loading only its
+    columns; ?bilingual=true returns both languages for the admin tooling
+    """
+    if request.query_params.get("bilingual", "").lower() in ("1", "true"):
+        return queryset, ScholarshipSerializer
+    locale = request_locale(request, LocalizedScholarshipSerializer)
+    return localize(queryset, LocalizedScholarshipSerializer, locale), LocalizedScholarshipSerializer
+
+
+def parse_closing_within(value):
+    """'30d' or '30' -> 30, returns (days, error)"""
+    match = CLOSING_WITHIN_RE.match(value.strip())
+    if not match or not 1 <= int(match.group(1)) <= MAX_CLOSING_WITHIN_DAYS:
+        return None, f"Invalid closing_within. Use a number of days between 1 and {MAX_CLOSING_WITHIN_DAYS}, e.g. 30d"
+    return int(match.group(1)), None
 
 
 @api_view(["GET"])
+@conditional_get(scholarships_version)
 def scholarships_list(request):
     """
-    Returns all active scholarships
-    Frontend handles filtering and language selection
+    Returns all active scholarships whose deadline has not passed
+    (rolling and undated ones included), in the language given by
+    ?locale=th|en (English falls back to Thai where it is blank).
+    ?bilingual=true returns both languages instead.
+    Frontend handles filtering
+    
+    With ?closing_within=30d returns only those with a deadline in the next
+    30 days, soonest first
+    
+    With ?ids=1,5,9 returns {"results": [...], "missing": [...]} for just
+    those scholarships, in the requested order
     """
-    try:
-        # Get only active scholarships
-        scholarships = Scholarship.objects.filter(is_active=True)
-        
-        # Serialize the data
-        serializer = ScholarshipSerializer(scholarships, many=True)
-        
-        return Response({
-            "scholarships": serializer.data,
-            "count": scholarships.count()
-        }, status=status.HTTP_200_OK)
-        
-    except Exception as e:
-        return Response(
-            {"error": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+    ids = parse_ids(request)
+    if ids is not None:
+        queryset, serializer_class = project(request, Scholarship.objects.filter(is_active=True).open())
+        return multiget_response(
+            queryset,
+            ids,
+            lambda scholarships: serializer_class(scholarships, many=True).data
         )
+    
+    # Get only active scholarships that are still open
+    scholarships = Scholarship.objects.filter(is_active=True).open()
+    
+    closing_within = request.query_params.get("closing_within")
+    if closing_within:
+        days, error = parse_closing_within(closing_within)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        scholarships = scholarships.closing_within(days)
+    
+    scholarships, serializer_class = project(request, scholarships)
+    return list_response(
+        request, scholarships, serializer_class,
+        wrap=lambda data, count: {"scholarships": data, "count": count},
+    )
 
 
 @api_view(["GET"])
+@conditional_get(scholarships_version)
+def scholarships_search(request):
+    """
+    Faceted search over active scholarships whose deadline has not passed
+
+    Query Parameters:
+    - type, funding_type, study_level, field_of_study: comma separated values
+    - op: 'or' (default, any of the values of a facet) or 'and' (all of them).
+      Different facets are always combined with AND.
+    - page, page_size: pagination (default 10, max 50)
+    - locale / bilingual: payload language, as for the list
+
+    Returns {"count", "next", "previous", "results", "facets"} where
+    facets is {facet: {value: count}} (see scholarships.facets)
+    """
+    selections, error = facets.parse_selections(request.query_params)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    op = request.query_params.get("op", "or").lower()
+    if op not in ("or", "and"):
+        return Response({"error": "Invalid op. Must be 'or' or 'and'"}, status=status.HTTP_400_BAD_REQUEST)
+
+    active = Scholarship.objects.filter(is_active=True).open()
+    scholarships = facets.apply_filters(active, selections, op).order_by("order", "-created_at", "id")
+
+    scholarships, serializer_class = project(request, scholarships)
+    paginator = ScholarshipSearchPagination()
+    page = paginator.paginate_queryset(scholarships, request)
+    response = paginator.get_paginated_response(serializer_class(page, many=True).data)
+    response.data["facets"] = facets.facet_counts(active, selections, op)
+    return response
+
+
+@api_view(["GET"])
+@conditional_get(scholarships_version)
 def scholarship_detail(request, pk):
     """
-    Returns a single scholarship by ID
+    Returns a single scholarship by ID (?locale / ?bilingual as for the list)
     """
+    queryset, serializer_class = project(request, Scholarship.objects.all())
     try:
-        scholarship = Scholarship.objects.get(pk=pk, is_active=True)
-        serializer = ScholarshipSerializer(scholarship)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-        
+        scholarship = queryset.get(pk=pk, is_active=True)
     except Scholarship.DoesNotExist:
         return Response(
             {"error": "Scholarship not found"},
             status=status.HTTP_404_NOT_FOUND
         )
-    except Exception as e:
-        return Response(
-            {"error": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    
+    serializer = serializer_class(scholarship)
+    return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(["GET"])
+@conditional_get(scholarships_version)
 def scholarships_by_type(request, scholarship_type):
     """
-    Returns scholarships filtered by type
+    Returns scholarships filtered by type (?locale / ?bilingual as for the list)
     """
-    try:
-        valid_types = ["government", "university", "private", "organization"]
-        
-        if scholarship_type not in valid_types:
-            return Response(
-                {"error": f"Invalid type. Must be one of: {', '.join(valid_types)}"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        scholarships = Scholarship.objects.filter(
-            type=scholarship_type,
-            is_active=True
-        )
-        
-        serializer = ScholarshipSerializer(scholarships, many=True)
-        
-        return Response({
-            "type": scholarship_type,
-            "scholarships": serializer.data,
-            "count": scholarships.count()
-        }, status=status.HTTP_200_OK)
-        
-    except Exception as e:
+    valid_types = ["government", "university", "private", "organization"]
+    
+    if scholarship_type not in valid_types:
         return Response(
-            {"error": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+            {"error": f"Invalid type. Must be one of: {', '.join(valid_types)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    scholarships = Scholarship.objects.filter(
+        type=scholarship_type,
+        is_active=True
+    ).open()
+    
+    scholarships, serializer_class = project(request, scholarships)
+    return list_response(
+        request, scholarships, serializer_class,
+        wrap=lambda data, count: {"type": scholarship_type, "scholarships": data, "count": count},
+    )
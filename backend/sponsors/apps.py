@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class SponsorsConfig(AppConfig):
     name = 'sponsors'
+
+    def ready(self):
+        from tsak_backend import images
+
+        from . import signals
+
+        images.register(self.get_model('Sponsor'), logo='logo_meta')
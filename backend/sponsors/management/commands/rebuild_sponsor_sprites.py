@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from sponsors import sprites
+
+
+class Command(BaseCommand):
+    help = "Rebuild the logo sprite atlas of every sponsor type"
+
+    def handle(self, *args, **options):
+        for sprite in sprites.rebuild_all():
+            self.stdout.write(f"{sprite.type}: {len(sprite.entries)} logos, {sprite.width}x{sprite.height}")
+        self.stdout.write(self.style.SUCCESS("Sponsor sprites rebuilt"))
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sponsors", "0002_sponsor_description_en_sponsor_name_en_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sponsor",
+            name="logo_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive variants, see tsak_backend.images",
+            ),
+        ),
+    ]
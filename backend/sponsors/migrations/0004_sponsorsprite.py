@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sponsors", "0003_image_meta"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SponsorSprite",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("embassy", "Embassy"),
+                            ("partner", "Partner"),
+                            ("network", "Network"),
+                            ("sponsor", "Sponsor"),
+                        ],
+                        max_length=20,
+                        unique=True,
+                    ),
+                ),
+                ("image", models.FileField(blank=True, upload_to="sponsors/sprites/")),
+                ("width", models.PositiveIntegerField(default=0)),
+                ("height", models.PositiveIntegerField(default=0)),
+                ("entries", models.JSONField(blank=True, default=dict)),
+                ("built_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
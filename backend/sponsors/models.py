@@ -18,6 +18,7 @@ class Sponsor(models.Model):
     description_en = models.TextField(blank=True, verbose_name="Description (English)")
     
     logo = models.ImageField(upload_to="sponsors/logos/")
+    logo_meta = models.JSONField(default=dict, blank=True, editable=False, help_text="Responsive variants, see tsak_backend.images")
     type = models.CharField(max_length=20, choices=SPONSOR_TYPES)
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
 
@@ -30,4 +31,17 @@ class Sponsor(models.Model):
         verbose_name_plural = "Sponsors"
 
     def __str__(self):
-        return f"{self.name} ({self.get_type_display()})"
\ No newline at end of file
+        return f"{self.name} ({self.get_type_display()})"
+
+class SponsorSprite(models.Model):
+    """Logos of all sponsors of one type packed into a single image, see sponsors.sprites"""
+    type = models.CharField(max_length=20, choices=Sponsor.SPONSOR_TYPES, unique=True)
+    image = models.FileField(upload_to="sponsors/sprites/", blank=True)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    # {sponsor id: {"x", "y", "width", "height"}} in atlas pixels
+    entries = models.JSONField(default=dict, blank=True)
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_type_display()} sprite"
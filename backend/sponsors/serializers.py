@@ -1,9 +1,13 @@
 from rest_framework import serializers
+from tsak_backend.bilingual import BilingualField
+from tsak_backend.images import image_info, variant_urls
 from .models import Sponsor
 
 
 class SponsorSerializer(serializers.ModelSerializer):
     logo = serializers.SerializerMethodField()
+    logo_srcset = serializers.SerializerMethodField()
+    logo_info = serializers.SerializerMethodField()
     
     class Meta:
         model = Sponsor
@@ -14,6 +18,8 @@ class SponsorSerializer(serializers.ModelSerializer):
             'description',    # Thai description
             'description_en', # English description
             'logo', 
+            'logo_srcset',
+            'logo_info',
             'type', 
             'created_at', 
             'updated_at'
@@ -33,4 +39,34 @@ class SponsorSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.logo.url)
             # Fallback if no request context
             return obj.logo.url
-        return None
\ No newline at end of file
+        return None
+    
+    def get_logo_srcset(self, obj):
+        """
+        Resized variants of the logo: {"webp": {"320": url, ...}, "png": {...}}
+        or None if they have not been generated.
+        """
+        return variant_urls(obj.logo, obj.logo_meta, self.context.get('request'))
+    
+    def get_logo_info(self, obj):
+        """
+        {"width", "height", "color", "lqip"} of the logo, so the frontend can
+        reserve space and show a placeholder, or None if not analysed yet.
+        """
+        return image_info(obj.logo, obj.logo_meta)
+
+
+class LocalizedSponsorSerializer(SponsorSerializer):
+    """
+    One language per sponsor (``?locale=``, English falling back to Thai
+    where it is blank), without the ``_en`` fields. See
+    ``tsak_backend.bilingual.localize``.
+    """
+    name = BilingualField('name', 'name_en')
+    description = BilingualField('description', 'description_en')
+
+    class Meta(SponsorSerializer.Meta):
+        fields = [
+            field for field in SponsorSerializer.Meta.fields
+            if field not in ('name_en', 'description_en')
+        ]
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import sprites
+from .models import Sponsor, SponsorSprite
+
+
+@receiver(post_save, sender=Sponsor)
+@receiver(post_delete, sender=Sponsor)
+def rebuild_sprites(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # The type may have changed, so also rebuild the atlases the logo was in
+    types = {instance.type}
+    types.update(
+        SponsorSprite.objects
+        .filter(entries__has_key=str(instance.pk))
+        .values_list('type', flat=True)
+    )
+
+    def rebuild():
+        for sponsor_type in types:
+            sprites.rebuild(sponsor_type)
+
+    transaction.on_commit(rebuild)
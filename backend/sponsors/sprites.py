@@ -0,0 +1,118 @@
+"""
+Sprite atlases of the sponsor logos.
+
+The sponsors wall shows every logo at a small size, so instead of one
+request per logo the logos of each sponsor type are scaled into a box of
+``CELL_WIDTH`` x ``CELL_HEIGHT`` (twice the displayed size, for high DPI
+screens) and packed in rows into one WebP. ``SponsorSprite`` stores the
+atlas file and where each sponsor's logo is in it.
+
+An atlas is rebuilt after a sponsor of its type is saved or deleted (see
+``sponsors.signals``) and by ``manage.py rebuild_sponsor_sprites``, never
+per request: a type whose atlas has not been built yet has none on the
+wall. Atlases are content-addressed like other media, so an unchanged
+atlas keeps its URL.
+"""
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+CELL_WIDTH = 240
+CELL_HEIGHT = 120
+PADDING = 2  # transparent pixels around each logo, against bleeding when scaled
+ATLAS_WIDTH = 1024
+WEBP_QUALITY = 90
+
+
+def load_logo(sponsor):
+    """The sponsor's logo scaled to fit a cell, or None if it cannot be read"""
+    if not sponsor.logo:
+        return None
+    try:
+        with sponsor.logo.open('rb') as f:
+            image = Image.open(f)
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Could not read logo of sponsor %s, left out of the sprite", sponsor.pk)
+        return None
+
+    image = ImageOps.exif_transpose(image).convert('RGBA')
+    image.thumbnail((CELL_WIDTH, CELL_HEIGHT), Image.Resampling.LANCZOS)
+    return image
+
+
+def pack(sizes, max_width=ATLAS_WIDTH):
+    """
+    Shelf packing: place ``sizes`` ({key: (width, height)}) left to right in
+    rows, tallest first. Returns ({key: (x, y)}, atlas width, atlas height).
+    """
+    positions = {}
+    x = y = row_height = width = 0
+    for key, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        w, h = w + 2 * PADDING, h + 2 * PADDING
+        if x and x + w > max_width:
+            x, y, row_height = 0, y + row_height, 0
+        positions[key] = (x + PADDING, y + PADDING)
+        x += w
+        row_height = max(row_height, h)
+        width = max(width, x)
+    return positions, width, y + row_height
+
+
+def build_atlas(sponsors):
+    """Pack the logos of ``sponsors``, returns (WebP bytes or None, width, height, entries)"""
+    logos = {sponsor.pk: logo for sponsor in sponsors if (logo := load_logo(sponsor)) is not None}
+    if not logos:
+        return None, 0, 0, {}
+
+    positions, width, height = pack({pk: logo.size for pk, logo in logos.items()})
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    entries = {}
+    for pk, (x, y) in positions.items():
+        logo = logos[pk]
+        atlas.paste(logo, (x, y))
+        entries[str(pk)] = {'x': x, 'y': y, 'width': logo.width, 'height': logo.height}
+
+    buffer = io.BytesIO()
+    atlas.save(buffer, format='WEBP', quality=WEBP_QUALITY)
+    return buffer.getvalue(), width, height, entries
+
+
+def rebuild(sponsor_type):
+    """Rebuild the atlas of one sponsor type"""
+    from .models import Sponsor, SponsorSprite
+
+    sponsors = Sponsor.objects.filter(type=sponsor_type).only('id', 'logo')
+    data, width, height, entries = build_atlas(sponsors)
+
+    sprite, _ = SponsorSprite.objects.get_or_create(type=sponsor_type)
+    old_name = sprite.image.name
+    if data is None:
+        sprite.image = ''
+    else:
+        sprite.image.save(f'{sponsor_type}.webp', ContentFile(data), save=False)
+    sprite.width, sprite.height, sprite.entries = width, height, entries
+    sprite.save()
+
+    if old_name and old_name != sprite.image.name:
+        storage = sprite.image.storage
+        transaction.on_commit(lambda: storage.release(old_name))
+    return sprite
+
+
+def rebuild_all():
+    from .models import Sponsor
+
+    return [rebuild(sponsor_type) for sponsor_type, _ in Sponsor.SPONSOR_TYPES]
+
+
+def get_sprites():
+    """{type: SponsorSprite} of the atlases built so far"""
+    from .models import SponsorSprite
+
+    return {sprite.type: sprite for sprite in SponsorSprite.objects.all()}
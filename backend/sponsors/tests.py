@@ -1,3 +1,84 @@
-from django.test import TestCase
+import io
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+from PIL import Image
+
+from tsak_backend.tests import MediaTestCase
+from . import sprites
+from .models import Sponsor, SponsorSprite
+
+
+def logo(size, color):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return ContentFile(buffer.getvalue(), 'logo.png')
+
+
+class PackTests(SimpleTestCase):
+    def test_rows_wrap_without_overlap(self):
+        sizes = {1: (500, 100), 2: (500, 50), 3: (500, 120)}
+        positions, width, height = sprites.pack(sizes, max_width=1024)
+
+        boxes = [(x, y, x + sizes[key][0], y + sizes[key][1]) for key, (x, y) in positions.items()]
+        for i, a in enumerate(boxes):
+            for b in boxes[i + 1:]:
+                self.assertTrue(a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1])
+        # Tallest first, the shortest logo no longer fits and starts a new row
+        row = 120 + 2 * sprites.PADDING
+        self.assertEqual(positions[3], (sprites.PADDING, sprites.PADDING))
+        self.assertEqual(positions[2], (sprites.PADDING, row + sprites.PADDING))
+        self.assertLessEqual(width, 1024)
+        self.assertEqual(height, row + 50 + 2 * sprites.PADDING)
+
+
+class SponsorSpriteTests(MediaTestCase):
+    def create_sponsor(self, name, color, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Sponsor.objects.create(name=name, type='partner', logo=logo((480, 120), color), **fields)
+
+    def test_atlas_holds_every_logo_of_the_type(self):
+        red = self.create_sponsor('Red', (255, 0, 0))
+        blue = self.create_sponsor('Blue', (0, 0, 255))
+
+        sprite = SponsorSprite.objects.get(type='partner')
+        self.assertEqual(set(sprite.entries), {str(red.pk), str(blue.pk)})
+        with sprite.image.open('rb') as f:
+            atlas = Image.open(f).convert('RGB')
+            self.assertEqual(atlas.size, (sprite.width, sprite.height))
+            for sponsor, color in [(red, (255, 0, 0)), (blue, (0, 0, 255))]:
+                entry = sprite.entries[str(sponsor.pk)]
+                # Scaled down into the cell, keeping the aspect ratio
+                self.assertEqual((entry['width'], entry['height']), (240, 60))
+                pixel = atlas.getpixel((entry['x'] + 120, entry['y'] + 30))
+                self.assertTrue(all(abs(a - b) < 16 for a, b in zip(pixel, color)))
+
+    def test_type_change_moves_the_logo(self):
+        sponsor = self.create_sponsor('Red', (255, 0, 0))
+        sponsor.type = 'network'
+        with self.captureOnCommitCallbacks(execute=True):
+            sponsor.save()
+
+        self.assertEqual(SponsorSprite.objects.get(type='partner').entries, {})
+        self.assertEqual(list(SponsorSprite.objects.get(type='network').entries), [str(sponsor.pk)])
+
+    def test_wall_with_sprites(self):
+        sponsor = self.create_sponsor('Red', (255, 0, 0))
+        data = self.client.get('/api/sponsors/', {'sprites': 'true'}).json()
+
+        self.assertEqual([row['id'] for row in data['partners']], [sponsor.pk])
+        self.assertEqual(data['embassies'], [])
+        self.assertIsNone(data['sprites']['embassies'])
+        self.assertEqual(list(data['sprites']['partners']['logos']), [str(sponsor.pk)])
+        self.assertTrue(data['sprites']['partners']['url'].endswith('.webp'))
+        # Missing atlases are left to the signals and rebuild_sponsor_sprites
+        self.assertFalse(SponsorSprite.objects.filter(type='embassy').exists())
+
+    def test_get_does_not_build_atlases(self):
+        Sponsor.objects.bulk_create([Sponsor(name='Red', type='partner', logo=logo((480, 120), (255, 0, 0)))])
+        first = self.client.get('/api/sponsors/', {'sprites': 'true'})
+        self.assertIsNone(first.json()['sprites']['partners'])
+        self.assertFalse(SponsorSprite.objects.exists())
+        # So the ETag of the first response is still current
+        again = self.client.get('/api/sponsors/', {'sprites': 'true'}, headers={'if_none_match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
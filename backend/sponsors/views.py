@@ -1,26 +1,73 @@
 from rest_framework.decorators import api_view
-from rest_framework.response import Response
 from django.db.models import Q
-from .models import Sponsor
-from .serializers import SponsorSerializer
+from tsak_backend.bilingual import localize, request_locale
+from tsak_backend.conditional import conditional_get, table_version
+from tsak_backend.listing import list_response
+from . import sprites
+from .models import Sponsor, SponsorSprite
+from .serializers import LocalizedSponsorSerializer, SponsorSerializer
+
+SPRITE_GROUPS = {
+    "embassies": "embassy",
+    "partners": "partner",
+    "networks": "network",
+    "sponsors": "sponsor",
+}
+
+
+def sponsors_version(request):
+    return [
+        table_version(Sponsor.objects.all()),
+        table_version(SponsorSprite.objects.all(), field='built_at'),
+    ]
+
+
+def sprite_data(sprite, request):
+    if sprite is None or not sprite.image:
+        return None
+    return {
+        "url": request.build_absolute_uri(sprite.image.url),
+        "width": sprite.width,
+        "height": sprite.height,
+        "logos": sprite.entries,
+    }
 
 
 @api_view(["GET"])
+@conditional_get(sponsors_version)
 def sponsors_list(request):
     """
     Returns sponsors grouped by type: embassies, partners, networks, and sponsors
+
+    Query Parameters:
+    - locale: 'th' or 'en' to get each sponsor in one language (English
+      falling back to Thai) instead of both name/name_en and
+      description/description_en
+    - sprites: 'true' to add one logo atlas per group, so the whole wall
+      loads with one image request per group:
+      {"sprites": {"partners": {"url", "width", "height",
+                                "logos": {"<sponsor id>": {"x", "y", "width", "height"}}}, ...}}
+      A group without logos, or whose atlas is not built yet, is null.
     """
-    # More efficient: query once per type instead of fetching all and filtering
-    embassies = Sponsor.objects.filter(type="embassy")
-    partners = Sponsor.objects.filter(type="partner")
-    networks = Sponsor.objects.filter(type="network")
-    sponsors = Sponsor.objects.filter(type="sponsor")
-
-    grouped = {
-        "embassies": SponsorSerializer(embassies, many=True, context={'request': request}).data,
-        "partners": SponsorSerializer(partners, many=True, context={'request': request}).data,
-        "networks": SponsorSerializer(networks, many=True, context={'request': request}).data,
-        "sponsors": SponsorSerializer(sponsors, many=True, context={'request': request}).data,
-    }
+    queryset, serializer_class = Sponsor.objects.all(), SponsorSerializer
+    if "locale" in request.query_params:
+        serializer_class = LocalizedSponsorSerializer
+        queryset = localize(queryset, serializer_class, request_locale(request))
+
+    # One query for the whole wall, split into the groups by type
+    def by_type(data, count):
+        return {
+            group: [sponsor for sponsor in data if sponsor["type"] == sponsor_type]
+            for group, sponsor_type in SPRITE_GROUPS.items()
+        }
+
+    response = list_response(request, queryset, serializer_class, wrap=by_type)
+
+    if request.query_params.get("sprites", "").lower() in ("1", "true"):
+        atlases = sprites.get_sprites()
+        response.data["sprites"] = {
+            group: sprite_data(atlases.get(sponsor_type), request)
+            for group, sponsor_type in SPRITE_GROUPS.items()
+        }
 
-    return Response(grouped)
\ No newline at end of file
+    return response
\ No newline at end of file
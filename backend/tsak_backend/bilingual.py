@@ -0,0 +1,136 @@
+"""
+Thai/English fields for serializers.
+
+Content is stored in Thai with an English counterpart column. A serializer
+declares each pair once and gets the value in the request's language::
+
+    class AnnouncementListSerializer(serializers.ModelSerializer):
+        title = BilingualField('title_th', 'title_en')
+
+With ``fallback`` (the default) a blank English value falls back to the
+Thai one. The locale is resolved once per serializer (``?locale=``, Thai by
+default, or ``context['locale']`` when the view sets it). Serializers
+reading another parameter set ``locale_param`` and ``default_locale``.
+
+Without help the field picks the column in Python for every row. When the
+queryset goes through ``localize``, the choice is made by the database
+instead: each field becomes a ``localized_<name>`` annotation
+(``COALESCE(NULLIF(en, ''), th)`` for fallbacks) and both language columns
+are deferred, so each text crosses from the database once, in the requested
+language, and the field only reads the annotation::
+
+    locale = request_locale(request)
+    queryset = localize(Announcement.objects.all(), AnnouncementListSerializer, locale)
+"""
+from functools import cached_property
+
+from django.db import models
+from django.db.models.functions import Coalesce, NullIf
+from rest_framework import serializers
+
+LOCALES = ('th', 'en')
+LOCALE_PARAM = 'locale'
+DEFAULT_LOCALE = 'th'
+
+
+def normalize_locale(locale):
+    return 'en' if locale == 'en' else 'th'
+
+
+def request_locale(request, serializer_class=None):
+    """Locale asked for by ``request``, read as ``serializer_class`` reads it"""
+    param = getattr(serializer_class, 'locale_param', LOCALE_PARAM)
+    default = getattr(serializer_class, 'default_locale', DEFAULT_LOCALE)
+    if request is None:
+        return normalize_locale(default)
+    return normalize_locale(request.query_params.get(param, default))
+
+
+def serializer_locale(serializer):
+    """
+    Locale of a serializer tree, resolved on first use and kept in the
+    context the nested serializers share
+    """
+    context = serializer.context
+    if 'locale' not in context:
+        context['locale'] = request_locale(context.get('request'), type(serializer))
+    return normalize_locale(context['locale'])
+
+
+class BilingualField(serializers.Field):
+    """Read-only value of ``th`` or ``en`` (model attribute names) for the locale"""
+
+    empty = ''
+    output_field = models.TextField
+
+    def __init__(self, th, en, fallback=True, **kwargs):
+        self.th = th
+        self.en = en
+        self.fallback = fallback
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    @cached_property
+    def locale(self):
+        return serializer_locale(self.parent)
+
+    @property
+    def annotation(self):
+        return f'localized_{self.field_name}'
+
+    def to_representation(self, instance):
+        value = getattr(instance, self.annotation, self)
+        if value is not self:
+            return value
+
+        if self.locale != 'en':
+            return getattr(instance, self.th)
+        value = getattr(instance, self.en)
+        if self.fallback and not value:
+            return getattr(instance, self.th)
+        return value
+
+    def expression(self, locale):
+        """SQL for the value in ``locale``, used by ``localize``"""
+        if locale != 'en':
+            return models.F(self.th)
+        if not self.fallback:
+            return models.F(self.en)
+        return Coalesce(NullIf(self.en, models.Value(self.empty)), self.th, output_field=self.output_field())
+
+
+class BilingualJSONField(BilingualField):
+    """BilingualField for JSON lists, an empty English list falls back to the Thai one"""
+
+    empty = []
+    output_field = models.JSONField
+
+    def expression(self, locale):
+        if locale != 'en' or not self.fallback:
+            return super().expression(locale)
+        return models.Case(
+            models.When(models.Q(**{self.en: self.empty}) | models.Q(**{f'{self.en}__isnull': True}), then=self.th),
+            default=self.en,
+            output_field=self.output_field(),
+        )
+
+
+def bilingual_fields(serializer_class):
+    return {
+        name: field
+        for name, field in serializer_class().fields.items()
+        if isinstance(field, BilingualField)
+    }
+
+
+def localize(queryset, serializer_class, locale):
+    """
+    Annotate ``queryset`` with the ``locale`` value of every BilingualField
+    of ``serializer_class`` and defer the language columns behind them
+    """
+    fields = bilingual_fields(serializer_class)
+    columns = {column for field in fields.values() for column in (field.th, field.en)}
+    return queryset.defer(*columns).annotate(**{
+        field.annotation: field.expression(locale) for field in fields.values()
+    })
@@ -0,0 +1,106 @@
+"""
+Conditional GET for the public read endpoints.
+
+Each endpoint declares a version function that aggregates ``MAX(updated_at)``
+and ``COUNT(*)`` over the tables its payload is built from. That is one
+cheap aggregate per table instead of a full serialization. The ETag hashes
+those aggregates together with the request path and Accept header.
+Last-Modified is the newest timestamp. A request whose If-None-Match or
+If-Modified-Since still matches gets a 304 before the view runs.
+
+Usage::
+
+    @api_view(['GET'])
+    @conditional_get(lambda request: [table_version(Member.objects.all())])
+    def member_list(request):
+        ...
+
+Class-based views wrap their handler with ``method_decorator``.
+"""
+import hashlib
+from calendar import timegm
+from datetime import datetime, time
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def table_version(queryset, field='updated_at', **aggregates):
+    """
+    One aggregate query giving the newest ``field`` value and the row
+    count of ``queryset`` (plus any extra ``aggregates``)
+    """
+    return queryset.order_by().aggregate(
+        last_modified=Max(field),
+        count=Count('pk'),
+        **aggregates
+    )
+
+
+def date_version(today=None):
+    """
+    Version of the current local date, for payloads filtered on "today".
+    Both the ETag and Last-Modified (local midnight) move on at midnight,
+    so cached copies from the day before are not revalidated.
+    """
+    today = today or timezone.localdate()
+    midnight = timezone.make_aware(datetime.combine(today, time.min))
+    return {'last_modified': midnight, 'today': today.isoformat()}
+
+
+def compute_validators(request, versions):
+    """Return (etag, last_modified timestamp) for a list of table versions"""
+    timestamps = [version['last_modified'] for version in versions if version['last_modified']]
+    last_modified = timegm(max(timestamps).utctimetuple()) if timestamps else None
+
+    digest = hashlib.md5(usedforsecurity=False)
+    digest.update(request.get_full_path().encode())
+    digest.update(request.META.get('HTTP_ACCEPT', '').encode())
+    for version in versions:
+        digest.update(repr(sorted(version.items())).encode())
+    return quote_etag(digest.hexdigest()), last_modified
+
+
+def conditional_get(version_func, on_not_modified=None):
+    """
+    Decorate a read view with ETag / Last-Modified validators.
+
+    ``version_func(request, *args, **kwargs)`` returns a list of
+    ``table_version`` results, or None when the view should run
+    unconditionally (for example because the object does not exist and the
+    view will answer 404). ``on_not_modified`` is called with the same
+    arguments when a 304 is returned, for side effects such as view
+    counting that must happen even when the body is not sent.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            versions = version_func(request, *args, **kwargs)
+            if versions is None:
+                return view(request, *args, **kwargs)
+
+            etag, last_modified = compute_validators(request, versions)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                if response.status_code == 304 and on_not_modified is not None:
+                    on_not_modified(request, *args, **kwargs)
+                return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                if not response.has_header('ETag'):
+                    response.headers['ETag'] = etag
+                if last_modified is not None and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified)
+                # Keep the copy but revalidate it on every use
+                if not response.has_header('Cache-Control'):
+                    patch_cache_control(response, no_cache=True)
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,258 @@
+"""
+Responsive image derivatives generated at upload time.
+
+Models register their image fields together with a JSON "meta" field::
+
+    images.register(Member, picture='picture_meta')
+
+Whenever an instance is saved with a new file in a registered field, the
+image is decoded once, rotated according to its EXIF orientation and
+re-encoded without metadata at each width in ``VARIANT_WIDTHS`` that is
+smaller than the original (plus the original width, capped at
+``MAX_WIDTH``), as WebP and as a JPEG (or PNG, for images with
+transparency) fallback. The storage names of the variants are recorded in
+the meta field, together with what the frontend needs to reserve space and
+paint a placeholder before the image loads: the size, the dominant color
+and a tiny blurred JPEG as a data URI (LQIP)::
+
+    {"version": 2,
+     "name": "members/8cfd...60a768.jpeg",
+     "width": 1500, "height": 1000, "color": "#c80a0a",
+     "lqip": "data:image/jpeg;base64,...",
+     "variants": {"webp": {"320": "members/variants/271d...b2ea.webp", ...},
+                  "jpeg": {"320": "members/variants/fa61...f8aa.jpg", ...}}}
+
+Serializers turn that into absolute URLs with ``variant_urls`` and into the
+placeholder fields with ``image_info``, so no image is decoded per request.
+Meta written by an older ``META_VERSION`` is rebuilt on the next save or by
+the management command.
+
+Files live in the content-addressed storage (``tsak_backend.storage``) and
+may be shared between rows, so a replaced or deleted file and its variants
+are only removed once no other row references it.
+``manage.py generate_image_variants`` fills the meta of existing rows.
+"""
+import base64
+import io
+import logging
+import posixpath
+from functools import partial
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from PIL import Image, ImageFilter, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (320, 640, 1280)
+MAX_WIDTH = 1920
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+LQIP_SIZE = 16  # longest side of the placeholder, in pixels
+LQIP_QUALITY = 50
+META_VERSION = 2
+
+# {model: {image field name: meta field name}}
+registry = {}
+
+
+def register(model, **fields):
+    """Generate variants for ``fields`` (image field -> meta field) of ``model`` on save"""
+    registry[model] = fields
+    post_save.connect(
+        partial(update_variants, fields=fields),
+        sender=model,
+        weak=False,
+        dispatch_uid=f'images.update_variants:{model._meta.label}',
+    )
+    post_delete.connect(
+        partial(release_files, fields=fields),
+        sender=model,
+        weak=False,
+        dispatch_uid=f'images.release_files:{model._meta.label}',
+    )
+
+
+def update_variants(sender, instance, raw=False, fields=None, **kwargs):
+    """post_save receiver: rebuild the variants of image fields whose file changed"""
+    if raw:
+        return
+
+    updates = {}
+    for image_field, meta_field in fields.items():
+        fieldfile = getattr(instance, image_field)
+        meta = getattr(instance, meta_field) or {}
+        name = fieldfile.name or ''
+        if meta.get('name', '') == name and (not name or meta.get('version') == META_VERSION):
+            continue
+
+        if meta.get('name'):
+            release(fieldfile.storage, meta['name'], meta)
+        updates[meta_field] = build_meta(fieldfile) if name else {}
+
+    if updates:
+        # A plain UPDATE: calling save() again would re-run the signal
+        for meta_field, meta in updates.items():
+            setattr(instance, meta_field, meta)
+        sender._base_manager.filter(pk=instance.pk).update(**updates)
+
+
+def regenerate(instance, force=False):
+    """
+    Bring the variants of a registered ``instance`` up to date, returns the
+    names of the meta fields that were rewritten. ``force`` rebuilds them
+    even when they already match the current file.
+    """
+    fields = registry[type(instance)]
+    if force:
+        for meta_field in fields.values():
+            meta = getattr(instance, meta_field) or {}
+            meta.pop('name', None)
+    before = {meta_field: getattr(instance, meta_field) for meta_field in fields.values()}
+    update_variants(type(instance), instance, fields=fields)
+    return [meta_field for meta_field, meta in before.items() if getattr(instance, meta_field) is not meta]
+
+
+def release_files(sender, instance, fields=None, **kwargs):
+    """post_delete receiver: drop the files of a deleted row nobody else uses"""
+    for image_field, meta_field in fields.items():
+        fieldfile = getattr(instance, image_field)
+        if fieldfile.name:
+            release(fieldfile.storage, fieldfile.name, getattr(instance, meta_field) or {})
+
+
+def release(storage, name, meta):
+    """After commit, delete ``name`` and its variants if no row references it"""
+    def delete_if_unreferenced():
+        if storage.release(name) and meta.get('name') == name:
+            delete_variants(storage, meta)
+
+    transaction.on_commit(delete_if_unreferenced)
+
+
+def build_meta(fieldfile):
+    """Decode the image once and write all its variants, returns the meta dict"""
+    meta = {'version': META_VERSION, 'name': fieldfile.name}
+    try:
+        with fieldfile.open('rb') as f:
+            image = Image.open(f)
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Could not read image %s, no variants generated", fieldfile.name)
+        return meta
+
+    image = ImageOps.exif_transpose(image)
+    meta['width'], meta['height'] = image.size
+    meta['color'] = dominant_color(image)
+    meta['lqip'] = lqip(image)
+    meta['variants'] = write_variants(fieldfile.storage, fieldfile.name, image)
+    return meta
+
+
+def dominant_color(image):
+    """Most common color of a 5-color palette of the image, as #rrggbb"""
+    small = flatten(image)
+    small.thumbnail((64, 64))
+    palette = small.quantize(colors=5)
+    _, index = max(palette.getcolors())
+    r, g, b = palette.getpalette()[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def flatten(image):
+    """RGB copy of the image, transparent areas on white"""
+    if not has_transparency(image):
+        return image.convert('RGB')
+    background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+    return Image.alpha_composite(background, image.convert('RGBA')).convert('RGB')
+
+
+def lqip(image):
+    """Tiny blurred JPEG of the image as a data URI, a few hundred bytes"""
+    tiny = flatten(image)
+    tiny.thumbnail((LQIP_SIZE, LQIP_SIZE))
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    tiny.save(buffer, format='JPEG', quality=LQIP_QUALITY, optimize=True)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def has_transparency(image):
+    return image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def variant_widths(width):
+    widths = [w for w in VARIANT_WIDTHS if w < width]
+    widths.append(min(width, MAX_WIDTH))
+    return sorted(set(widths))
+
+
+def write_variants(storage, name, image):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    base = posixpath.join(directory, 'variants', stem)
+
+    if has_transparency(image):
+        image = image.convert('RGBA')
+        fallback, fallback_ext, fallback_options = 'png', 'png', {'optimize': True}
+    else:
+        image = image.convert('RGB')
+        fallback, fallback_ext, fallback_options = 'jpeg', 'jpg', {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True}
+
+    formats = [
+        ('webp', 'webp', {'quality': WEBP_QUALITY}),
+        (fallback, fallback_ext, fallback_options),
+    ]
+    variants = {format_name: {} for format_name, _, _ in formats}
+
+    for width in variant_widths(image.width):
+        if width == image.width:
+            resized = image
+        else:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        for format_name, ext, options in formats:
+            buffer = io.BytesIO()
+            # No exif= argument, so the variants carry no EXIF metadata
+            resized.save(buffer, format=format_name.upper(), **options)
+            saved = storage.save(f'{base}_{width}w.{ext}', ContentFile(buffer.getvalue()))
+            variants[format_name][str(width)] = saved
+
+    return variants
+
+
+def delete_variants(storage, meta):
+    for names in (meta.get('variants') or {}).values():
+        for name in names.values():
+            storage.delete(name)
+
+
+def variant_urls(fieldfile, meta, request=None):
+    """
+    ``{format: {width: url}}`` for a registered image, absolute when a
+    request is given, None when there are no variants (yet)
+    """
+    variants = (meta or {}).get('variants')
+    if not fieldfile or not variants or meta.get('name') != fieldfile.name:
+        return None
+
+    urls = {}
+    for format_name, names in variants.items():
+        urls[format_name] = {}
+        for width, name in names.items():
+            url = fieldfile.storage.url(name)
+            urls[format_name][width] = request.build_absolute_uri(url) if request else url
+    return urls
+
+
+def image_info(fieldfile, meta):
+    """
+    ``{width, height, color, lqip}`` of a registered image for layout and
+    placeholders, None when it has not been analysed (yet)
+    """
+    meta = meta or {}
+    if not fieldfile or meta.get('name') != fieldfile.name or 'width' not in meta:
+        return None
+    return {key: meta[key] for key in ('width', 'height', 'color', 'lqip')}
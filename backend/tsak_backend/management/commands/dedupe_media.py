@@ -0,0 +1,92 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tsak_backend import images
+from tsak_backend.storage import file_fields, is_hashed_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Rename media uploaded before content addressing to their content hash, "
+        "pointing every row at a single copy and deleting the duplicates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would change")
+        parser.add_argument(
+            '--prune', action='store_true',
+            help="Also delete files in the upload directories that no row references",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = default_storage
+        old_names = set()
+        renamed = 0
+
+        fields_by_model = {}
+        for model, field in file_fields(storage):
+            fields_by_model.setdefault(model, []).append(field.name)
+
+        for model, field_names in fields_by_model.items():
+            meta_fields = images.registry.get(model, {})
+            for instance in model._base_manager.iterator():
+                updates = {}
+                for field_name in field_names:
+                    fieldfile = getattr(instance, field_name)
+                    if not fieldfile.name or is_hashed_name(fieldfile.name):
+                        continue
+                    if not storage.exists(fieldfile.name):
+                        self.stderr.write(f"{model._meta.label} {instance.pk}: missing file {fieldfile.name}")
+                        continue
+
+                    self.stdout.write(f"{model._meta.label} {instance.pk}: {fieldfile.name}")
+                    renamed += 1
+                    if dry_run:
+                        continue
+
+                    old_name = fieldfile.name
+                    with storage.open(old_name, 'rb') as f:
+                        updates[field_name] = storage.save(old_name, f)
+                    old_names.add(old_name)
+
+                    # Same bytes, so existing variants stay valid under the new name
+                    meta_field = meta_fields.get(field_name)
+                    meta = getattr(instance, meta_field) if meta_field else None
+                    if meta and meta.get('name') == old_name:
+                        meta['name'] = updates[field_name]
+                        updates[meta_field] = meta
+
+                if not updates:
+                    continue
+                with transaction.atomic():
+                    model._base_manager.filter(pk=instance.pk).update(**updates)
+                    for name, value in updates.items():
+                        setattr(instance, name, value)
+                    if meta_fields:
+                        images.regenerate(instance)
+
+        deleted = sum(storage.release(name) for name in old_names)
+        self.stdout.write(f"{'Would rename' if dry_run else 'Renamed'} {renamed} files, deleted {deleted} old copies")
+
+        if options['prune']:
+            self.prune(storage, dry_run)
+
+        self.stdout.write(self.style.SUCCESS("Media is content addressed"))
+
+    def prune(self, storage, dry_run):
+        directories = {str(field.upload_to) for _, field in file_fields(storage) if isinstance(field.upload_to, str)}
+        pruned = 0
+        for directory in sorted(directories):
+            if not storage.exists(directory):
+                continue
+            for filename in storage.listdir(directory)[1]:
+                name = f"{directory.rstrip('/')}/{filename}"
+                if storage.reference_count(name):
+                    continue
+                self.stdout.write(f"Unreferenced: {name}")
+                if not dry_run:
+                    storage.delete(name)
+                pruned += 1
+        self.stdout.write(f"{'Would prune' if dry_run else 'Pruned'} {pruned} unreferenced files")
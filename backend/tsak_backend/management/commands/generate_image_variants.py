@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from tsak_backend import images
+
+
+class Command(BaseCommand):
+    help = "Generate the responsive variants of every registered image field (events, members, sponsors, experiences)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Rebuild variants that are already up to date")
+
+    def handle(self, *args, **options):
+        for model, fields in images.registry.items():
+            updated = 0
+            columns = ['pk', *fields.keys(), *fields.values()]
+            for instance in model._base_manager.only(*columns).iterator():
+                if images.regenerate(instance, force=options['force']):
+                    updated += 1
+            self.stdout.write(f"{model._meta.label}: updated {updated} rows")
+        self.stdout.write(self.style.SUCCESS("Image variants are up to date"))
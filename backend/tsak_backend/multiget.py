@@ -0,0 +1,59 @@
+"""
+Multi-get support for the list endpoints.
+
+``?ids=1,5,9`` on a list endpoint fetches exactly those rows in one
+``IN`` query and answers ``{"results": [...], "missing": [...]}`` with the
+results in the requested order. Ids that do not exist (or are not public)
+are reported in ``missing`` instead of failing the whole request.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+IDS_QUERY_PARAM = 'ids'
+MAX_IDS = 50
+
+
+def parse_ids(request, max_ids=MAX_IDS):
+    """
+    Return the requested ids (deduplicated, in order) or None if the
+    request is not a multi-get
+    """
+    raw = request.query_params.get(IDS_QUERY_PARAM)
+    if raw is None:
+        return None
+
+    # Bound the work before parsing anything
+    parts = raw.split(',')
+    if len(parts) > max_ids:
+        raise ValidationError({IDS_QUERY_PARAM: f"At most {max_ids} ids can be requested at once"})
+
+    ids = {}  # insertion ordered, so deduplicating keeps the request order
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        # isdigit() alone accepts characters such as '²' that int() rejects
+        if not (part.isascii() and part.isdigit()):
+            raise ValidationError({IDS_QUERY_PARAM: f"Invalid id: '{part}'"})
+        ids.setdefault(int(part), None)
+
+    if not ids:
+        raise ValidationError({IDS_QUERY_PARAM: "At least one id is required"})
+    return list(ids)
+
+
+def fetch_by_ids(queryset, ids):
+    """One IN query (plus the queryset's prefetches), returns (objects in request order, missing ids)"""
+    found = queryset.in_bulk(ids)
+    objects = [found[pk] for pk in ids if pk in found]
+    missing = [pk for pk in ids if pk not in found]
+    return objects, missing
+
+
+def multiget_response(queryset, ids, serialize):
+    """``serialize(objects)`` turns the fetched objects into response data"""
+    objects, missing = fetch_by_ids(queryset, ids)
+    return Response({
+        'results': serialize(objects),
+        'missing': missing,
+    })
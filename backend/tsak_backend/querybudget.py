@@ -0,0 +1,52 @@
+"""
+Per-endpoint query budgets.
+
+``@query_budget(n)`` documents how many SQL queries a view is allowed to
+run and, when ``DEBUG`` is on, logs a warning with the offending SQL if a
+request goes over it. A view whose query count grows with the number of
+rows it returns (an N+1) shows up in the development server log as soon
+as there is more than a handful of rows.
+
+The budgets are enforced by the app tests (see ``events.tests``), which
+assert the exact query count with ``assertNumQueries`` for growing numbers
+of rows.
+"""
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+def query_budget(limit):
+    def decorator(view):
+        view.query_budget = limit
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not settings.DEBUG:
+                return view(request, *args, **kwargs)
+
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                response = view(request, *args, **kwargs)
+
+            if len(counter.queries) > limit:
+                logger.warning(
+                    "%s ran %d queries, over its budget of %d:\n%s",
+                    request.path, len(counter.queries), limit, '\n'.join(counter.queries)
+                )
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,209 @@
+"""
+On-the-fly resizing of media files.
+
+``/media/resize/<w>x<h>/<path>`` returns ``MEDIA_ROOT/<path>`` resized with
+Pillow. With both dimensions the image is cropped to fill the box (cards,
+banners, avatars). With a height of 0 it is scaled to the width and keeps
+its aspect ratio. Only the sizes listed in ``MEDIA_RESIZE_SIZES`` are
+served, so the set of variants (and the work a client can cause) stays
+bounded.
+
+The first request for a variant resizes it into ``MEDIA_RESIZE_CACHE_ROOT``.
+Later requests are served from there. The cache is kept under
+``MEDIA_RESIZE_CACHE_MAX_BYTES`` by evicting the least recently used
+files. Concurrent requests for the same variant wait on the same lock, so
+it is resized only once per process. Files are written to a temporary name
+and renamed into place, so other processes never see a partial file.
+Content-addressed sources (see ``tsak_backend.storage``) never change, so
+their variants are sent as immutable.
+"""
+import hashlib
+import io
+import mimetypes
+import os
+import posixpath
+import tempfile
+import threading
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .storage import IMMUTABLE_MAX_AGE, is_hashed_name
+
+DEFAULT_SIZES = [
+    (96, 96), (192, 192),  # avatars
+    (320, 0), (640, 0), (1280, 0),  # width only
+    (400, 300), (800, 600),  # cards
+    (1200, 630), (1920, 1080),  # banners
+]
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+MUTABLE_MAX_AGE = 60 * 60 * 24
+LOCK_STRIPES = 64
+
+# Source extension -> output format and extension, everything else becomes JPEG
+OUTPUT_FORMATS = {'.png': ('PNG', '.png'), '.webp': ('WEBP', '.webp')}
+JPEG_QUALITY = 85
+
+
+class ResizeCache:
+    """Directory of resized files with a total size cap and LRU eviction"""
+
+    def __init__(self, root, max_bytes):
+        self.root = str(root)
+        self.max_bytes = max_bytes
+        self._size = None
+        self._size_lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def lock_for(self, key):
+        return self._locks[int(key[:8], 16) % LOCK_STRIPES]
+
+    def get_or_create(self, key, ext, build):
+        """
+        Open the cached file for ``key``, calling ``build()`` -> bytes on a
+        miss. The file is opened before anything is evicted, so the caller
+        can still read it if it is evicted right after.
+        """
+        path = os.path.join(self.root, key[:2], key + ext)
+        f = self._open(path)
+        if f is not None:
+            return f
+
+        with self.lock_for(key):
+            # Another request may have built it while we waited
+            f = self._open(path)
+            if f is None:
+                self._write(path, build())
+                f = open(path, 'rb')
+
+        self._evict()
+        return f
+
+    def _open(self, path):
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        # The mtime doubles as the last access time for eviction
+        os.utime(f.fileno())
+        return f
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._size_lock:
+            if self._size is not None:
+                self._size += len(data)
+
+    def _files(self):
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _evict(self):
+        with self._size_lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._files())
+            if self._size <= self.max_bytes:
+                return
+
+            # Other processes share the directory, so rescan before deleting
+            files = sorted(self._files())
+            self._size = sum(size for _, size, _ in files)
+            for _, size, path in files:
+                if self._size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self._size -= size
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ResizeCache(
+            getattr(settings, 'MEDIA_RESIZE_CACHE_ROOT', os.path.join(settings.BASE_DIR, 'media_cache')),
+            getattr(settings, 'MEDIA_RESIZE_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES),
+        )
+    return _cache
+
+
+def allowed_sizes():
+    return {tuple(size) for size in getattr(settings, 'MEDIA_RESIZE_SIZES', DEFAULT_SIZES)}
+
+
+def resize_image(source_path, width, height, format_name):
+    """Resize the image at ``source_path`` and encode it as ``format_name``"""
+    with Image.open(source_path) as image:
+        # Let the JPEG decoder downscale while decoding
+        image.draft('RGB', (width * 2, (height or width) * 2))
+        image = ImageOps.exif_transpose(image)
+
+        if height:
+            image = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+        elif image.width > width:
+            image = image.resize(
+                (width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS
+            )
+
+        if format_name == 'JPEG':
+            image = image.convert('RGB')
+            options = {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True}
+        else:
+            options = {'optimize': True} if format_name == 'PNG' else {'quality': JPEG_QUALITY}
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=format_name, **options)
+    return buffer.getvalue()
+
+
+def resize(request, width, height, path):
+    """Serve ``MEDIA_ROOT/<path>`` resized to one of the allowed sizes"""
+    if (width, height) not in allowed_sizes():
+        raise Http404("Unsupported size")
+
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        source_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(source_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("Image not found")
+
+    # The source mtime and size are part of the key, so a replaced file gets a new variant
+    key = hashlib.sha256(
+        f'{path}|{width}x{height}|{stat.st_mtime_ns}|{stat.st_size}'.encode()
+    ).hexdigest()
+    format_name, ext = OUTPUT_FORMATS.get(posixpath.splitext(path)[1].lower(), ('JPEG', '.jpg'))
+
+    def build():
+        try:
+            return resize_image(source_path, width, height, format_name)
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+            raise Http404("Not an image")
+
+    cached = get_cache().get_or_create(key, ext, build)
+    response = FileResponse(cached, content_type=mimetypes.guess_type(cached.name)[0])
+    if is_hashed_name(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+    return response
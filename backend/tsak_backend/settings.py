@@ -43,6 +43,8 @@ INSTALLED_APPS = [
     'events',
     'scholarships',
     'experiences',
+    # Project-wide management commands (media storage and image variants)
+    'tsak_backend',
     "corsheaders",
 ]
 
@@ -131,10 +133,48 @@ CORS_ALLOWED_ORIGINS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are named by content hash and stored once, see tsak_backend.storage
+STORAGES = {
+    'default': {
+        'BACKEND': 'tsak_backend.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# /media/resize/<w>x<h>/<path>: allowed sizes (h=0 keeps the aspect ratio) and the LRU disk cache
+MEDIA_RESIZE_SIZES = [
+    (96, 96), (192, 192),
+    (320, 0), (640, 0), (1280, 0),
+    (400, 300), (800, 600),
+    (1200, 630), (1920, 1080),
+]
+MEDIA_RESIZE_CACHE_ROOT = BASE_DIR / 'media_cache'
+MEDIA_RESIZE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
\ No newline at end of file
+FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+
+# Announcement view counts are buffered in memory and written in batches
+ANNOUNCEMENT_VIEWS_FLUSH_INTERVAL = 10  # seconds
+ANNOUNCEMENT_VIEWS_FLUSH_THRESHOLD = 100  # buffered views
+
+# Trending announcements: decayed daily views, recomputed by
+# manage.py refresh_trending, run from cron
+ANNOUNCEMENT_TRENDING_WINDOW_DAYS = 14
+ANNOUNCEMENT_TRENDING_HALF_LIFE_DAYS = 3
+ANNOUNCEMENT_TRENDING_SIZE = 50
+
+# Events past their end date are set to 'ended' by manage.py end_past_events,
+# run from cron. A number of seconds instead runs it from a background thread
+# in each server process.
+EVENT_STATUS_UPDATE_INTERVAL = None
+
+# Keeps the optional background jobs above off while the tests run
+TEST_RUNNER = 'tsak_backend.runner.TestRunner'
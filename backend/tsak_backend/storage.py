@@ -0,0 +1,100 @@
+"""
+Content-addressed media storage.
+
+Uploads are named after the SHA-256 of their bytes inside the field's
+``upload_to`` directory (``events/3f5a...c2.jpg``), so uploading the same
+image twice stores it once and both rows point at the same file. Because a
+name can never refer to different bytes, the URLs can be cached forever
+(see ``serve``).
+
+A stored file can be shared by any number of rows, across models, so it is
+only deleted by ``release`` once no file field references it any more.
+``tsak_backend.images`` releases the old file when a registered field
+changes or its row is deleted. ``manage.py dedupe_media`` renames files
+uploaded before this storage was enabled and folds their duplicates
+together.
+"""
+import hashlib
+import posixpath
+import re
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils.cache import patch_cache_control
+from django.views import static
+
+HASH_LENGTH = 32  # hex characters of the SHA-256 kept in the name
+HASHED_NAME_RE = re.compile(rf'(^|/)[0-9a-f]{{{HASH_LENGTH}}}\.[0-9a-z]+$')
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.search(name or ''))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content and stores each content once"""
+
+    def hashed_name(self, name, digest):
+        directory, filename = posixpath.split(name)
+        ext = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, f'{digest}{ext}')
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        name = self.hashed_name(self.generate_filename(name), content_hash(content))
+        if self.exists(name):
+            # Same name, same bytes: nothing to write
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def reference_count(self, name):
+        """Number of rows, over all models, whose file fields point at ``name``"""
+        return sum(
+            model._base_manager.filter(**{field.name: name}).count()
+            for model, field in file_fields(self)
+        )
+
+    def release(self, name):
+        """Delete ``name`` if nothing references it any more, returns whether it was deleted"""
+        if not name or self.reference_count(name):
+            return False
+        self.delete(name)
+        return True
+
+
+def file_fields(storage=None):
+    """(model, field) for every file field stored in a ContentAddressedStorage"""
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if not isinstance(field, models.FileField):
+                continue
+            if not isinstance(field.storage, ContentAddressedStorage):
+                continue
+            if storage is None or field.storage.location == storage.location:
+                yield model, field
+
+
+def serve(request, path, document_root=None, show_indexes=False):
+    """``django.views.static.serve`` marking content-addressed files as immutable"""
+    response = static.serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    if response.status_code == 200 and is_hashed_name(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    return response
@@ -0,0 +1,373 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from members.models import Member
+from scholarships.models import Scholarship
+from . import images, resize
+from .bilingual import BilingualField, BilingualJSONField, localize, request_locale
+from .multiget import MAX_IDS, parse_ids
+from .storage import is_hashed_name
+
+
+class BilingualScholarshipSerializer(serializers.ModelSerializer):
+    name = BilingualField('name', 'name_en')
+    description = BilingualField('description', 'description_en', fallback=False)
+    benefits = BilingualJSONField('benefits', 'benefits_en')
+
+    class Meta:
+        model = Scholarship
+        fields = ['id', 'name', 'description', 'benefits']
+
+
+class LangBilingualScholarshipSerializer(BilingualScholarshipSerializer):
+    locale_param = 'lang'
+    default_locale = 'en'
+
+
+def png_bytes(size=(40, 30), color=(200, 10, 10)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def create_member(**fields):
+    fields.setdefault('firstname', 'Somchai')
+    fields.setdefault('lastname', 'Jaidee')
+    fields.setdefault('university', 'KU')
+    fields.setdefault('major', 'CS')
+    fields.setdefault('position', 'member')
+    fields.setdefault('department', 'it')
+    return Member.objects.create(**fields)
+
+
+class MediaTestCase(TestCase):
+    """Runs against an empty, temporary MEDIA_ROOT"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ParseIdsTests(SimpleTestCase):
+    def parse(self, raw=None):
+        params = {} if raw is None else {'ids': raw}
+        return parse_ids(Request(APIRequestFactory().get('/', params)))
+
+    def test_not_a_multiget(self):
+        self.assertIsNone(self.parse())
+
+    def test_deduplicates_in_request_order(self):
+        self.assertEqual(self.parse('5, 1,5,,9,1'), [5, 1, 9])
+
+    def test_rejects_invalid_ids(self):
+        for raw in ['1,abc', '1,²', '1,٣', '-1', '1.5', '', ',']:
+            with self.subTest(raw=raw), self.assertRaises(ValidationError):
+                self.parse(raw)
+
+    def test_rejects_too_many_ids(self):
+        self.assertEqual(len(self.parse(','.join(map(str, range(MAX_IDS))))), MAX_IDS)
+        with self.assertRaises(ValidationError):
+            self.parse(','.join(map(str, range(MAX_IDS + 1))))
+
+
+class MultigetEndpointTests(TestCase):
+    def test_unicode_digit_is_a_bad_request(self):
+        response = self.client.get('/api/scholarships/', {'ids': '1,²'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ids', response.json())
+
+
+class ContentAddressedStorageTests(MediaTestCase):
+    def test_identical_uploads_share_one_file(self):
+        first = create_member(picture=ContentFile(png_bytes(), 'first.png'))
+        second = create_member(picture=ContentFile(png_bytes(), 'second.png'))
+        self.assertTrue(is_hashed_name(first.picture.name))
+        self.assertEqual(first.picture.name, second.picture.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(default_storage.exists(second.picture.name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(default_storage.exists(second.picture.name))
+
+    def test_dedupe_media_folds_legacy_copies(self):
+        legacy = FileSystemStorage()
+        members = []
+        for name in ['members/a.png', 'members/b.png']:
+            legacy.save(name, ContentFile(png_bytes()))
+            members.append(create_member(picture=name, picture_meta={'version': images.META_VERSION, 'name': name}))
+
+        call_command('dedupe_media', stdout=io.StringIO())
+
+        names = {member.picture.name for member in Member.objects.all()}
+        self.assertEqual(len(names), 1)
+        name = names.pop()
+        self.assertTrue(is_hashed_name(name))
+        self.assertTrue(default_storage.exists(name))
+        self.assertFalse(legacy.exists('members/a.png'))
+        self.assertFalse(legacy.exists('members/b.png'))
+        self.assertEqual(Member.objects.get(pk=members[0].pk).picture_meta['name'], name)
+
+
+class ImageVariantTests(MediaTestCase):
+    def test_upload_builds_variants_and_placeholder(self):
+        member = create_member(picture=ContentFile(png_bytes(size=(800, 400)), 'picture.png'))
+
+        meta = Member.objects.get(pk=member.pk).picture_meta
+        self.assertEqual(meta['version'], images.META_VERSION)
+        self.assertEqual(meta['name'], member.picture.name)
+        self.assertEqual((meta['width'], meta['height'], meta['color']), (800, 400, '#c80a0a'))
+        self.assertTrue(meta['lqip'].startswith('data:image/jpeg;base64,'))
+        self.assertEqual(set(meta['variants']), {'webp', 'jpeg'})
+        self.assertEqual(list(meta['variants']['webp']), ['320', '640', '800'])
+
+        name = meta['variants']['jpeg']['320']
+        with default_storage.open(name) as f:
+            self.assertEqual(Image.open(f).size, (320, 160))
+
+    def test_exif_orientation_is_applied(self):
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotated 90 degrees clockwise
+        Image.new('RGB', (400, 200), (10, 200, 10)).save(buffer, format='JPEG', exif=exif)
+        member = create_member(picture=ContentFile(buffer.getvalue(), 'photo.jpg'))
+
+        meta = Member.objects.get(pk=member.pk).picture_meta
+        self.assertEqual((meta['width'], meta['height']), (200, 400))
+        with default_storage.open(meta['variants']['jpeg']['200']) as f:
+            variant = Image.open(f)
+            self.assertEqual(variant.size, (200, 400))
+            self.assertNotIn(0x0112, variant.getexif())
+
+    def test_generate_image_variants_fills_existing_rows(self):
+        name = FileSystemStorage().save('members/legacy.png', ContentFile(png_bytes()))
+        Member.objects.bulk_create([Member(
+            firstname='A', lastname='B', university='KU', major='CS', position='member', department='it', picture=name,
+        )])
+
+        call_command('generate_image_variants', stdout=io.StringIO())
+        self.assertEqual(Member.objects.get().picture_meta['width'], 40)
+
+
+class ListResponseTests(TestCase):
+    def test_count_comes_from_the_fetched_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/scholarships/')
+        self.assertEqual(response.json(), {'scholarships': [], 'count': 0})
+        # The only COUNT is the one in the conditional GET version
+        self.assertEqual(sum('COUNT(' in query['sql'] for query in queries), 1)
+
+    def test_phases_are_timed(self):
+        for firstname in ['A', 'B']:
+            create_member(firstname=firstname)
+        response = self.client.get('/api/members/')
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(
+            [part.split(';')[0] for part in response['Server-Timing'].split(', ')],
+            ['query', 'serialize', 'render'],
+        )
+
+    def test_paginated_lists_are_timed_too(self):
+        for url in ['/api/announcements/', '/api/experiences/', '/api/events/?page_size=5', '/api/sponsors/']:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('Server-Timing', response)
+
+        body = self.client.get('/api/announcements/').json()
+        self.assertEqual(body, {'count': 0, 'next': None, 'previous': None, 'results': []})
+
+
+class BilingualFieldTests(TestCase):
+    def setUp(self):
+        Scholarship.objects.create(
+            name='ทุน', name_en='', description='รายละเอียด', description_en='',
+            benefits=['ค่าเล่าเรียน'], benefits_en=[], provider='-', deadline='-', eligibility='-',
+            monthly_allowance='-', link='https://example.com', type='government',
+        )
+
+    def serialize(self, queryset, locale):
+        return BilingualScholarshipSerializer(queryset, many=True, context={'locale': locale}).data[0]
+
+    def test_fallback(self):
+        expected = {
+            'th': {'name': 'ทุน', 'description': 'รายละเอียด', 'benefits': ['ค่าเล่าเรียน']},
+            # Blank English falls back to Thai, except on the field without fallback
+            'en': {'name': 'ทุน', 'description': '', 'benefits': ['ค่าเล่าเรียน']},
+        }
+        for locale, values in expected.items():
+            with self.subTest(locale=locale):
+                data = self.serialize(Scholarship.objects.all(), locale)
+                self.assertEqual({name: data[name] for name in values}, values)
+
+    def test_localize_matches_python_choice(self):
+        Scholarship.objects.update(name_en='Scholarship', benefits_en=['Tuition'])
+        for locale in ['th', 'en']:
+            with self.subTest(locale=locale):
+                queryset = localize(Scholarship.objects.all(), BilingualScholarshipSerializer, locale)
+                self.assertEqual(self.serialize(queryset, locale), self.serialize(Scholarship.objects.all(), locale))
+                # Both language columns stay in the database
+                self.assertLessEqual(
+                    {'name', 'name_en', 'description', 'description_en', 'benefits', 'benefits_en'},
+                    queryset.first().get_deferred_fields(),
+                )
+
+    def test_request_locale(self):
+        factory = APIRequestFactory()
+
+        def locale(params, serializer_class=None):
+            return request_locale(Request(factory.get('/', params)), serializer_class)
+
+        self.assertEqual(locale({}), 'th')
+        self.assertEqual(locale({'locale': 'en'}), 'en')
+        self.assertEqual(locale({'locale': 'fr'}), 'th')
+        self.assertEqual(locale({}, LangBilingualScholarshipSerializer), 'en')
+        self.assertEqual(locale({'lang': 'th', 'locale': 'en'}, LangBilingualScholarshipSerializer), 'th')
+        self.assertEqual(request_locale(None, LangBilingualScholarshipSerializer), 'en')
+
+
+class ConditionalGetTests(TestCase):
+    URLS = [
+        '/api/announcements/',
+        '/api/announcements/trending/',
+        '/api/members/',
+        '/api/sponsors/',
+        '/api/events/',
+        '/api/events/calendar.ics',
+        '/api/scholarships/',
+        '/api/scholarships/search/',
+        '/api/experiences/',
+    ]
+
+    def test_every_list_revalidates(self):
+        for url in self.URLS:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertIn('no-cache', first['Cache-Control'])
+                second = self.client.get(url, headers={'if_none_match': first['ETag']})
+                self.assertEqual(second.status_code, 304)
+
+    def test_changes_give_a_new_etag(self):
+        member = create_member()
+        first = self.client.get('/api/members/')
+        self.assertEqual(self.client.get('/api/members/', headers={'if_modified_since': first['Last-Modified']}).status_code, 304)
+
+        other = create_member(firstname='Somsri')
+        second = self.client.get('/api/members/', headers={'if_none_match': first['ETag']})
+        self.assertEqual(second.status_code, 200)
+
+        # A delete leaves MAX(updated_at) alone but changes the count
+        other.delete()
+        third = self.client.get('/api/members/', headers={'if_none_match': second['ETag']})
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual([row['id'] for row in third.json()], [member.pk])
+
+    def test_etag_depends_on_the_query(self):
+        thai = self.client.get('/api/members/')
+        english = self.client.get('/api/members/', {'locale': 'en'}, headers={'if_none_match': thai['ETag']})
+        self.assertEqual(english.status_code, 200)
+        self.assertNotEqual(english['ETag'], thai['ETag'])
+
+
+class ImageInfoTests(MediaTestCase):
+    def test_list_reads_placeholders_from_the_stored_meta(self):
+        create_member(picture=ContentFile(png_bytes(size=(800, 400)), 'picture.png'))
+
+        with mock.patch.object(images.Image, 'open', side_effect=AssertionError("decoded per request")):
+            member = self.client.get('/api/members/').json()[0]
+        self.assertEqual(
+            {key: member['picture_info'][key] for key in ('width', 'height', 'color')},
+            {'width': 800, 'height': 400, 'color': '#c80a0a'},
+        )
+        self.assertTrue(member['picture_srcset']['webp']['320'].startswith('http://testserver/media/members/variants/'))
+
+    def test_meta_of_an_older_version_is_rebuilt_on_save(self):
+        member = create_member(picture=ContentFile(png_bytes(), 'picture.png'))
+        meta = {'version': images.META_VERSION - 1, 'name': member.picture.name}
+        Member.objects.filter(pk=member.pk).update(picture_meta=meta)
+        self.assertIsNone(self.client.get('/api/members/').json()[0]['picture_info'])
+
+        member.refresh_from_db()
+        member.save()
+        self.assertEqual(self.client.get('/api/members/').json()[0]['picture_info']['width'], 40)
+
+
+class ResizeTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        cache_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_root, ignore_errors=True)
+        patcher = mock.patch.object(resize, '_cache', resize.ResizeCache(cache_root, 10 * 1024 * 1024))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FileSystemStorage().save('events/photo.png', ContentFile(png_bytes(size=(1000, 500))))
+
+    def get(self, size, path='events/photo.png'):
+        return self.client.get(f'/media/resize/{size}/{path}')
+
+    def image(self, response):
+        return Image.open(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_crop_and_width_only(self):
+        response = self.get('400x300')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(self.image(response).size, (400, 300))
+        self.assertEqual(self.image(self.get('320x0')).size, (320, 160))
+        self.assertIn('max-age=86400', self.get('320x0')['Cache-Control'])
+
+    def test_variants_are_built_once(self):
+        with mock.patch.object(resize, 'resize_image', wraps=resize.resize_image) as resize_image:
+            for _ in range(3):
+                self.assertEqual(self.get('96x96').status_code, 200)
+        resize_image.assert_called_once()
+
+    def test_only_allowed_sizes_and_media_files(self):
+        self.assertEqual(self.get('97x97').status_code, 404)
+        self.assertEqual(self.get('96x96', 'events/missing.png').status_code, 404)
+        self.assertEqual(self.get('96x96', '../settings.py').status_code, 404)
+        FileSystemStorage().save('events/notes.png', ContentFile(b'not an image'))
+        self.assertEqual(self.get('96x96', 'events/notes.png').status_code, 404)
+
+    def test_hashed_sources_are_immutable(self):
+        member = create_member(picture=ContentFile(png_bytes(), 'picture.png'))
+        self.assertIn('immutable', self.get('96x96', member.picture.name)['Cache-Control'])
+
+
+class ResizeCacheTests(SimpleTestCase):
+    def test_least_recently_used_files_are_evicted(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        resize_cache = resize.ResizeCache(root, max_bytes=20)
+
+        paths = {}
+        for age, key in enumerate(['aa' * 32, 'bb' * 32, 'cc' * 32]):
+            with resize_cache.get_or_create(key, '.bin', lambda: b'x' * 8) as f:
+                paths[key] = f.name
+            # Oldest first: a was used longest ago
+            os.utime(f.name, (1000 + age, 1000 + age))
+
+        resize_cache.get_or_create('dd' * 32, '.bin', lambda: b'x' * 8).close()
+        self.assertFalse(os.path.exists(paths['aa' * 32]))
+        self.assertFalse(os.path.exists(paths['bb' * 32]))
+        self.assertTrue(os.path.exists(paths['cc' * 32]))
@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from tsak_backend import resize, storage
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -27,7 +28,8 @@ urlpatterns = [
     path('api/events/', include('events.urls')),
     path('api/scholarships/', include('scholarships.urls')),
     path('api/experiences/', include('experiences.urls')),
+    path('media/resize/<int:width>x<int:height>/<path:path>', resize.resize, name='media-resize'),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += static(settings.MEDIA_URL, view=storage.serve, document_root=settings.MEDIA_ROOT)
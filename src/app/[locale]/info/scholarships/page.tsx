@@ -9,22 +9,16 @@ type FundingType = "full-tuition" | "partial-tuition" | "merit-based" | "need-ba
 type StudyLevel = "undergraduate" | "graduate" | "masters" | "phd" | "all-levels";
 type FieldOfStudy = "all-fields" | "science" | "arts" | "business" | "medicine";
 
+// Already in the requested locale, the backend falls back to Thai
 type ScholarshipFromAPI = {
   id: number;
   name: string;
-  name_en: string;
   provider: string;
-  provider_en: string;
   description: string;
-  description_en: string;
   benefits: string[];
-  benefits_en: string[];
   deadline: string;
-  deadline_en: string;
   eligibility: string;
-  eligibility_en: string;
   monthly_allowance: string;
-  monthly_allowance_en: string;
   link: string;
   type: ScholarshipType;
   funding_type: FundingType[];
@@ -59,11 +53,11 @@ type PageProps = {
   params: Promise<{ locale: string }>;
 };
 
-async function getScholarships() {
+async function getScholarships(locale: string) {
   const BACKEND_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
   try {
-    const response = await fetch(`${BACKEND_URL}/api/scholarships/`, {
+    const response = await fetch(`${BACKEND_URL}/api/scholarships/?locale=${locale === 'en' ? 'en' : 'th'}`, {
       cache: 'no-store', // or 'force-cache' for caching
     });
 
@@ -83,7 +77,6 @@ export default function ScholarshipsPage({ params }: PageProps) {
   const { locale } = use(params);
   const dict = getDictionary(locale);
   const t = dict.scholarships;
-  const isEnglish = locale === 'en';
 
   // State for scholarships and loading
   const [scholarships, setScholarships] = useState<Scholarship[]>([]);
@@ -104,18 +97,18 @@ export default function ScholarshipsPage({ params }: PageProps) {
       setError(false);
 
       try {
-        const data = await getScholarships();
+        const data = await getScholarships(locale);
 
         // Transform API data to match component structure
         const transformedData: Scholarship[] = data.map((item: ScholarshipFromAPI) => ({
           id: item.id,
-          name: isEnglish && item.name_en ? item.name_en : item.name,
-          provider: isEnglish && item.provider_en ? item.provider_en : item.provider,
-          description: isEnglish && item.description_en ? item.description_en : item.description,
-          benefits: isEnglish && item.benefits_en?.length > 0 ? item.benefits_en : item.benefits,
-          deadline: isEnglish && item.deadline_en ? item.deadline_en : item.deadline,
-          eligibility: isEnglish && item.eligibility_en ? item.eligibility_en : item.eligibility,
-          monthlyAllowance: isEnglish && item.monthly_allowance_en ? item.monthly_allowance_en : item.monthly_allowance,
+          name: item.name,
+          provider: item.provider,
+          description: item.description,
+          benefits: item.benefits,
+          deadline: item.deadline,
+          eligibility: item.eligibility,
+          monthlyAllowance: item.monthly_allowance,
           link: item.link,
           type: item.type,
           fundingType: item.funding_type,
@@ -133,7 +126,7 @@ export default function ScholarshipsPage({ params }: PageProps) {
     };
 
     fetchScholarships();
-  }, [isEnglish]);
+  }, [locale]);
 
   // Filter scholarships
   const filteredScholarships = scholarships.filter((scholarship) => {